@@ -9,9 +9,16 @@ let run = 0;
 let results = [];
 let currentRunData=[];
 let lastKeyPressTime = null;
-let lastKeyPosition = null;
+let lastKeyIndex = null;
 const keyWidth = 60;
 
+// Tastenfeld: Index je Taste und vorberechnete Distanz-/ID-Matrix (keyCount x keyCount)
+const keyLabels = ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9', '.', '*', '='];
+const keyIndex = new Map(keyLabels.map((label, i) => [label, i]));
+const keyCount = keyLabels.length;
+let keyDistances = new Float64Array(keyCount * keyCount);
+let keyIDs = new Float64Array(keyCount * keyCount);
+
 function isExpectedInput(input) {
     // Hier kannst du Bedingungen anpassen, je nachdem, was du erwartest
     if (input !== expectedSequence[currentSequenceIndex]) {
@@ -37,8 +44,7 @@ function randomNum(){
 function appendNum(num){
     if (!isExpectedInput(num)) return;
 
-    const btn = document.getElementById('b' + (num === '.' ? '.' : num));
-    logKeyPress(btn, num);
+    logKeyPress(num);
 
     //max 1 . darf vorkommen 
     if (num==='.'&& curInput.includes('.')) return;
@@ -59,8 +65,7 @@ function appendNum(num){
 function appendOp(op) {
     if (!isExpectedInput(op)) return;
 
-    const opBtn = document.querySelector(`.operator`);
-    logKeyPress(opBtn, op);
+    logKeyPress(op);
     
     if (curInput === '') return;
     if (prevInput !== '') {
@@ -78,8 +83,7 @@ function appendOp(op) {
 function calculate() {
     if (!isExpectedInput("=")) return;
 
-    const equalBtn = document.querySelector('.equal');
-    logKeyPress(equalBtn, '=');
+    logKeyPress('=');
 
     if (prevInput === '' || curInput === '') return;
     let result;
@@ -114,7 +118,7 @@ function clearForNewCalc(){
     prevInput = '';
     curOp = '';
     lastKeyPressTime = null;
-    lastKeyPosition = null;
+    lastKeyIndex = null;
     run++;
     randomNum();
     });
@@ -124,19 +128,31 @@ function sleep(ms){
     return new Promise(resolve => setTimeout(resolve, ms));
 }
 
-//Distanz zw. zwei Tasten 
-function calculateDistance(elem1, elem2) {
-    const rect1 = elem1.getBoundingClientRect();
-    const rect2 = elem2.getBoundingClientRect();
-
-    const x1 = rect1.left + rect1.width / 2;
-    const y1 = rect1.top + rect1.height / 2;
+function keyElement(label) {
+    if (label === '*') return document.querySelector('.operator');
+    if (label === '=') return document.querySelector('.equal');
+    return document.getElementById('b' + label);
+}
 
-    const x2 = rect2.left + rect2.width / 2;
-    const y2 = rect2.top + rect2.height / 2;
+//Tastenfeld einmal vermessen (und nach jeder Größenänderung erneut),
+//damit beim Loggen kein Layout mehr berechnet werden muss
+function measureKeypad() {
+    const centers = keyLabels.map(label => {
+        const rect = keyElement(label).getBoundingClientRect();
+        return [rect.left + rect.width / 2, rect.top + rect.height / 2];
+    });
 
-    const distance = Math.hypot(x2 - x1, y2 - y1);
-    return distance;
+    const distances = new Float64Array(keyCount * keyCount);
+    const ids = new Float64Array(keyCount * keyCount);
+    for (let i = 0; i < keyCount; i++) {
+        for (let j = 0; j < keyCount; j++) {
+            const D = Math.hypot(centers[j][0] - centers[i][0], centers[j][1] - centers[i][1]);
+            distances[i * keyCount + j] = D;
+            ids[i * keyCount + j] = calculateID(D, keyWidth);
+        }
+    }
+    keyDistances = distances;
+    keyIDs = ids;
 }
 
 function calculateID(D, W) {
@@ -144,15 +160,17 @@ function calculateID(D, W) {
 }
 
 //benötigte Zeit 
-function logKeyPress(buttonElement, label) {
-    const currentTime = Date.now();
+function logKeyPress(label) {
+    // performance.now(): monoton und sub-millisekundengenau (Date.now() kann springen)
+    const currentTime = performance.now();
     let mt = 0;
     let id = 0;
 
-    if (lastKeyPressTime !== null && lastKeyPosition !== null) {
+    const index = keyIndex.get(label);
+
+    if (lastKeyPressTime !== null && lastKeyIndex !== null) {
         mt = (currentTime - lastKeyPressTime) / 1000; // Sekunden
-        const D = calculateDistance(lastKeyPosition, buttonElement);
-        id = calculateID(D, keyWidth);
+        id = keyIDs[lastKeyIndex * keyCount + index];
     }
 
     currentRunData.push({
@@ -162,7 +180,7 @@ function logKeyPress(buttonElement, label) {
     });
 
     lastKeyPressTime = currentTime;
-    lastKeyPosition = buttonElement;
+    lastKeyIndex = index;
 }
 
 function saveResults() {
@@ -171,6 +189,50 @@ function saveResults() {
 
     // Blob für den Download erstellen
     const blob = new Blob([json], { type: 'application/json' });
+    downloadBlob(blob, '.json');
+}
+
+// Kompakter Binärexport: eine Spalte je Größe statt eines Objekts je Tastendruck
+// Aufbau (little-endian): 'FITTSBIN', uint32 Version, uint32 Anzahl n,
+// dann float64 MT[n], float64 ID[n], int32 run[n], uint8 key[n] (Zeichencode)
+const BINARY_MAGIC = 'FITTSBIN';
+const BINARY_VERSION = 1;
+const BINARY_HEADER = 16;
+
+function saveResultsBinary() {
+    let n = 0;
+    for (const r of results) n += r.data.length;
+
+    const buffer = new ArrayBuffer(BINARY_HEADER + n * (8 + 8 + 4 + 1));
+    const header = new DataView(buffer);
+    for (let i = 0; i < BINARY_MAGIC.length; i++) {
+        header.setUint8(i, BINARY_MAGIC.charCodeAt(i));
+    }
+    header.setUint32(8, BINARY_VERSION, true);
+    header.setUint32(12, n, true);
+
+    // Offsets sind Vielfache der Elementgröße, daher direkt als Typed Arrays beschreibbar
+    const mt = new Float64Array(buffer, BINARY_HEADER, n);
+    const id = new Float64Array(buffer, BINARY_HEADER + 8 * n, n);
+    const runs = new Int32Array(buffer, BINARY_HEADER + 16 * n, n);
+    const keys = new Uint8Array(buffer, BINARY_HEADER + 20 * n, n);
+
+    let i = 0;
+    for (const r of results) {
+        for (const entry of r.data) {
+            mt[i] = entry.MT;
+            id[i] = entry.ID;
+            runs[i] = r.run;
+            keys[i] = entry.key.charCodeAt(0);
+            i++;
+        }
+    }
+
+    const blob = new Blob([buffer], { type: 'application/octet-stream' });
+    downloadBlob(blob, '.fitts');
+}
+
+function downloadBlob(blob, extension) {
     const url = URL.createObjectURL(blob);
 
     // Download-Link erzeugen
@@ -178,7 +240,7 @@ function saveResults() {
     a.href = url;
     a.download = 'reaction_results_' + 
         new Date().toISOString().slice(0, 19).replace(/:/g, '-') + 
-        '.json';
+        extension;
     
     document.body.appendChild(a);
     a.click();
@@ -189,5 +251,8 @@ function saveResults() {
 }
 
 window.onload = function() {
+    measureKeypad();
     randomNum();
 }
+
+window.addEventListener('resize', measureKeypad);
@@ -1,20 +1,41 @@
-import zipfile
 import os
-import json
+import warnings
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
-from collections import Counter
-from scipy import stats
+
+from ingest import load_study, EXPERIMENT_TYPES, BINARY, FOOD
+from figures import histogram, render_figures
+from tracing import stage
+from participants import ParticipantIndex
+from screening import within_session_tests, person_tests, WITHIN_PAIRS
+from cleaning import clean_and_report
+from resampling import (
+    permutation_diffs, sequential_permutation_test, two_sided_p_value, pairwise_permutation_tests,
+    exact_preferred, exact_permutation_test, exact_null_histogram
+)
 
 
 class ReaktionszeitenVergleich:
-    def __init__(self, binary_df, food_df, bootstrap_samples=10000, alpha=0.05):
+    def __init__(self, binary_df, food_df, bootstrap_samples=10000, alpha=0.05, rng=None, batch_size=None,
+                 workers=1, adaptive=False, confidence=0.99, exact='auto'):
         self.binary_df = binary_df
         self.food_df = food_df
         self.bootstrap_samples = bootstrap_samples
         self.alpha = alpha
+        # Seed oder numpy.random.Generator für reproduzierbare Ergebnisse
+        self.rng = np.random.default_rng(rng)
+        # Blockgröße und Anzahl Prozesse für die Simulation (Ergebnis unabhängig von workers)
+        self.batch_size = batch_size
+        self.workers = workers
+        # Adaptiver Modus: Abbruch, sobald das Konfidenzintervall des p-Werts alpha nicht mehr enthält;
+        # bootstrap_samples ist dann die Obergrenze
+        self.adaptive = adaptive
+        self.confidence = confidence
+        # Exakter Test über alle Aufteilungen, solange er günstiger als die Simulation ist ('auto'),
+        # True erzwingt ihn, False erzwingt die Simulation
+        self.exact = exact
+        self._bootstrap_diffs = None
+        self._sequential = None
 
         # Extrahiere Reaktionszeiten
         self.binary_times = self._extract_binary_times()
@@ -25,106 +46,123 @@ class ReaktionszeitenVergleich:
         self.food_mean = np.mean(self.food_times)
         self.binary_n = len(self.binary_times)
         self.food_n = len(self.food_times)
+        self.use_exact = self.exact is True or (
+            self.exact == 'auto' and exact_preferred(self.binary_n, self.food_n, self.bootstrap_samples))
+        if self.use_exact and (self.adaptive or self.workers != 1):
+            warnings.warn("Exakter Test gewählt: adaptive und workers gelten nur für die Simulation "
+                          "und werden ignoriert (exact=False erzwingt die Simulation)")
 
     def _extract_binary_times(self):
-        """Extrahiert alle Reaktionszeiten für den binären Stimulus-Test"""
-        times = []
-        for _, row in self.binary_df.iterrows():
-            if 'purple_mean' in row and not pd.isna(row['purple_mean']):
-                times.append(row['purple_mean'])
-            if 'orange_mean' in row and not pd.isna(row['orange_mean']):
-                times.append(row['orange_mean'])
-        return times
+        """Extrahiert alle Reaktionszeiten für den binären Stimulus-Test (zeilenweise: Lila, Orange)"""
+        return self._row_means(self.binary_df, ['purple_mean', 'orange_mean'])
 
     def _extract_food_times(self):
-        """Extrahiert alle Reaktionszeiten für den Lebensmittelerkennungstest"""
-        times = []
-        for _, row in self.food_df.iterrows():
-            # Extrahiere Mittelwerte für alle Lebensmittelkategorien
-            for column in ['german_food_mean', 'chinese_food_mean', 'mexican_food_mean']:
-                if column in self.food_df.columns and not pd.isna(row.get(column)):
-                    times.append(row[column])
-        return times
+        """Extrahiert alle Reaktionszeiten für den Lebensmittelerkennungstest (zeilenweise: DE, CN, MX)"""
+        return self._row_means(self.food_df, ['german_food_mean', 'chinese_food_mean', 'mexican_food_mean'])
+
+    @staticmethod
+    def _row_means(df, columns):
+        """Werte der vorhandenen Spalten Zeile für Zeile als flaches Array, ohne NaN"""
+        columns = [column for column in columns if column in df.columns]
+        values = df[columns].to_numpy(dtype=np.float64).ravel()
+        return values[~np.isnan(values)]
+
+    def bootstrap_distribution(self):
+        """Simuliert die Verteilung der Mittelwertdifferenzen einmalig und speichert sie für Test und Grafik"""
+        if self._bootstrap_diffs is None and self.adaptive:
+            with stage('resampling', self.bootstrap_samples):
+                self._sequential = sequential_permutation_test(
+                    self.binary_times, self.food_times, alpha=self.alpha,
+                    max_resamples=self.bootstrap_samples, rng=self.rng,
+                    batch_size=self.batch_size or 1000, confidence=self.confidence
+                )
+            self._bootstrap_diffs = self._sequential['null_diffs']
+        elif self._bootstrap_diffs is None:
+            with stage('resampling', self.bootstrap_samples):
+                self._bootstrap_diffs = permutation_diffs(
+                    self.binary_times, self.food_times, self.bootstrap_samples,
+                    rng=self.rng, batch_size=self.batch_size, workers=self.workers
+                )
+        return self._bootstrap_diffs
 
     def run_bootstrap_test(self):
         """Führt den Bootstrap-Test zwischen den beiden Reaktionstests durch"""
         # Beobachtete Teststatistik (Differenz der Mittelwerte)
         observed_diff = self.food_mean - self.binary_mean
 
-        # Kombiniere alle Daten für Bootstrap
-        all_times = np.concatenate([self.binary_times, self.food_times])
-        n_all = len(all_times)
-
-        # Bootstrap-Simulation
-        bootstrap_diffs = []
-        for _ in range(self.bootstrap_samples):
-            # Zufälliges Shuffling der Daten
-            shuffled = np.random.permutation(all_times)
-
-            # Teile die gemischten Daten wieder in zwei Gruppen auf
-            sample_binary = shuffled[:self.binary_n]
-            sample_food = shuffled[self.binary_n:n_all]
-
-            # Berechne Differenz der Mittelwerte
-            diff = np.mean(sample_food) - np.mean(sample_binary)
-            bootstrap_diffs.append(diff)
-
-        # Berechne p-Wert als Anteil der Bootstrap-Ergebnisse, die extremer sind als der beobachtete Wert
-        if observed_diff >= 0:
-            p_value = np.mean(np.array(bootstrap_diffs) >= observed_diff)
-        else:
-            p_value = np.mean(np.array(bootstrap_diffs) <= observed_diff)
-
-        # Verdoppeln für zweiseitigen Test
-        p_value = min(p_value * 2, 1.0)
-
-        return {
+        if self.use_exact:
+            # Exakter p-Wert über alle Aufteilungen der vereinigten Werte
+            with stage('resampling'):
+                exact = exact_permutation_test(self.binary_times, self.food_times)
+            return {
+                'binary_mean': self.binary_mean,
+                'food_mean': self.food_mean,
+                'binary_n': self.binary_n,
+                'food_n': self.food_n,
+                'observed_diff': observed_diff,
+                'bootstrap_samples': exact['splits'],
+                'exact': True,
+                'p_value': exact['p_value'],
+                'significant': exact['p_value'] < self.alpha
+            }
+
+        # Zweiseitiger p-Wert aus der (zwischengespeicherten) Bootstrap-Verteilung
+        bootstrap_diffs = self.bootstrap_distribution()
+        p_value = two_sided_p_value(bootstrap_diffs, observed_diff)
+
+        results = {
             'binary_mean': self.binary_mean,
             'food_mean': self.food_mean,
             'binary_n': self.binary_n,
             'food_n': self.food_n,
             'observed_diff': observed_diff,
-            'bootstrap_samples': self.bootstrap_samples,
+            'bootstrap_samples': len(bootstrap_diffs),
             'p_value': p_value,
             'significant': p_value < self.alpha
         }
+        if self.adaptive:
+            results['max_bootstrap_samples'] = self.bootstrap_samples
+            results['p_interval'] = (self._sequential['p_lower'], self._sequential['p_upper'])
+        return results
+
+    def _samples_text(self, results):
+        """Beschreibt die Anzahl verwendeter Bootstrap Samples (im adaptiven Modus mit Obergrenze)"""
+        if results.get('exact'):
+            return f"exakt, alle {results['bootstrap_samples']} Aufteilungen"
+        if 'max_bootstrap_samples' not in results:
+            return f"{results['bootstrap_samples']}"
+        lower, upper = results['p_interval']
+        text = f"{results['bootstrap_samples']} von max. {results['max_bootstrap_samples']}"
+        if results['bootstrap_samples'] < results['max_bootstrap_samples']:
+            text += " (vorzeitig beendet)"
+        return text + f", {self.confidence:.0%}-Intervall p: [{lower:.4f}, {upper:.4f}]"
 
     def plot_bootstrap_distribution(self):
         """Visualisiert die Bootstrap-Verteilung mit dem beobachteten Wert"""
         observed_diff = self.food_mean - self.binary_mean
 
-        all_times = np.concatenate([self.binary_times, self.food_times])
-        n_all = len(all_times)
-
-        bootstrap_diffs = []
-        for _ in range(self.bootstrap_samples):
-            shuffled = np.random.permutation(all_times)
-            sample_binary = shuffled[:self.binary_n]
-            sample_food = shuffled[self.binary_n:n_all]
-            diff = np.mean(sample_food) - np.mean(sample_binary)
-            bootstrap_diffs.append(diff)
-
-        plt.figure(figsize=(10, 6))
-        plt.hist(bootstrap_diffs, bins=50, alpha=0.7)
-        plt.axvline(observed_diff, color='red', linestyle='--',
-                    label=f'Beobachteter Unterschied: {observed_diff:.2f}')
-        plt.title('Bootstrap-Verteilung der Mittelwertdifferenzen')
-        plt.xlabel('Differenz der Mittelwerte (B.3 - B.2)')
-        plt.ylabel('Häufigkeit')
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig('data/bootstrap_verteilung.png')
-        print("Bootstrap-Verteilung gespeichert in: data/bootstrap_verteilung.png")
-
-    def print_results(self):
-        """Gibt die Ergebnisse des Bootstrap-Tests aus"""
+        # Nur das Histogramm (50 Klassen) geht an den Renderer, nicht alle Differenzen;
+        # im exakten Modus über alle Aufteilungen, sofern deren Anzahl handhabbar ist
+        exact = exact_null_histogram(self.binary_times, self.food_times, bins=50) if self.use_exact else None
+        counts, edges = exact if exact is not None else histogram(self.bootstrap_distribution(), bins=50)
+        render_figures([{
+            'path': 'data/bootstrap_verteilung.png',
+            'figsize': (10, 6),
+            'panels': [{'kind': 'histogram', 'counts': counts, 'edges': edges, 'alpha': 0.7,
+                        'line': observed_diff, 'line_label': f'Beobachteter Unterschied: {observed_diff:.2f}',
+                        'title': 'Bootstrap-Verteilung der Mittelwertdifferenzen',
+                        'xlabel': 'Differenz der Mittelwerte (B.3 - B.2)', 'ylabel': 'Häufigkeit'}],
+        }])
+
+    def print_results(self, plot=True):
+        """Gibt die Ergebnisse des Bootstrap-Tests aus (plot=False: ohne Grafik)"""
         results = self.run_bootstrap_test()
 
         print("\n=== Bootstrap-Test: B.2 (Binärer Stimulus) vs. B.3 (Lebensmittelerkennung) ===")
         print(f"Mittelwert B.2: {results['binary_mean']:.2f} ms (n={results['binary_n']})")
         print(f"Mittelwert B.3: {results['food_mean']:.2f} ms (n={results['food_n']})")
         print(f"Beobachteter Unterschied: {results['observed_diff']:.2f} ms")
-        print(f"Bootstrap Samples: {results['bootstrap_samples']}")
+        print(f"Bootstrap Samples: {self._samples_text(results)}")
         print(f"p-Wert: {results['p_value']:.4f}")
 
         if results['significant']:
@@ -135,10 +173,12 @@ class ReaktionszeitenVergleich:
             print("Die Nullhypothese (kein Unterschied) kann nicht abgelehnt werden.")
 
         # Visualisierung erstellen
-        self.plot_bootstrap_distribution()
+        if plot:
+            self.plot_bootstrap_distribution()
 
         # Ergebnisse in Datei speichern
-        self.save_results_to_file(results)
+        with stage('schreiben'):
+            self.save_results_to_file(results)
 
     def save_results_to_file(self, results):
         """Speichert die Ergebnisse des Bootstrap-Tests in einer Datei"""
@@ -151,7 +191,7 @@ class ReaktionszeitenVergleich:
             f.write(f"Mittelwert B.2: {results['binary_mean']:.2f} ms (n={results['binary_n']})\n")
             f.write(f"Mittelwert B.3: {results['food_mean']:.2f} ms (n={results['food_n']})\n")
             f.write(f"Beobachteter Unterschied: {results['observed_diff']:.2f} ms\n")
-            f.write(f"Bootstrap Samples: {results['bootstrap_samples']}\n")
+            f.write(f"Bootstrap Samples: {self._samples_text(results)}\n")
             f.write(f"p-Wert: {results['p_value']:.6f}\n\n")
 
             if results['significant']:
@@ -164,77 +204,103 @@ class ReaktionszeitenVergleich:
         print(f"Ergebnisse gespeichert in: {os.path.join(output_dir, 'bootstrap_test_ergebnisse.txt')}")
 
 
-def load_data():
-    # Path to the uploaded zip file
-    zip_path = "data/json-files.zip"
-    extract_dir = "data/json-files"
+class ReaktionszeitenMatrix:
+    """Paarweise Permutationstests zwischen beliebig vielen Gruppen mit Holm- und FDR-Korrektur
 
-    # Extract the zip file if it hasn't been extracted already
-    if not os.path.exists(extract_dir):
-        os.makedirs(extract_dir)
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
+    Paare in paired werden gepaart über Vorzeichenwechsel der Differenzen je Person getestet.
+    """
+
+    def __init__(self, groups, bootstrap_samples=10000, alpha=0.05, rng=None, batch_size=None, exact='auto',
+                 paired=None):
+        # Dict Gruppenname -> Mittelwerte je Person
+        self.groups = {name: np.asarray(values, dtype=np.float64) for name, values in groups.items() if len(values)}
+        # Dict (Gruppe a, Gruppe b) -> Differenzen b - a je Person für gepaarte Vergleiche
+        self.paired = paired or {}
+        self.bootstrap_samples = bootstrap_samples
+        self.alpha = alpha
+        self.rng = np.random.default_rng(rng)
+        self.batch_size = batch_size
+        # Paare kleiner Gruppen exakt testen (siehe pairwise_permutation_tests)
+        self.exact = exact
+
+    def run_tests(self):
+        """Führt alle paarweisen Tests mit gemeinsamen Resamples durch"""
+        with stage('resampling', self.bootstrap_samples):
+            results = pd.DataFrame(pairwise_permutation_tests(
+                self.groups, self.bootstrap_samples, rng=self.rng, batch_size=self.batch_size, exact=self.exact,
+                paired=self.paired
+            ))
+        results['significant_holm'] = results['p_holm'] < self.alpha
+        results['significant_fdr'] = results['p_fdr'] < self.alpha
+        return results
 
-    # List the extracted files
-    extracted_files = os.listdir(extract_dir)
-    print(f"Extrahierte Dateien: {len(extracted_files)}")
+    def print_results(self):
+        """Gibt die Ergebnismatrix aus und speichert sie"""
+        results = self.run_tests()
+
+        n_exact = int(results['exact'].sum()) if len(results) else 0
+        samples = f"{self.bootstrap_samples} Samples" if n_exact < len(results) else "exakt"
+        if 0 < n_exact < len(results):
+            samples += f", {n_exact} exakt"
+        n_paired = int(results['paired'].sum()) if len(results) else 0
+        if n_paired:
+            samples += f", {n_paired} gepaart"
+        print(f"\n=== Paarweise Permutationstests ({len(results)} Vergleiche, {samples}) ===")
+        print(results.round(4).to_string(index=False))
+
+        with stage('schreiben'):
+            self.save_results_to_file(results)
 
-    # Sammle alle JSON-Daten
-    all_data = []
-    for file in extracted_files:
-        if file.endswith('.json'):
-            file_path = os.path.join(extract_dir, file)
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    data['filename'] = file
-                    all_data.append(data)
-            except Exception as e:
-                print(f"Fehler beim Lesen der Datei {file}: {e}")
+    def save_results_to_file(self, results):
+        """Speichert die Ergebnismatrix als CSV"""
+        output_dir = "data"
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
 
-    print(f"Insgesamt {len(all_data)} JSON-Dateien verarbeitet")
-    return all_data
+        results.round(6).to_csv(os.path.join(output_dir, 'paarvergleiche_ergebnisse.csv'), index=False)
+        print(f"Ergebnisse gespeichert in: {os.path.join(output_dir, 'paarvergleiche_ergebnisse.csv')}")
 
 
-def extract_test_data(all_data):
-    # Extrahiere Daten für B.2 (Binärer Stimulus) und B.3 (Lebensmittelerkennung)
-    binary_data = []
-    food_data = []
+# Gruppennamen der paarweisen Vergleiche je Bedingung (Reihenfolge wie CONDITIONS)
+GROUP_LABELS = ('Einfach', 'Binär (Lila)', 'Binär (Orange)', 'Essen (DE)', 'Essen (CN)', 'Essen (MX)')
 
-    for item in all_data:
-        if 'participant' in item and 'summary' in item:
-            name = item['participant'].get('name', '')
 
-            # Binärer Stimulus
-            if 'binary_stimulus' in item.get('filename', ''):
-                if 'purpleSquares' in item['summary'] and 'orangeSquares' in item['summary']:
-                    binary_data.append({
-                        'name': name,
-                        'purple_mean': item['summary']['purpleSquares'].get('mean', None),
-                        'orange_mean': item['summary']['orangeSquares'].get('mean', None),
-                        'error_rate': item['summary'].get('errorRate', 0)
-                    })
+def extract_group_data(study, index=None):
+    """Mittelwerte je Person und Bedingung sowie gepaarte Differenzen für Bedingungen desselben Experiments
 
-            # Lebensmittelerkennung
-            elif 'food_recognition' in item.get('filename', ''):
-                food_entry = {'name': name}
+    Über den ParticipantIndex zählt jede Person einmal (eine Sitzung je Experiment). Bedingungen
+    eines Experiments stammen aus derselben Sitzung und werden über die Differenzen je Person
+    gepaart getestet; Paare verschiedener Experimente bleiben unabhängige Gruppen.
+    """
+    index = index or ParticipantIndex(study)
+    _, means = index.condition_stats()
+    groups = {label: means[:, c][~np.isnan(means[:, c])] for c, label in enumerate(GROUP_LABELS)}
+    paired = {}
+    for a, b in WITHIN_PAIRS:
+        diffs = means[:, b] - means[:, a]
+        diffs = diffs[~np.isnan(diffs)]
+        if len(diffs):
+            paired[(GROUP_LABELS[a], GROUP_LABELS[b])] = diffs
+    return groups, paired
 
-                if 'germanFood' in item['summary']:
-                    food_entry['german_food_mean'] = item['summary']['germanFood'].get('mean', None)
-                    food_entry['german_food_error'] = item['summary']['germanFood'].get('errorRate', 0)
 
-                if 'chineseFood' in item['summary']:
-                    food_entry['chinese_food_mean'] = item['summary']['chineseFood'].get('mean', None)
-                    food_entry['chinese_food_error'] = item['summary']['chineseFood'].get('errorRate', 0)
+def load_data(workers=None):
+    # Alle Exporte einmalig in die Teilnehmer- und Trial-Tabelle einlesen
+    return load_study(exp_types=EXPERIMENT_TYPES, workers=workers)
 
-                if 'mexicanFood' in item['summary']:
-                    food_entry['mexican_food_mean'] = item['summary']['mexicanFood'].get('mean', None)
-                    food_entry['mexican_food_error'] = item['summary']['mexicanFood'].get('errorRate', 0)
 
-                food_data.append(food_entry)
+def extract_test_data(study):
+    # Extrahiere Daten für B.2 (Binärer Stimulus) und B.3 (Lebensmittelerkennung)
+    binary = study.of_type(BINARY)
+    binary = binary[binary['purple_mean'].notna() & binary['orange_mean'].notna()]
+    bin_df = binary[['name', 'purple_mean', 'orange_mean', 'error_rate']].reset_index(drop=True)
 
-    bin_df = pd.DataFrame(binary_data)
-    food_dff = pd.DataFrame(food_data)
+    food_dff = study.of_type(FOOD)[[
+        'name',
+        'german_food_mean', 'german_food_error',
+        'chinese_food_mean', 'chinese_food_error',
+        'mexican_food_mean', 'mexican_food_error',
+    ]].reset_index(drop=True)
 
     print(f"Binärer Stimulus: {len(bin_df)} Datensätze geladen")
     print(f"Lebensmittelerkennung: {len(food_dff)} Datensätze geladen")
@@ -242,14 +308,46 @@ def extract_test_data(all_data):
     return bin_df, food_dff
 
 
-if __name__ == "__main__":
+def print_screening(study, alpha=0.05, top=10, output_dir="data"):
+    """Klassische Tests als schnelles Screening vor den Resampling-Tests (Ausgabe und CSV)"""
+    with stage('statistik', len(study.trials)):
+        persons = person_tests(study, index=ParticipantIndex(study))
+        sessions = within_session_tests(study)
+
+    print("\n=== Screening: gepaarte Tests über Personen (t-Test, Wilcoxon) ===")
+    columns = ['condition_a', 'condition_b', 'n', 'mean_diff', 'p_ttest', 'p_wilcoxon',
+               'p_holm_ttest', 'p_holm_wilcoxon']
+    print(persons[columns].round(4).to_string(index=False))
+
+    significant = sessions[(sessions['p_fdr_welch'] < alpha) | (sessions['p_fdr_mwu'] < alpha)]
+    print(f"\n=== Screening: Bedingungen je Sitzung (Welch, Mann-Whitney) — {len(sessions)} Tests, "
+          f"{len(significant)} mit FDR < {alpha} ===")
+    if not significant.empty:
+        columns = ['name', 'condition_a', 'condition_b', 'n_a', 'n_b', 'diff', 'p_welch', 'p_mwu', 'p_fdr_welch']
+        print(significant.nsmallest(top, 'p_welch')[columns].round(4).to_string(index=False))
+
+    with stage('schreiben'):
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        persons.round(6).to_csv(os.path.join(output_dir, 'screening_personen.csv'), index=False)
+        sessions.round(6).to_csv(os.path.join(output_dir, 'screening_sitzungen.csv'), index=False)
+    print(f"Ergebnisse gespeichert in: {os.path.join(output_dir, 'screening_personen.csv')}, "
+          f"{os.path.join(output_dir, 'screening_sitzungen.csv')}")
+    return persons, sessions
+
+
+def main(plots=True, bootstrap_samples=10000, clean=False, rules=None, workers=None, pairwise=False):
     # Daten laden
     print("Daten werden geladen...")
-    all_data = load_data()
+    study = load_data(workers)
+    # Optional bereinigen: die Mittelwerte je Teilnehmer kommen dann aus den behaltenen Trials
+    if clean:
+        study = clean_and_report(study, os.path.join("data", 'bereinigung.csv'), **(rules or {}))
 
     # Testdaten extrahieren
     print("\nExtrahiere Testdaten für statistische Analyse...")
-    binary_df, food_df = extract_test_data(all_data)
+    with stage('statistik', len(study.participants)):
+        binary_df, food_df = extract_test_data(study)
 
     # Output-Verzeichnis erstellen, falls es nicht existiert
     output_dir = "data"
@@ -258,7 +356,18 @@ if __name__ == "__main__":
 
     # Bootstrap-Analyse durchführen
     print("\nFühre Bootstrap-Test durch...")
-    vergleich = ReaktionszeitenVergleich(binary_df, food_df, bootstrap_samples=10000)
-    vergleich.print_results()
+    vergleich = ReaktionszeitenVergleich(binary_df, food_df, bootstrap_samples=bootstrap_samples)
+    vergleich.print_results(plot=plots)
 
-    print("\nAnalyse abgeschlossen.")
\ No newline at end of file
+    # Optional alle Bedingungen paarweise vergleichen
+    if pairwise:
+        print("\nFühre paarweise Permutationstests durch...")
+        groups, paired = extract_group_data(study)
+        matrix = ReaktionszeitenMatrix(groups, bootstrap_samples=bootstrap_samples, paired=paired)
+        matrix.print_results()
+
+    print("\nAnalyse abgeschlossen.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from cache import CACHE_DIR, file_hash
+from ingest import (
+    list_entries, is_unchanged, parse_members, default_source,
+    CONDITIONS, REACTION, BINARY, FOOD
+)
+from reports import write_summary_csvs, write_experiment_summary
+from tracing import stage
+
+# Standardverzeichnis für den Zustand der inkrementellen Aggregation
+AGGREGATE_DIR = os.path.join(CACHE_DIR, 'aggregates')
+
+# Maximale Anzahl Zentroiden je Quantil-Sketch; kleinere Gruppen werden exakt gespeichert
+SKETCH_SIZE = 128
+
+STATE_VERSION = 1
+GROUP_COLUMNS = ('export', 'name', 'condition', 'n', 'mean', 'm2', 'sketch_offsets', 'sketch_values', 'sketch_weights')
+
+
+def compress_sketch(values, weights, size=SKETCH_SIZE):
+    """Fasst gewichtete Werte zu höchstens size Zentroiden gleichen Gewichts zusammen"""
+    order = np.argsort(values, kind='stable')
+    values = values[order]
+    weights = weights[order]
+    if len(values) <= size:
+        return values, weights
+
+    cumulative = np.cumsum(weights)
+    bucket = np.minimum(((cumulative - weights / 2) / cumulative[-1] * size).astype(np.int64), size - 1)
+    bucket_weights = np.bincount(bucket, weights, minlength=size)
+    bucket_values = np.bincount(bucket, weights * values, minlength=size)
+    used = bucket_weights > 0
+    return bucket_values[used] / bucket_weights[used], bucket_weights[used]
+
+
+def sketch_quantile(values, weights, q):
+    """Quantil aus einem Sketch; exakt wie np.quantile, solange der Sketch unkomprimiert ist"""
+    if len(values) == 0:
+        return np.nan
+    if np.all(weights == 1):
+        return np.quantile(values, q)
+    positions = np.cumsum(weights) - weights / 2
+    return np.interp(q * weights.sum(), positions, values)
+
+
+def merge_moments(n, mean, m2):
+    """Vereinigt laufende Momente (Anzahl, Mittelwert, M2) mehrerer Gruppen"""
+    total = n.sum()
+    if total == 0:
+        return 0, np.nan, np.nan
+    merged_mean = np.sum(n * mean) / total
+    merged_m2 = np.sum(m2) + np.sum(n * (mean - merged_mean) ** 2)
+    return total, merged_mean, merged_m2
+
+
+def _group_state_empty():
+    """Leerer Gruppen-Zustand"""
+    state = {col: np.empty(0) for col in GROUP_COLUMNS}
+    state.update({
+        'export': np.empty(0, dtype=str),
+        'name': np.empty(0, dtype=str),
+        'condition': np.empty(0, dtype=np.int8),
+        'n': np.empty(0, dtype=np.int64),
+        'sketch_offsets': np.zeros(1, dtype=np.int64),
+    })
+    return state
+
+
+def _group_state(study, names):
+    """Momente und Sketches je (Datei, Bedingung) einer frisch eingelesenen Teilstudie"""
+    participant = study.trials['participant'].to_numpy()
+    condition = study.trials['condition'].to_numpy()
+    rt = study.trials['rt'].to_numpy()
+    if len(rt) == 0:
+        return _group_state_empty()
+
+    # Gruppen sind in der Trial-Tabelle zusammenhängend
+    starts = np.flatnonzero((np.diff(participant, prepend=-1) != 0) | (np.diff(condition, prepend=-1) != 0))
+    counts = np.diff(np.append(starts, len(rt)))
+    means = np.add.reduceat(rt, starts) / counts
+    m2 = np.add.reduceat((rt - np.repeat(means, counts)) ** 2, starts)
+
+    # Sketch je Gruppe: sortierte Einzelwerte, große Gruppen komprimiert
+    group_id = np.repeat(np.arange(len(starts)), counts)
+    order = np.lexsort((rt, group_id))
+    sketch_values = [rt[order]]
+    sketch_weights = [np.ones(len(rt))]
+    sketch_lengths = counts.copy()
+    large = np.flatnonzero(counts > SKETCH_SIZE)
+    if len(large):
+        values_parts, weights_parts = [], []
+        bounds = np.append(starts, len(rt))
+        for g in range(len(starts)):
+            values = sketch_values[0][bounds[g]:bounds[g + 1]]
+            weights = sketch_weights[0][bounds[g]:bounds[g + 1]]
+            if counts[g] > SKETCH_SIZE:
+                values, weights = compress_sketch(values, weights)
+                sketch_lengths[g] = len(values)
+            values_parts.append(values)
+            weights_parts.append(weights)
+        sketch_values, sketch_weights = values_parts, weights_parts
+
+    rows = participant[starts]
+    return {
+        'export': np.asarray(names, dtype=str)[rows],
+        'name': study.participants['name'].to_numpy().astype(str)[rows],
+        'condition': condition[starts].astype(np.int8),
+        'n': counts.astype(np.int64),
+        'mean': means,
+        'm2': m2,
+        'sketch_offsets': np.concatenate(([0], np.cumsum(sketch_lengths))).astype(np.int64),
+        'sketch_values': np.concatenate(sketch_values),
+        'sketch_weights': np.concatenate(sketch_weights),
+    }
+
+
+def _select_groups(groups, keep):
+    """Behält nur die markierten Gruppen (inklusive ihrer Sketch-Abschnitte)"""
+    lengths = np.diff(groups['sketch_offsets'])
+    entry_keep = np.repeat(keep, lengths)
+    selected = {col: groups[col][keep] for col in ('export', 'name', 'condition', 'n', 'mean', 'm2')}
+    selected['sketch_offsets'] = np.concatenate(([0], np.cumsum(lengths[keep]))).astype(np.int64)
+    selected['sketch_values'] = groups['sketch_values'][entry_keep]
+    selected['sketch_weights'] = groups['sketch_weights'][entry_keep]
+    return selected
+
+
+def _concat_groups(first, second):
+    """Hängt zwei Gruppen-Zustände aneinander"""
+    merged = {col: np.concatenate([first[col], second[col]])
+              for col in ('export', 'name', 'condition', 'n', 'mean', 'm2', 'sketch_values', 'sketch_weights')}
+    merged['sketch_offsets'] = np.concatenate([first['sketch_offsets'],
+                                               second['sketch_offsets'][1:] + first['sketch_offsets'][-1]])
+    return merged
+
+
+class AggregateStore:
+    """Inkrementelle Statistik je Teilnehmer und Bedingung (Welford-Momente und Quantil-Sketches)
+
+    update() liest nur neue oder geänderte Exporte ein; die Zusammenfassungen werden
+    anschließend allein aus dem gespeicherten Zustand erzeugt.
+    """
+
+    def __init__(self, state_dir=AGGREGATE_DIR):
+        self.state_dir = state_dir
+        self.state_path = os.path.join(state_dir, 'state.npz')
+        self.manifest_path = os.path.join(state_dir, 'manifest.json')
+        self.files = {}
+        # Nicht lesbare Exporte (Eintrag mit 'error'); sie werden erst nach einer Änderung erneut gelesen
+        self.failed = {}
+        self.groups = _group_state_empty()
+        self.load()
+
+    def load(self):
+        """Lädt den gespeicherten Zustand, falls vorhanden und im aktuellen Format"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != STATE_VERSION:
+                return
+            with np.load(self.state_path, allow_pickle=False) as state:
+                self.groups = {col: state[col] for col in GROUP_COLUMNS}
+            self.files = manifest['files']
+            self.failed = manifest.get('failed', {})
+        except (OSError, ValueError, KeyError):
+            self.files = {}
+            self.failed = {}
+
+    def save(self):
+        """Speichert Zustand und Manifest (das Manifest zuletzt)"""
+        if not os.path.exists(self.state_dir):
+            os.makedirs(self.state_dir)
+
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **self.groups)
+        os.replace(tmp_path, self.state_path)
+
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STATE_VERSION, 'files': self.files, 'failed': self.failed}, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def update(self, source=None):
+        """Übernimmt neue, geänderte und entfernte Exporte; liefert (Anzahl neu eingelesen, Anzahl entfernt)"""
+        source = default_source(source)
+        entries = dict(list_entries(source))
+
+        pending = {name: entry for name, entry in entries.items()
+                   if not is_unchanged(source, name, entry, self.files.get(name))}
+        deleted = [name for name in self.files if name not in entries]
+        # Geänderte Dateien werden entfernt und neu eingelesen
+        removed = deleted + [name for name in pending if name in self.files]
+
+        # Fehlerhafte Exporte nur nach einer Änderung erneut lesen (wie StudyCache.failed)
+        known_failed = self.failed
+        self.failed = {}
+        for name, old in known_failed.items():
+            entry = pending.get(name)
+            if entry is not None and is_unchanged(source, name, entry, old):
+                self.failed[name] = {**old, **entry}
+                del pending[name]
+        if self.failed:
+            print(f"Unverändert fehlerhaft, übersprungen: {len(self.failed)}")
+
+        if removed:
+            keep = ~np.isin(self.groups['export'], removed)
+            self.groups = _select_groups(self.groups, keep)
+            for name in removed:
+                del self.files[name]
+
+        read_names = []
+        if pending:
+            with_hash = os.path.isdir(source)
+            read_names, hashes, study, errors = parse_members(source, list(pending), with_hash)
+            for name, e in errors:
+                print(f"Fehler beim Lesen von {os.path.basename(name)}: {e}")
+                entry = pending[name]
+                if 'hash' not in entry and with_hash:
+                    entry['hash'] = file_hash(os.path.join(source, name))
+                self.failed[name] = {**entry, 'error': str(e)}
+            for name, digest in zip(read_names, hashes):
+                if digest is not None:
+                    pending[name]['hash'] = digest
+                self.files[name] = pending[name]
+            self.groups = _concat_groups(self.groups, _group_state(study, read_names))
+
+        if pending or removed or self.failed != known_failed:
+            self.save()
+        print(f"Aggregation aktualisiert: {len(read_names)} Dateien neu eingelesen, {len(deleted)} entfernt")
+        return len(read_names), len(deleted)
+
+    def _sketch(self, g):
+        """Sketch der Gruppe g"""
+        start, end = self.groups['sketch_offsets'][g], self.groups['sketch_offsets'][g + 1]
+        return self.groups['sketch_values'][start:end], self.groups['sketch_weights'][start:end]
+
+    def participant_frames(self):
+        """Tabellen je Teilnehmer und Bedingung im Format von a2.py (reaction_df, binary_df, food_df)"""
+        groups = self.groups
+        order = np.lexsort((groups['condition'], groups['export']))
+        rows = {REACTION: [], BINARY: [], FOOD: []}
+        for g in order:
+            exp_type, condition, _ = CONDITIONS[groups['condition'][g]]
+            values, weights = self._sketch(g)
+            entry = {
+                'name': groups['name'][g] or 'Unbekannt',
+                'mean': groups['mean'][g],
+                'std': np.sqrt(groups['m2'][g] / groups['n'][g]),
+                'median': sketch_quantile(values, weights, 0.5),
+            }
+            if exp_type == BINARY:
+                entry['stimulus_type'] = condition
+            elif exp_type == FOOD:
+                entry['food_type'] = condition
+            rows[exp_type].append(entry)
+        return pd.DataFrame(rows[REACTION]), pd.DataFrame(rows[BINARY]), pd.DataFrame(rows[FOOD])
+
+    def condition_summary(self):
+        """Trial-Statistik je Bedingung aus den vereinigten Momenten und Sketches"""
+        summary = []
+        lengths = np.diff(self.groups['sketch_offsets'])
+        entry_condition = np.repeat(self.groups['condition'], lengths)
+        for index, (exp_type, condition, _) in enumerate(CONDITIONS):
+            mask = self.groups['condition'] == index
+            n, mean, m2 = merge_moments(self.groups['n'][mask], self.groups['mean'][mask], self.groups['m2'][mask])
+            values, weights = compress_sketch(self.groups['sketch_values'][entry_condition == index],
+                                              self.groups['sketch_weights'][entry_condition == index])
+            summary.append({
+                'experiment': exp_type,
+                'condition': condition,
+                'participants': int(mask.sum()),
+                'trials': int(n),
+                'mean': mean,
+                'std': np.sqrt(m2 / n) if n else np.nan,
+                'median': sketch_quantile(values, weights, 0.5),
+            })
+        return pd.DataFrame(summary)
+
+    def write_reports(self, output_dir="data/analysis_results"):
+        """Erzeugt die Zusammenfassungen von a2.py aus dem gespeicherten Zustand"""
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        reaction_df, binary_df, food_df = self.participant_frames()
+        write_summary_csvs(reaction_df, binary_df, food_df, output_dir)
+        write_experiment_summary(reaction_df, binary_df, food_df, output_dir)
+
+
+def main(source=None, output_dir="data/analysis_results"):
+    """Tägliche Aktualisierung: nur neue Exporte einlesen und die Zusammenfassungen von a2.py neu schreiben"""
+    store = AggregateStore()
+    with stage('einlesen'):
+        store.update(source)
+    with stage('schreiben'):
+        store.write_reports(output_dir)
+    print("\n=== Reaktionszeiten je Bedingung (alle Trials) ===")
+    print(store.condition_summary().round(2).to_string(index=False))
+    print(f"Zusammenfassungen gespeichert in: {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
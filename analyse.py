@@ -0,0 +1,127 @@
+"""Gemeinsamer Einstiegspunkt für die Auswertungen (python analyse.py --help)"""
+import argparse
+import sys
+
+# Schwere Bibliotheken (pandas, scipy, matplotlib) werden erst im gewählten Unterbefehl importiert;
+# mit --no-plots wird matplotlib nie geladen
+
+
+def cleaning_rules(args):
+    """Regeln für cleaning.trial_reasons aus den Kommandozeilenargumenten"""
+    return {'method': None if args.clean_method == 'keine' else args.clean_method,
+            'threshold': args.clean_threshold, 'max_error_rate': args.max_error_rate}
+
+
+def run_demografie(args):
+    import a1
+    a1.main(plots=not args.no_plots, workers=args.workers)
+
+
+def run_deskriptiv(args):
+    if args.inkrementell:
+        import aggregates
+        if args.clean:
+            print("Hinweis: --clean wird mit --inkrementell nicht angewendet (gespeichert sind alle Trials)")
+        aggregates.main()
+        return
+    import a2
+    a2.main(plots=not args.no_plots, clean=args.clean, rules=cleaning_rules(args), workers=args.workers)
+
+
+def run_bootstrap(args):
+    import a3
+    a3.main(plots=not args.no_plots, bootstrap_samples=args.samples, clean=args.clean, rules=cleaning_rules(args),
+            workers=args.workers, pairwise=args.paarweise)
+
+
+def run_screening(args):
+    import a3
+    study = a3.load_data(args.workers)
+    if args.clean:
+        from cleaning import clean_and_report
+        study = clean_and_report(study, 'data/bereinigung.csv', **cleaning_rules(args))
+    a3.print_screening(study)
+
+
+def run_konfidenz(args):
+    import trial_bootstrap
+    trial_bootstrap.main(n_resamples=args.samples, confidence=args.confidence, seed=args.seed,
+                         clean=args.clean, rules=cleaning_rules(args), workers=args.workers)
+
+
+def run_fitts(args):
+    import fitts
+    fitts.main(args.path, plots=not args.no_plots, running=args.laufend)
+
+
+def build_parser():
+    """Argumentparser mit einem Unterbefehl je Auswertung"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--no-plots', action='store_true',
+                        help='nur Text- und CSV-Ausgaben, matplotlib wird nicht geladen')
+    common.add_argument('--trace', nargs='?', const='data/trace.json', metavar='PFAD',
+                        help='Laufzeit und Speicher je Stufe messen und als JSON-Trace speichern')
+
+    reading = argparse.ArgumentParser(add_help=False)
+    reading.add_argument('--workers', type=int, metavar='N',
+                         help='Prozesse für das Einlesen (Standard: je CPU, sobald viele Dateien neu sind)')
+
+    cleaning = argparse.ArgumentParser(add_help=False)
+    cleaning.add_argument('--clean', action='store_true',
+                          help='Reaktionszeiten vor der Statistik bereinigen (Grenzen und Ausreißer)')
+    cleaning.add_argument('--clean-method', choices=('sd', 'mad', 'keine'), default='sd',
+                          help='Ausreißer je Teilnehmer und Bedingung über SD oder MAD (Standard: sd)')
+    cleaning.add_argument('--clean-threshold', type=float, default=2.5,
+                          help='Grenze in SD- bzw. MAD-Einheiten (Standard: 2.5)')
+    cleaning.add_argument('--max-error-rate', type=float, metavar='PROZENT',
+                          help='Bedingungen einer Sitzung mit höherer Fehlerquote entfernen')
+
+    parser = argparse.ArgumentParser(description='Auswertung der Reaktionszeit- und Fitts-Experimente')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    demografie = commands.add_parser('demografie', parents=[common, reading],
+                                     help='demographische Zusammenfassung (a1)')
+    demografie.set_defaults(handler=run_demografie)
+
+    deskriptiv = commands.add_parser('deskriptiv', parents=[common, reading, cleaning],
+                                     help='Statistik je Teilnehmer und Bedingung (a2)')
+    deskriptiv.add_argument('--inkrementell', action='store_true',
+                            help='nur neue oder geänderte Exporte einlesen (gespeicherter Zustand, ohne Grafiken)')
+    deskriptiv.set_defaults(handler=run_deskriptiv)
+
+    bootstrap = commands.add_parser('bootstrap', parents=[common, reading, cleaning],
+                                    help='Bootstrap- und Permutationstests (a3)')
+    bootstrap.add_argument('--samples', type=int, default=10000, help='Anzahl Resamples (Standard: 10000)')
+    bootstrap.add_argument('--paarweise', action='store_true',
+                           help='zusätzlich alle Bedingungspaare testen (Holm/FDR)')
+    bootstrap.set_defaults(handler=run_bootstrap)
+
+    screening = commands.add_parser('screening', parents=[common, reading, cleaning],
+                                    help='Welch-, Mann-Whitney-, t- und Wilcoxon-Tests für alle Bedingungspaare')
+    screening.set_defaults(handler=run_screening)
+
+    konfidenz = commands.add_parser('konfidenz', parents=[common, reading, cleaning],
+                                    help='Konfidenzintervalle je Bedingung (hierarchischer Bootstrap über Trials)')
+    konfidenz.add_argument('--samples', type=int, default=10000, help='Anzahl Resamples (Standard: 10000)')
+    konfidenz.add_argument('--confidence', type=float, default=0.95, help='Konfidenzniveau (Standard: 0.95)')
+    konfidenz.add_argument('--seed', type=int, default=0, help='Seed für reproduzierbare Intervalle (Standard: 0)')
+    konfidenz.set_defaults(handler=run_konfidenz)
+
+    fitts = commands.add_parser('fitts', parents=[common], help="Fitts' Gesetz für einen Export oder ein Verzeichnis")
+    fitts.add_argument('path', help='Taschenrechner-Export (.json/.fitts) oder Verzeichnis mit Exporten')
+    fitts.add_argument('--laufend', action='store_true',
+                       help='nur neue Exporte eines Verzeichnisses zu den gespeicherten Summen hinzufügen')
+    fitts.set_defaults(handler=run_fitts)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        import tracing
+        tracing.enable(args.trace)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
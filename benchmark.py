@@ -0,0 +1,547 @@
+"""Benchmark der Auswertung mit synthetischen Studien beliebiger Größe (JSON-Messung, Vergleich mit --compare)"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+import zipfile
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+from ingest import (
+    Study, CONDITIONS, TEXT_COLUMNS, NUMBER_COLUMNS, REACTION, BINARY, FOOD, load_study
+)
+
+# Wird erhöht, sobald sich Stufen oder Generator so ändern, dass alte Messungen nicht mehr vergleichbar sind
+BENCHMARK_VERSION = 1
+
+SCALES = (100, 1000, 10000)
+# Schnelltest (--smoke): jede Stufe einmal mit so vielen Teilnehmern
+SMOKE_SCALE = 100
+DEFAULT_OUTPUT = 'data/benchmark_ergebnisse.json'
+STAGES = ('ingest', 'ingest_cache', 'bereinigen', 'deskriptiv', 'screening', 'resampling', 'fitts', 'grafiken')
+
+# Obergrenze der Dateien, die für die Einlese-Stufen tatsächlich geschrieben werden
+MAX_FILES = 30000
+# Die Boxplots zeigen eine Box je Testperson; mehr Teilnehmer werden für die Grafiken nicht verwendet
+MAX_PLOT_PARTICIPANTS = 200
+
+# Parameter der synthetischen Daten (Reaktionszeiten in ms, Bewegungszeiten in s)
+GENDERS = ('male', 'female', 'diverse')
+GENDER_P = (0.55, 0.43, 0.02)
+COLOR_VISION = ('normal', 'red-green', 'blue-yellow')
+COLOR_VISION_P = (0.93, 0.06, 0.01)
+BROWSERS = (('Google Chrome', 'Windows'), ('Mozilla Firefox', 'Windows'), ('Safari', 'macOS'),
+            ('Google Chrome', 'macOS'), ('Microsoft Edge', 'Windows'), ('Google Chrome', 'Linux'))
+BROWSER_P = (0.45, 0.2, 0.15, 0.1, 0.07, 0.03)
+FOOD_SHOWN = 10
+# Je Bedingung: typischer Mittelwert, Streuung im Log-Raum und Anzahl Trials bzw. Fehlerrate
+REACTION_TRIALS = (740.0, 0.18, 30)
+BINARY_TRIALS = {'purpleReactionTimes': (660.0, 0.2), 'orangeReactionTimes': (600.0, 0.2)}
+FOOD_TRIALS = {'germanReactionTimes': (1300.0, 0.3, 0.08), 'chineseReactionTimes': (2500.0, 0.35, 0.35),
+               'mexicanReactionTimes': (2450.0, 0.35, 0.3)}
+FITTS_RUNS = 5
+FITTS_PRESSES = 8
+FITTS_A, FITTS_B = 0.25, 0.12
+
+FILE_PREFIXES = {REACTION: 'reaction_results', BINARY: 'binary_stimulus_results', FOOD: 'food_recognition'}
+_EXPERIMENT_ORDER = (REACTION, BINARY, FOOD)
+
+
+def _ragged(rng, counts, mean, sigma, speed):
+    """Ganzzahlige Reaktionszeiten als flaches Array mit Offsets (lognormal, Tempo je Teilnehmer)"""
+    owner = np.repeat(np.arange(len(counts)), counts)
+    values = np.rint(mean * speed[owner] * rng.lognormal(0.0, sigma, len(owner)))
+    return values, np.concatenate(([0], np.cumsum(counts)))
+
+
+def _moments(values, offsets):
+    """Anzahl, Mittelwert und Standardabweichung je Teilnehmer (NaN ohne Werte)"""
+    counts = np.diff(offsets)
+    owner = np.repeat(np.arange(len(counts)), counts)
+    sums = np.bincount(owner, values, minlength=len(counts))
+    squares = np.bincount(owner, values * values, minlength=len(counts))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / counts
+        std = np.sqrt(np.maximum(squares / counts - mean * mean, 0.0))
+    return counts, mean, std
+
+
+def _json_number(value):
+    """float bzw. int für JSON; NaN wird wie in JavaScript zu null"""
+    if value != value:
+        return None
+    return int(value) if float(value).is_integer() else float(value)
+
+
+class SyntheticStudy:
+    """Synthetische Teilnehmer, die alle drei Experimente absolviert haben, aus einem Seed
+
+    Alle Werte werden spaltenweise erzeugt; exports() liefert daraus JSON-Exporte
+    im Format der Webseiten, study() baut die Tabellen direkt ohne JSON.
+    """
+
+    def __init__(self, n_participants, seed=0):
+        rng = np.random.default_rng(seed)
+        n = self.n = n_participants
+
+        self.names = [f'Teilnehmer {i:07d}' for i in range(n)]
+        self.age = rng.integers(18, 31, n).astype(np.float64)
+        self.gender = np.asarray(GENDERS, dtype=object)[rng.choice(len(GENDERS), n, p=GENDER_P)]
+        self.color_vision = np.asarray(COLOR_VISION, dtype=object)[rng.choice(len(COLOR_VISION), n,
+                                                                              p=COLOR_VISION_P)]
+        browser = rng.choice(len(BROWSERS), n, p=BROWSER_P)
+        self.browser = np.asarray([b for b, _ in BROWSERS], dtype=object)[browser]
+        self.os = np.asarray([o for _, o in BROWSERS], dtype=object)[browser]
+        # Sehstärke: meist nicht angegeben (null), sonst 0 oder eine Korrektur in Viertel-Dioptrien
+        vision = np.where(rng.random((2, n)) < 0.6, np.nan,
+                          np.where(rng.random((2, n)) < 0.5, 0.0, np.round(rng.normal(0, 1.5, (2, n)) * 4) / 4))
+        self.vision_left, self.vision_right = vision
+
+        # Zeitstempel: Start im Erhebungszeitraum, Experimente im Abstand weniger Minuten
+        start = (np.datetime64('2025-05-07T08:00:00.000')
+                 + rng.integers(0, 5 * 86400 * 1000, n).astype('timedelta64[ms]'))
+        gaps = rng.integers(60, 600, (3, n)).cumsum(axis=0).astype('timedelta64[s]')
+        self.timestamps = [np.datetime_as_string(start + gap, unit='ms') for gap in gaps]
+
+        # Individuelles Tempo wirkt auf alle Experimente
+        speed = rng.lognormal(0.0, 0.15, n)
+
+        # Reaktionszeiten-Experiment (mit Abständen der Ziele in Pixel)
+        mean, sigma, count = REACTION_TRIALS
+        self.trials = {}
+        self.trials['reactionTimes'] = _ragged(rng, np.full(n, count), mean, sigma, speed)
+        self.distances = rng.uniform(100.0, 550.0, n * count)
+        self.mistakes = rng.poisson(0.3, n).astype(np.float64)
+
+        # Binärer Stimulus
+        for key, (mean, sigma) in BINARY_TRIALS.items():
+            self.trials[key] = _ragged(rng, rng.integers(6, 11, n), mean, sigma, speed)
+        self.total_triangles = rng.integers(10, 18, n)
+        self.total_squares = (np.diff(self.trials['purpleReactionTimes'][1])
+                              + np.diff(self.trials['orangeReactionTimes'][1]) + rng.integers(0, 3, n))
+        self.binary_mistakes = rng.binomial(self.total_squares + self.total_triangles, 0.02)
+        self.error_rate = self.binary_mistakes / (self.total_squares + self.total_triangles) * 100
+
+        # Lebensmittelerkennung: Fehler verkürzen die Anzahl der Reaktionszeiten
+        self.food_errors = {}
+        for key, (mean, sigma, error) in FOOD_TRIALS.items():
+            errors = rng.binomial(FOOD_SHOWN, error, n)
+            self.food_errors[key] = errors
+            self.trials[key] = _ragged(rng, FOOD_SHOWN - errors, mean, sigma, speed)
+
+        self.moments = {key: _moments(*self.trials[key]) for key in self.trials}
+
+    def filename(self, i, experiment):
+        """Dateiname wie beim Download aus der Webseite"""
+        stamp = self.timestamps[_EXPERIMENT_ORDER.index(experiment)][i][:19].replace(':', '-')
+        slug = self.names[i].lower().replace(' ', '_')
+        return f'{FILE_PREFIXES[experiment]}_{slug}_{stamp}.json'
+
+    def _participant(self, i):
+        return {
+            'name': self.names[i],
+            'age': int(self.age[i]),
+            'gender': self.gender[i],
+            'vision': {'left': _json_number(self.vision_left[i]), 'right': _json_number(self.vision_right[i])},
+            'colorVision': self.color_vision[i],
+            'browserInfo': {'browser': self.browser[i], 'os': self.os[i], 'language': 'de-DE'},
+        }
+
+    def _times(self, key, i):
+        values, offsets = self.trials[key]
+        return [int(v) for v in values[offsets[i]:offsets[i + 1]]]
+
+    def _stats(self, key, i):
+        count, mean, std = (m[i] for m in self.moments[key])
+        return {'count': int(count), 'mean': _json_number(mean), 'standardDeviation': _json_number(std)}
+
+    def exports(self, i):
+        """Die drei JSON-Exporte eines Teilnehmers als (Dateiname, Objekt)"""
+        participant = self._participant(i)
+        n_reaction = REACTION_TRIALS[2]
+        reaction = {
+            'participant': participant,
+            'summary': {**self._stats('reactionTimes', i), 'mistakes': int(self.mistakes[i])},
+            'rawData': {'reactionTimes': self._times('reactionTimes', i),
+                        'distances': self.distances[i * n_reaction:(i + 1) * n_reaction].tolist(),
+                        'timestamp': self.timestamps[0][i] + 'Z'},
+        }
+        binary = {
+            'participant': participant,
+            'summary': {'purpleSquares': self._stats('purpleReactionTimes', i),
+                        'orangeSquares': self._stats('orangeReactionTimes', i),
+                        'errorRate': _json_number(self.error_rate[i]),
+                        'totalSquares': int(self.total_squares[i]),
+                        'totalTriangles': int(self.total_triangles[i]),
+                        'mistakes': int(self.binary_mistakes[i])},
+            'rawData': {'purpleReactionTimes': self._times('purpleReactionTimes', i),
+                        'orangeReactionTimes': self._times('orangeReactionTimes', i),
+                        'timestamp': self.timestamps[1][i] + 'Z'},
+        }
+        food = {'participant': participant, 'summary': {},
+                'rawData': {'errors': {}, 'timestamp': self.timestamps[2][i] + 'Z'}}
+        for key, summary_key in zip(FOOD_TRIALS, ('germanFood', 'chineseFood', 'mexicanFood')):
+            errors = int(self.food_errors[key][i])
+            food['summary'][summary_key] = {**self._stats(key, i), 'totalShown': FOOD_SHOWN,
+                                            'errorRate': errors * 100 / FOOD_SHOWN}
+            food['rawData'][key] = self._times(key, i)
+            food['rawData']['errors'][summary_key[:-4]] = errors
+        return [(self.filename(i, REACTION), reaction), (self.filename(i, BINARY), binary),
+                (self.filename(i, FOOD), food)]
+
+    def write_zip(self, path, n_participants=None):
+        """Schreibt die Exporte der ersten n_participants Teilnehmer in ein ZIP-Archiv wie data/json-files.zip"""
+        n_participants = self.n if n_participants is None else min(n_participants, self.n)
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+            for i in range(n_participants):
+                for filename, data in self.exports(i):
+                    archive.writestr('json-files/' + filename, json.dumps(data))
+        return 3 * n_participants
+
+    def study(self):
+        """Teilnehmer- und Trial-Tabelle wie load_study(), direkt aus den Spalten gebaut"""
+        n = self.n
+        rows = 3 * n
+        experiment = np.tile(np.arange(3), n)
+        person = np.repeat(np.arange(n), 3)
+
+        text = {
+            'filename': [self.filename(i, e) for i in range(n) for e in _EXPERIMENT_ORDER],
+            'experiment_type': np.asarray(_EXPERIMENT_ORDER, dtype=object)[experiment],
+            'name': np.asarray(self.names, dtype=object)[person],
+            'gender': self.gender[person],
+            'colorVision': self.color_vision[person],
+            'browser': self.browser[person],
+            'os': self.os[person],
+            'timestamp': np.stack(self.timestamps, axis=1).ravel().astype(object) + 'Z',
+        }
+        numbers = {col: np.full(rows, np.nan) for col in NUMBER_COLUMNS}
+        numbers['age'] = self.age[person]
+        numbers['vision_left'] = self.vision_left[person]
+        numbers['vision_right'] = self.vision_right[person]
+        summary_columns = (
+            (0, 'mean_reaction_time', self.moments['reactionTimes'][1]),
+            (0, 'mistakes', self.mistakes),
+            (1, 'purple_mean', self.moments['purpleReactionTimes'][1]),
+            (1, 'orange_mean', self.moments['orangeReactionTimes'][1]),
+            (1, 'error_rate', self.error_rate),
+        ) + tuple(
+            column
+            for key, prefix in zip(FOOD_TRIALS, ('german', 'chinese', 'mexican'))
+            for column in ((2, f'{prefix}_food_mean', self.moments[key][1]),
+                           (2, f'{prefix}_food_error', self.food_errors[key] * 100 / FOOD_SHOWN))
+        )
+        for e, column, values in summary_columns:
+            numbers[column][e::3] = values
+
+        participants = pd.DataFrame({
+            **{col: np.asarray(text[col], dtype=object) for col in TEXT_COLUMNS},
+            **{col: numbers[col] for col in NUMBER_COLUMNS},
+        })
+
+        # Trials nach (Zeile, Bedingung) ordnen wie beim Einlesen
+        parts = []
+        for condition, (cond_type, _, key) in enumerate(CONDITIONS):
+            values, offsets = self.trials[key]
+            owner = np.repeat(np.arange(n), np.diff(offsets)) * 3 + _EXPERIMENT_ORDER.index(cond_type)
+            parts.append((owner, np.full(len(values), condition, dtype=np.int8), values))
+        participant, condition, rt = (np.concatenate(column) for column in zip(*parts))
+        order = np.lexsort((condition, participant))
+        trials = pd.DataFrame({
+            'participant': participant[order].astype(np.int32),
+            'condition': condition[order],
+            'rt': rt[order],
+        })
+        return Study(participants, trials)
+
+    def write_fitts_sessions(self, directory, n_sessions=None, seed=0):
+        """Schreibt Taschenrechner-Exporte (Liste von Durchgängen mit key, MT, ID) als JSON-Dateien"""
+        n_sessions = self.n if n_sessions is None else min(n_sessions, self.n)
+        rng = np.random.default_rng(seed)
+        keys = np.asarray(list('0123456789*='))
+        for s in range(n_sessions):
+            shape = (FITTS_RUNS, FITTS_PRESSES)
+            ids = rng.uniform(1.0, 4.0, shape)
+            mts = np.maximum(FITTS_A + FITTS_B * ids + rng.normal(0.0, 0.08, shape), 0.05)
+            # Erste Taste eines Durchgangs ohne Bewegung, gleiche Taste zweimal ohne ID (-Infinity wird null)
+            ids[:, 0] = 0.0
+            mts[:, 0] = 0.0
+            repeated = rng.random(shape) < 0.05
+            pressed = keys[rng.integers(0, len(keys), shape)]
+            runs = [{'run': r, 'data': [{'key': str(pressed[r, p]), 'MT': float(mts[r, p]),
+                                         'ID': None if repeated[r, p] else float(ids[r, p])}
+                                        for p in range(FITTS_PRESSES)]}
+                    for r in range(FITTS_RUNS)]
+            with open(os.path.join(directory, f'fitts_session_{s:07d}.json'), 'w', encoding='utf-8') as f:
+                json.dump(runs, f)
+        return n_sessions
+
+
+# Stufen: erhalten (Studie, Arbeitsverzeichnis, Optionen), bereiten ungemessen vor
+# und liefern (zu messende Funktion, Anzahl verarbeiteter Einheiten)
+
+def stage_ingest(synthetic, workdir, options):
+    source = os.path.join(workdir, 'json-files.zip')
+    if not os.path.exists(source):
+        synthetic.write_zip(source, options.max_files // 3)
+    files = min(synthetic.n, options.max_files // 3) * 3
+    return lambda: load_study(source=source, cache_dir=None, workers=options.workers), files
+
+
+def stage_ingest_cache(synthetic, workdir, options):
+    run, files = stage_ingest(synthetic, workdir, options)
+    source = os.path.join(workdir, 'json-files.zip')
+    cache_dir = os.path.join(workdir, 'cache')
+    # Erster Lauf füllt den Cache, gemessen wird das Laden unveränderter Exporte
+    load_study(source=source, cache_dir=cache_dir, workers=options.workers)
+    return lambda: load_study(source=source, cache_dir=cache_dir, workers=options.workers), files
+
+
+def stage_bereinigen(synthetic, workdir, options):
+    from cleaning import clean_study, removal_table
+    study = synthetic.study()
+
+    def run():
+        cleaned, reasons = clean_study(study, method='mad')
+        return removal_table(study, reasons)
+    return run, len(study.trials)
+
+
+def stage_deskriptiv(synthetic, workdir, options):
+    from a2 import participant_summary, experiment_frames
+    from reports import condition_means
+    study = synthetic.study()
+
+    def run():
+        frames = experiment_frames(participant_summary(study.long_table()))
+        return condition_means(*frames)
+    return run, len(study.trials)
+
+
+def stage_screening(synthetic, workdir, options):
+    from screening import within_session_tests, person_tests
+    study = synthetic.study()
+
+    def run():
+        return person_tests(study), within_session_tests(study)
+    return run, len(study.trials)
+
+
+def stage_resampling(synthetic, workdir, options):
+    from a3 import ReaktionszeitenVergleich, ReaktionszeitenMatrix, extract_group_data, extract_test_data
+    study = synthetic.study()
+
+    def run():
+        binary_df, food_df = extract_test_data(study)
+        ReaktionszeitenVergleich(binary_df, food_df, bootstrap_samples=options.resamples,
+                                 rng=options.seed).run_bootstrap_test()
+        groups, paired = extract_group_data(study)
+        return ReaktionszeitenMatrix(groups, bootstrap_samples=options.resamples, rng=options.seed,
+                                     paired=paired).run_tests()
+    return run, len(study.participants) * options.resamples
+
+
+def stage_fitts(synthetic, workdir, options):
+    from fitts import load_sessions, fit_all
+    directory = os.path.join(workdir, 'fitts')
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+        synthetic.write_fitts_sessions(directory, options.max_files, seed=options.seed)
+    sessions = min(synthetic.n, options.max_files)
+
+    def run():
+        names, table = load_sessions(directory)
+        return fit_all(table, names)
+    return run, sessions * FITTS_RUNS * FITTS_PRESSES
+
+
+def stage_grafiken(synthetic, workdir, options):
+    from a2 import participant_summary, experiment_frames, figure_jobs
+    from figures import render_figures
+    from reports import condition_means
+    study = synthetic.study()
+    if synthetic.n > options.max_plot:
+        study = study.take(np.arange(3 * options.max_plot))
+    trials = study.long_table()
+    reaction_times = condition_means(*experiment_frames(participant_summary(trials)))
+    output_dir = os.path.join(workdir, 'grafiken')
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = os.path.join(workdir, 'figures.json')
+
+    def run():
+        # Ohne Manifest wird jedes Mal vollständig gerendert
+        if os.path.exists(manifest):
+            os.remove(manifest)
+        return render_figures(figure_jobs(trials, reaction_times, output_dir), workers=options.workers,
+                              manifest_path=manifest)
+    return run, len(trials)
+
+
+STAGE_FUNCTIONS = {
+    'ingest': stage_ingest,
+    'ingest_cache': stage_ingest_cache,
+    'bereinigen': stage_bereinigen,
+    'deskriptiv': stage_deskriptiv,
+    'screening': stage_screening,
+    'resampling': stage_resampling,
+    'fitts': stage_fitts,
+    'grafiken': stage_grafiken,
+}
+
+
+def measure(run, repeat, memory=True):
+    """Laufzeiten (Sekunden) von repeat Läufen und Spitzenspeicher (MB) eines zusätzlichen Laufs"""
+    seconds = []
+    # Hinweise von matplotlib zu großen Grafiken würden die Ausgabe überdecken
+    warnings.simplefilter('ignore', UserWarning)
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            run()
+            seconds.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                run()
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return seconds, peak
+
+
+def _commit():
+    """Aktueller Git-Commit (kurz) oder None außerhalb eines Repositorys"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scales=SCALES, stages=STAGES, repeat=3, memory=True, options=None):
+    """Misst alle Stufen für alle Größen und liefert das Ergebnis als JSON-fähiges Dict"""
+    results = []
+    for scale in scales:
+        synthetic = SyntheticStudy(scale, seed=options.seed)
+        with tempfile.TemporaryDirectory(prefix='benchmark_') as workdir:
+            for stage in stages:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run, items = STAGE_FUNCTIONS[stage](synthetic, workdir, options)
+                seconds, peak = measure(run, repeat, memory)
+                result = {'scale': scale, 'stage': stage, 'items': int(items), 'seconds': min(seconds),
+                          'runs': seconds, 'peak_mb': peak}
+                results.append(result)
+                memory_text = f", {peak:.1f} MB" if peak is not None else ''
+                print(f"{scale:>8} Teilnehmer  {stage:<13} {min(seconds):9.4f} s{memory_text}")
+
+    return {
+        'version': BENCHMARK_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'environment': {'python': platform.python_version(), 'numpy': np.__version__,
+                        'pandas': pd.__version__, 'platform': platform.platform(),
+                        'cpus': os.cpu_count()},
+        'options': {'repeat': repeat, 'memory': memory, 'seed': options.seed, 'resamples': options.resamples,
+                    'max_files': options.max_files, 'max_plot': options.max_plot, 'workers': options.workers},
+        'results': results,
+    }
+
+
+def compare(current, baseline, tolerance=0.25, min_seconds=0.01):
+    """Vergleicht zwei Messungen je (Größe, Stufe); liefert Tabellenzeilen und die Anzahl Verschlechterungen
+
+    Als Verschlechterung gilt eine um mehr als tolerance längere Laufzeit (oder ein
+    entsprechend höherer Spitzenspeicher), sofern die Differenz über min_seconds liegt.
+    """
+    old = {(r['scale'], r['stage']): r for r in baseline['results']}
+    rows = []
+    regressions = 0
+    for result in current['results']:
+        before = old.get((result['scale'], result['stage']))
+        if before is None:
+            continue
+        time_ratio = result['seconds'] / before['seconds'] if before['seconds'] else np.nan
+        slower = time_ratio > 1 + tolerance and result['seconds'] - before['seconds'] > min_seconds
+        memory_ratio = None
+        if result['peak_mb'] is not None and before.get('peak_mb'):
+            memory_ratio = round(result['peak_mb'] / before['peak_mb'], 2)
+        larger = memory_ratio is not None and memory_ratio > 1 + tolerance
+        regressions += bool(slower or larger)
+        rows.append([result['scale'], result['stage'], round(before['seconds'], 4), round(result['seconds'], 4),
+                     round(time_ratio, 2), memory_ratio, 'VERSCHLECHTERT' if slower or larger else ''])
+    return rows, regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Benchmark der Auswertung mit synthetischen Studien')
+    parser.add_argument('--scales', type=int, nargs='+', default=list(SCALES),
+                        help='Anzahl Teilnehmer je Messung (Standard: %(default)s)')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES), help='zu messende Stufen')
+    parser.add_argument('--repeat', type=int, default=3, help='Läufe je Stufe, das beste zählt (Standard: 3)')
+    parser.add_argument('--no-memory', action='store_true', help='keinen zusätzlichen Lauf mit tracemalloc')
+    parser.add_argument('--resamples', type=int, default=1000, help='Resamples der Permutationstests')
+    parser.add_argument('--max-files', type=int, default=MAX_FILES,
+                        help='höchstens so viele Exporte für die Einlese- und Fitts-Stufen schreiben')
+    parser.add_argument('--max-plot', type=int, default=MAX_PLOT_PARTICIPANTS,
+                        help='höchstens so viele Teilnehmer in den Grafiken (Standard: %(default)s)')
+    parser.add_argument('--workers', type=int,
+                        help='Prozesse für Einlesen und Grafiken (Standard: automatisch wie in den Skripten)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed des Generators und der Resamples')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='JSON-Datei für die Messung (Standard: %(default)s)')
+    parser.add_argument('--compare', metavar='BASELINE', help='frühere Messung zum Vergleich')
+    parser.add_argument('--toleranz', type=float, default=0.25,
+                        help='erlaubte relative Verschlechterung beim Vergleich (Standard: 0.25)')
+    parser.add_argument('--smoke', action='store_true',
+                        help=f'Schnelltest: alle Stufen einmal mit {SMOKE_SCALE} Teilnehmern, ohne Speichermessung '
+                             'und ohne JSON-Ausgabe')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.smoke:
+        # Jede Stufe muss mit einer kleinen Studie durchlaufen (Fehler brechen mit Traceback ab)
+        run_benchmarks((SMOKE_SCALE,), args.stages, 1, False, args)
+        print("Schnelltest bestanden")
+        return 0
+
+    current = run_benchmarks(args.scales, args.stages, args.repeat, not args.no_memory, args)
+
+    directory = os.path.dirname(args.output)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=1)
+    print(f"Messung gespeichert in: {args.output}")
+
+    if args.compare:
+        from tabulate import tabulate
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('version') != BENCHMARK_VERSION:
+            print(f"Baseline hat Version {baseline.get('version')}, erwartet {BENCHMARK_VERSION}: kein Vergleich")
+            return 0
+        rows, regressions = compare(current, baseline, args.toleranz)
+        print(f"\nVergleich mit {args.compare} (Commit {baseline.get('commit')}):")
+        print(tabulate(rows, headers=['Teilnehmer', 'Stufe', 'vorher (s)', 'jetzt (s)', 'Zeit x', 'Speicher x', ''],
+                       tablefmt='pretty'))
+        if regressions:
+            print(f"{regressions} Verschlechterung(en) über {args.toleranz:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
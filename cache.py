@@ -0,0 +1,190 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+# Standardverzeichnis für den Cache der eingelesenen Tabellen
+CACHE_DIR = "data/.cache"
+
+# Wird erhöht, sobald sich das Format der gespeicherten Tabellen ändert
+CACHE_VERSION = 4
+
+MANIFEST_FILE = 'manifest.json'
+# Je Speichern ein Shard mit den neu eingelesenen Exporten: tables_0000.npz, tables_0001.npz, ...
+SHARD_PATTERN = 'tables_{:04d}.npz'
+# Höchstens so viele Shards; darüber (oder bei mehr toten als lebenden Zeilen) wird zu einem zusammengefasst
+MAX_SHARDS = 32
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """Berechnet den SHA-1-Hash des Dateiinhalts"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(content):
+    """Berechnet den SHA-1-Hash bereits gelesener Bytes"""
+    return hashlib.sha1(content).hexdigest()
+
+
+def take_rows(participants, trials, rows):
+    """Teiltabellen mit den angegebenen (aufsteigenden) Teilnehmer-Zeilen, Trial-Indizes neu nummeriert (Study.take)"""
+    remap = np.full(len(participants), -1, dtype=np.int64)
+    remap[rows] = np.arange(len(rows))
+    new_index = remap[trials['participant'].to_numpy()]
+    keep = new_index >= 0
+    trials = trials[keep].reset_index(drop=True)
+    trials['participant'] = new_index[keep].astype(np.int32)
+    return participants.iloc[rows].reset_index(drop=True), trials
+
+
+class StudyCache:
+    """Speichert Teilnehmer- und Trial-Tabelle als NPZ-Shards plus Manifest (Größe, mtime, Hash je Datei)
+
+    Jedes Speichern schreibt nur die neu eingelesenen Exporte als eigenen Shard; unveränderte
+    Exporte behalten ihren Platz (Shard, Zeile). Exporte, die nicht gelesen werden konnten,
+    stehen mit ihrer Fehlermeldung im Manifest und werden erst nach einer Änderung erneut gelesen.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+        # Stand des zuletzt geladenen Manifests: Name -> Eintrag mit 'shard' und 'shard_row',
+        # Shard -> Anzahl gespeicherter Zeilen (inklusive nicht mehr benötigter)
+        self.files = {}
+        self.shards = {}
+        self.failed = {}
+
+    def load(self):
+        """Liefert (Manifest, Teilnehmer, Trials) oder ({}, None, None), wenn kein gültiger Cache existiert
+
+        Die Shards werden aneinandergehängt; 'row' im Manifest ist die Zeile in der gemeinsamen Tabelle.
+        """
+        self.files, self.shards, self.failed = {}, {}, {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != CACHE_VERSION:
+                return {}, None, None
+
+            participant_parts, trial_parts, offsets = [], [], {}
+            offset = 0
+            for shard in manifest['shards']:
+                with np.load(os.path.join(self.cache_dir, shard), allow_pickle=False) as tables:
+                    participants = pd.DataFrame({
+                        col: tables['p_' + col].astype(object) if col in manifest['text_columns']
+                        else tables['p_' + col]
+                        for col in manifest['columns']
+                    })
+                    trials = pd.DataFrame({col: tables['t_' + col] for col in manifest['trial_columns']})
+                trials['participant'] = (trials['participant'] + offset).astype(np.int32)
+                participant_parts.append(participants)
+                trial_parts.append(trials)
+                offsets[shard] = offset
+                offset += len(participants)
+            files = {name: {**entry, 'row': offsets[entry['shard']] + entry['shard_row']}
+                     for name, entry in manifest['files'].items()}
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(self.manifest_path):
+                print(f"Cache wird neu aufgebaut ({e})")
+            return {}, None, None
+
+        self.files, self.shards, self.failed = manifest['files'], manifest['shards'], manifest['failed']
+        if not participant_parts:
+            return files, None, None
+        return (files, pd.concat(participant_parts, ignore_index=True),
+                pd.concat(trial_parts, ignore_index=True))
+
+    def _write_shard(self, participants, trials, text_columns):
+        """Schreibt einen neuen Shard und liefert seinen Dateinamen"""
+        number = 0
+        while os.path.exists(os.path.join(self.cache_dir, SHARD_PATTERN.format(number))) or \
+                SHARD_PATTERN.format(number) in self.shards:
+            number += 1
+        shard = SHARD_PATTERN.format(number)
+
+        arrays = {}
+        for col in participants.columns:
+            values = participants[col].to_numpy()
+            arrays['p_' + col] = values.astype(str) if col in text_columns else values
+        for col in trials.columns:
+            arrays['t_' + col] = trials[col].to_numpy()
+
+        path = os.path.join(self.cache_dir, shard)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        return shard
+
+    def save(self, files, participants, trials, text_columns, failed=None):
+        """Schreibt neue Shards und das Manifest; das Manifest zuletzt, damit ein Abbruch den Cache nur ungültig macht
+
+        files: Name -> Eintrag mit 'row' (Zeile in participants). Exporte mit gleichem Hash wie im
+        geladenen Manifest bleiben in ihrem Shard, nur die übrigen Zeilen werden als neuer Shard
+        geschrieben. failed: Name -> Eintrag mit 'error' für nicht lesbare Exporte.
+        """
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        locations = {}
+        new_rows = []
+        for name, entry in files.items():
+            old = self.files.get(name)
+            if old is not None and old.get('hash') == entry.get('hash') and old['shard'] in self.shards:
+                locations[name] = (old['shard'], old['shard_row'])
+            else:
+                new_rows.append(entry['row'])
+
+        # Zusammenfassen, wenn zu viele Shards entstehen oder die Shards überwiegend tote Zeilen enthalten
+        live = {shard for shard, _ in locations.values()}
+        dead = sum(self.shards[shard] for shard in live) - len(locations)
+        compact = len(live) + bool(new_rows) > MAX_SHARDS or dead > len(locations)
+
+        shards = {}
+        if compact:
+            if len(participants):
+                shard = self._write_shard(participants, trials, text_columns)
+                shards[shard] = len(participants)
+                locations = {name: (shard, entry['row']) for name, entry in files.items()}
+        else:
+            shards = {shard: rows for shard, rows in self.shards.items() if shard in live}
+            if new_rows:
+                rows = np.sort(np.asarray(new_rows, dtype=np.int64))
+                shard = self._write_shard(*take_rows(participants, trials, rows), text_columns)
+                shards[shard] = len(rows)
+                shard_row = {row: i for i, row in enumerate(rows.tolist())}
+                for name, entry in files.items():
+                    if name not in locations:
+                        locations[name] = (shard, shard_row[entry['row']])
+
+        manifest = {
+            'version': CACHE_VERSION,
+            'columns': list(participants.columns),
+            'text_columns': list(text_columns),
+            'trial_columns': list(trials.columns),
+            'shards': shards,
+            'files': {
+                name: {**{k: v for k, v in entry.items() if k != 'row'},
+                       'shard': locations[name][0], 'shard_row': int(locations[name][1])}
+                for name, entry in files.items()
+            },
+            'failed': failed or {},
+        }
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+        # Nicht mehr benötigte Shards (auch verwaiste oder aus älteren Versionen) erst nach dem Manifest löschen
+        for file in os.listdir(self.cache_dir):
+            if file.startswith('tables') and file.endswith('.npz') and file not in shards:
+                try:
+                    os.remove(os.path.join(self.cache_dir, file))
+                except OSError:
+                    pass
+        self.files, self.shards, self.failed = manifest['files'], shards, manifest['failed']
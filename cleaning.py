@@ -0,0 +1,193 @@
+"""Bereinigung der Trial-Tabelle (Grenzen, Fehlerquote, Ausreißer je Teilnehmer) vor der Statistik"""
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+from ingest import Study, CONDITIONS, CONDITION_NAMES, REACTION, BINARY, FOOD
+from groups import group_median, MAD_SCALE
+from tracing import stage
+
+# Absolute Grenzen (ms) je Experiment-Typ: kürzer = Antizipation, länger = Aussetzer
+CUTOFFS = {
+    REACTION: (100.0, 3000.0),
+    BINARY: (100.0, 3000.0),
+    FOOD: (200.0, 6000.0),
+}
+
+# Gründe je Trial (Index = Code im Array von trial_reasons). Die Exporte enthalten nur
+# Reaktionszeiten richtiger Antworten, Fehler nur als Quote je Bedingung: entfernt werden
+# daher ganze Bedingungen einer Sitzung mit zu hoher Fehlerquote, keine einzelnen Fehler-Trials
+REASONS = ('behalten', 'zu kurz', 'zu lang', 'Fehlerquote', 'Ausreißer')
+KEPT, TOO_SHORT, TOO_LONG, ERROR_RATE, OUTLIER = range(len(REASONS))
+
+# Summary-Spalten je Bedingung (Reihenfolge wie CONDITIONS): (Mittelwert, Fehler)
+SUMMARY_COLUMNS = (
+    ('mean_reaction_time', 'mistakes'),
+    ('purple_mean', 'error_rate'),
+    ('orange_mean', 'error_rate'),
+    ('german_food_mean', 'german_food_error'),
+    ('chinese_food_mean', 'chinese_food_error'),
+    ('mexican_food_mean', 'mexican_food_error'),
+)
+
+
+def trial_groups(study):
+    """Gruppennummer je Trial für (Teilnehmer, Bedingung) sowie Teilnehmer-Zeile und Bedingung je Gruppe"""
+    participant = study.trials['participant'].to_numpy()
+    condition = study.trials['condition'].to_numpy()
+    if len(participant) == 0:
+        return np.empty(0, dtype=np.int64), participant, condition
+
+    # Die Trial-Tabelle ist nach (participant, condition) geordnet
+    change = (np.diff(participant) != 0) | (np.diff(condition) != 0)
+    group = np.concatenate(([0], np.cumsum(change)))
+    starts = np.flatnonzero(np.concatenate(([True], change)))
+    return group, participant[starts], condition[starts]
+
+
+def group_spread(group, values, n_groups, method='sd'):
+    """Lage, Streuung und Anzahl je Gruppe: Mittelwert/Standardabweichung (ddof=1) oder Median/MAD"""
+    n = np.bincount(group, minlength=n_groups)
+    if method == 'mad':
+        center = group_median(group, values, n_groups)
+        scale = MAD_SCALE * group_median(group, np.abs(values - center[group]), n_groups)
+        return center, scale, n
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        center = np.bincount(group, values, minlength=n_groups) / n
+        deviation = values - center[group]
+        scale = np.sqrt(np.bincount(group, deviation * deviation, minlength=n_groups) / (n - 1))
+    return center, scale, n
+
+
+def error_rates(study):
+    """Fehlerquote (%) je Teilnehmer-Zeile und Bedingung als Matrix [Zeile, Bedingung]; fehlend = NaN"""
+    participants = study.participants
+    rates = np.column_stack([participants[column].to_numpy(dtype=float) if column in participants
+                             else np.full(len(participants), np.nan) for _, column in SUMMARY_COLUMNS])
+
+    # A.1 speichert die Anzahl Fehler: Quote bezogen auf alle Versuche (richtige + falsche)
+    trials = study.trials
+    correct = np.bincount(trials['participant'].to_numpy()[trials['condition'].to_numpy() == 0],
+                          minlength=len(participants))
+    attempts = correct + rates[:, 0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rates[:, 0] = np.where(attempts > 0, rates[:, 0] / attempts * 100, np.nan)
+    return rates
+
+
+def trial_reasons(study, cutoffs=CUTOFFS, method='sd', threshold=2.5, iterations=1, min_trials=5,
+                  max_error_rate=None):
+    """Grund je Trial (Code in REASONS, KEPT = behalten) als int8-Array in Reihenfolge der Trial-Tabelle
+
+    cutoffs: {Experiment-Typ: (min, max)} in ms oder None. method: 'sd', 'mad' oder None
+    (kein Trimmen); getrimmt wird bei Abstand > threshold * Streuung, wiederholt bis zu
+    iterations-mal. Gruppen mit weniger als min_trials verbleibenden Trials bleiben ungetrimmt.
+    max_error_rate: Bedingungen einer Sitzung mit höherer Fehlerquote (%) werden ganz entfernt.
+    """
+    if method not in ('sd', 'mad', None):
+        raise ValueError(f"Unbekannte Methode: {method!r} (erwartet 'sd', 'mad' oder None)")
+
+    participant = study.trials['participant'].to_numpy()
+    condition = study.trials['condition'].to_numpy()
+    rt = study.trials['rt'].to_numpy()
+    reasons = np.zeros(len(rt), dtype=np.int8)
+
+    if cutoffs:
+        bounds = np.array([cutoffs.get(cond_type, (-np.inf, np.inf)) for cond_type, _, _ in CONDITIONS], dtype=float)
+        reasons[rt < bounds[condition, 0]] = TOO_SHORT
+        reasons[rt > bounds[condition, 1]] = TOO_LONG
+
+    if max_error_rate is not None:
+        too_many_errors = error_rates(study)[participant, condition] > max_error_rate
+        reasons[(reasons == KEPT) & too_many_errors] = ERROR_RATE
+
+    if method is not None and len(rt):
+        group, group_participant, _ = trial_groups(study)
+        n_groups = len(group_participant)
+        for _ in range(iterations):
+            kept = np.flatnonzero(reasons == KEPT)
+            kept_group = group[kept]
+            center, scale, n = group_spread(kept_group, rt[kept], n_groups, method)
+            # Gruppen ohne Streuung (alle Werte gleich) oder mit zu wenigen Trials nicht trimmen
+            trimmed = (n >= min_trials) & (scale > 0)
+            outlier = trimmed[kept_group] & (np.abs(rt[kept] - center[kept_group]) > threshold * scale[kept_group])
+            if not outlier.any():
+                break
+            reasons[kept[outlier]] = OUTLIER
+    return reasons
+
+
+def summary_from_trials(study):
+    """Teilnehmer-Tabelle mit aus den Trials neu berechneten Mittelwert-Spalten (NaN ohne Trials)"""
+    participants = study.participants.copy()
+    participant = study.trials['participant'].to_numpy()
+    condition = study.trials['condition'].to_numpy()
+    n_rows = len(participants)
+
+    cell = participant.astype(np.int64) * len(CONDITIONS) + condition
+    counts = np.bincount(cell, minlength=n_rows * len(CONDITIONS)).reshape(n_rows, -1)
+    sums = np.bincount(cell, study.trials['rt'].to_numpy(), minlength=n_rows * len(CONDITIONS)).reshape(n_rows, -1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, sums / counts, np.nan)
+
+    for index, (cond_type, _, _) in enumerate(CONDITIONS):
+        column = SUMMARY_COLUMNS[index][0]
+        if column in participants:
+            # Nur Zeilen des passenden Experiments; andere Experimente behalten ihr NaN
+            own = (participants['experiment_type'] == cond_type).to_numpy()
+            participants[column] = np.where(own, means[:, index], participants[column].to_numpy(dtype=float))
+    return participants
+
+
+def clean_study(study, **rules):
+    """Bereinigte Studie und Grund je Trial der ursprünglichen Trial-Tabelle
+
+    Die bereinigte Studie enthält nur die behaltenen Trials; die Mittelwert-Spalten der
+    Teilnehmer-Tabelle werden daraus neu berechnet (summary_from_trials). Regeln wie trial_reasons().
+    """
+    with stage('bereinigen', len(study.trials)):
+        reasons = trial_reasons(study, **rules)
+        kept = Study(study.participants, study.trials[reasons == KEPT].reset_index(drop=True))
+        cleaned = Study(summary_from_trials(kept), kept.trials)
+    return cleaned, reasons
+
+
+def removal_table(study, reasons):
+    """Anzahl Trials je Teilnehmer und Bedingung: gesamt (n) und je Grund aus REASONS"""
+    group, participant, condition = trial_groups(study)
+    n_groups = len(participant)
+    counts = np.bincount(group * len(REASONS) + reasons, minlength=n_groups * len(REASONS)).reshape(n_groups, -1)
+
+    names = np.asarray([name or 'Unbekannt' for name in study.participants['name']], dtype=object)
+    table = pd.DataFrame({
+        'participant': participant,
+        'name': names[participant],
+        'experiment': np.asarray([c[0] for c in CONDITIONS], dtype=object)[condition],
+        'condition': np.asarray(CONDITION_NAMES, dtype=object)[condition],
+        'n': counts.sum(axis=1),
+    })
+    for code, reason in enumerate(REASONS):
+        table[reason] = counts[:, code]
+    return table
+
+
+def print_removals(table):
+    """Entfernte Trials je Bedingung und Grund als Tabelle ausgeben"""
+    totals = table.groupby('condition', sort=False)[['n', *REASONS]].sum()
+    totals = totals.reindex([name for name in CONDITION_NAMES if name in totals.index])
+    totals.loc['Gesamt'] = totals.sum()
+    totals['entfernt (%)'] = ((1 - totals['behalten'] / totals['n'].where(totals['n'] > 0)) * 100).round(2)
+    print("\n=== Bereinigung der Reaktionszeiten ===")
+    print(tabulate(totals.reset_index(), headers='keys', tablefmt='pretty', showindex=False))
+
+
+def clean_and_report(study, path=None, **rules):
+    """Bereinigt die Studie, gibt die Übersicht aus und speichert die Tabelle je Teilnehmer (optional als CSV)"""
+    cleaned, reasons = clean_study(study, **rules)
+    table = removal_table(study, reasons)
+    print_removals(table)
+    if path:
+        table.to_csv(path, index=False)
+        print(f"Entfernte Trials je Teilnehmer gespeichert in: {path}")
+    return cleaned
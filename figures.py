@@ -0,0 +1,253 @@
+import os
+import json
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from cache import CACHE_DIR, content_hash
+from tracing import stage
+
+# Manifest mit dem Hash der Eingabedaten je gerenderter Grafik
+FIGURE_MANIFEST = os.path.join(CACHE_DIR, 'figures.json')
+
+# Wird erhöht, sobald sich das Aussehen einer Grafik ändert (erzwingt neues Rendern)
+FIGURE_VERSION = 1
+
+# Obergrenzen für große Eingaben: Ausreißer je Box und Punkte je Streudiagramm
+MAX_FLIERS = 200
+MAX_SCATTER_POINTS = 5000
+# Ab so vielen Testpersonen je Boxplot steht die Legende fest oben rechts; die Suche nach der
+# besten Position prüft jede Box und dauert bei hunderten Boxen Sekunden
+MAX_BEST_LEGEND_NAMES = 50
+
+# Ab so vielen neu zu rendernden Grafiken nutzt render_figures(workers=None) einen Prozess-Pool;
+# darunter kosten Prozessstart und matplotlib-Import je Worker mehr als das Rendern selbst
+PARALLEL_MIN_FIGURES = 8
+
+
+def box_stats(values, group, n_groups, whis=1.5, max_fliers=MAX_FLIERS):
+    """Boxplot-Kennzahlen je Gruppe (Quartile, Whisker, Ausreißer) wie matplotlib.cbook.boxplot_stats
+
+    Alle Gruppen werden über eine gemeinsame Sortierung berechnet; leere Gruppen liefern None.
+    Je Gruppe werden höchstens max_fliers Ausreißer (gleichmäßig über die sortierten Werte) behalten.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    group = np.asarray(group, dtype=np.int64)
+    order = np.lexsort((values, group))
+    values = values[order]
+    group = group[order]
+    counts = np.bincount(group, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    filled = counts > 0
+
+    def quantile(q):
+        # Lineare Interpolation wie np.percentile
+        position = starts + q * np.maximum(counts - 1, 0)
+        low = np.floor(position).astype(np.int64)
+        high = np.minimum(low + 1, starts + np.maximum(counts - 1, 0))
+        result = np.full(n_groups, np.nan)
+        frac = (position - low)[filled]
+        result[filled] = values[low[filled]] + (values[high[filled]] - values[low[filled]]) * frac
+        return result
+
+    q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+    iqr = q3 - q1
+    lower_fence = (q1 - whis * iqr)[group]
+    upper_fence = (q3 + whis * iqr)[group]
+
+    inside = (values >= lower_fence) & (values <= upper_fence)
+    whislo = np.full(n_groups, np.inf)
+    whishi = np.full(n_groups, -np.inf)
+    np.minimum.at(whislo, group[inside], values[inside])
+    np.maximum.at(whishi, group[inside], values[inside])
+
+    outside = np.flatnonzero(~inside)
+    flier_bounds = np.searchsorted(group[outside], np.arange(n_groups + 1))
+
+    stats = []
+    for g in range(n_groups):
+        if not filled[g]:
+            stats.append(None)
+            continue
+        fliers = values[outside[flier_bounds[g]:flier_bounds[g + 1]]]
+        if len(fliers) > max_fliers:
+            fliers = fliers[np.linspace(0, len(fliers) - 1, max_fliers).astype(np.int64)]
+        stats.append({
+            'med': median[g], 'q1': q1[g], 'q3': q3[g],
+            # Ohne Werte innerhalb der Grenzen fallen die Whisker auf die Quartile zurück
+            'whislo': whislo[g] if np.isfinite(whislo[g]) else q1[g],
+            'whishi': whishi[g] if np.isfinite(whishi[g]) else q3[g],
+            'fliers': fliers,
+        })
+    return stats
+
+
+def grouped_box_stats(names, values, hues=None):
+    """Boxplot-Kennzahlen je Testperson (und optional je Bedingung) für das Panel 'boxplot'
+
+    names und hues werden in der Reihenfolge ihres ersten Auftretens angeordnet.
+    """
+    import pandas as pd
+    name_codes, name_levels = pd.factorize(np.asarray(names, dtype=object))
+    if hues is None:
+        hue_codes, hue_levels = np.zeros(len(name_codes), dtype=np.int64), [None]
+    else:
+        hue_codes, hue_levels = pd.factorize(np.asarray(hues, dtype=object))
+    n_hues = len(hue_levels)
+    stats = box_stats(values, name_codes * n_hues + hue_codes, len(name_levels) * n_hues)
+    return {'names': list(name_levels), 'hues': list(hue_levels), 'stats': stats}
+
+
+def histogram(values, bins):
+    """Histogramm als (counts, edges), damit nicht alle Werte an den Renderer gehen"""
+    counts, edges = np.histogram(np.asarray(values, dtype=np.float64), bins=bins)
+    return counts, edges
+
+
+def downsample(x, y, max_points=MAX_SCATTER_POINTS, seed=0):
+    """Reproduzierbare Zufallsauswahl von höchstens max_points Punkten für Streudiagramme"""
+    if len(x) <= max_points:
+        return np.asarray(x), np.asarray(y)
+    keep = np.sort(np.random.default_rng(seed).choice(len(x), max_points, replace=False))
+    return np.asarray(x)[keep], np.asarray(y)[keep]
+
+
+def _pie(ax, panel):
+    ax.pie(panel['values'], labels=panel['labels'], autopct='%1.1f%%')
+    ax.set_title(panel['title'])
+
+
+def _bar(ax, panel):
+    ax.bar(panel['labels'], panel['values'])
+    ax.set_title(panel['title'])
+    ax.set_xlabel(panel.get('xlabel', ''))
+    ax.set_ylabel(panel.get('ylabel', ''))
+    ax.tick_params(axis='x', labelrotation=45)
+    if panel.get('grid'):
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+
+def _histogram(ax, panel):
+    counts, edges = panel['counts'], panel['edges']
+    ax.hist(edges[:-1], edges, weights=counts, align=panel.get('align', 'mid'), alpha=panel.get('alpha'))
+    if 'line' in panel:
+        ax.axvline(panel['line'], color='red', linestyle='--', label=panel['line_label'])
+        ax.legend()
+    ax.set_title(panel['title'])
+    ax.set_xlabel(panel['xlabel'])
+    ax.set_ylabel(panel['ylabel'])
+
+
+def _boxplot(ax, panel):
+    from matplotlib.patches import Patch
+    names, hues, stats = panel['names'], panel['hues'], panel['stats']
+    n_hues = len(hues)
+    width = 0.8 / n_hues
+    for h, hue in enumerate(hues):
+        boxes = [stats[i * n_hues + h] for i in range(len(names))]
+        positions = [i + (h - (n_hues - 1) / 2) * width for i in range(len(names)) if boxes[i] is not None]
+        boxes = [box for box in boxes if box is not None]
+        if boxes:
+            ax.bxp(boxes, positions=positions, widths=width * 0.9, patch_artist=True, manage_ticks=False,
+                   boxprops={'facecolor': f'C{h}'}, medianprops={'color': 'black'})
+    ax.set_xticks(range(len(names)))
+    ax.set_xticklabels(names, rotation=45)
+    ax.set_xlim(-0.5, len(names) - 0.5)
+    ax.set_title(panel['title'])
+    ax.set_xlabel(panel['xlabel'])
+    ax.set_ylabel(panel['ylabel'])
+    if n_hues > 1:
+        ax.legend(handles=[Patch(facecolor=f'C{h}', label=hue) for h, hue in enumerate(hues)],
+                  title=panel.get('legend_title'),
+                  loc='best' if len(names) <= MAX_BEST_LEGEND_NAMES else 'upper right')
+
+
+def _regression(ax, panel):
+    ax.scatter(panel['x'], panel['y'], color='purple', alpha=0.6, label='Messwerte')
+    ax.plot(panel['x_line'], panel['y_line'], color='red', label='Regressionslinie')
+    ax.set_title(panel['title'])
+    ax.set_xlabel(panel['xlabel'])
+    ax.set_ylabel(panel['ylabel'])
+    ax.grid(True)
+    ax.legend()
+
+
+PANELS = {
+    'pie': _pie,
+    'bar': _bar,
+    'histogram': _histogram,
+    'boxplot': _boxplot,
+    'regression': _regression,
+}
+
+
+def render_figure(job):
+    """Rendert eine Grafik mit dem nicht-interaktiven Agg-Backend; läuft auch in den Worker-Prozessen
+
+    job: {'path', 'figsize', 'layout': (Zeilen, Spalten), 'panels': [{'kind', ...} oder None]}
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    rows, cols = job.get('layout', (1, 1))
+    fig, axes = plt.subplots(rows, cols, figsize=job['figsize'], squeeze=False)
+    for ax, panel in zip(axes.ravel(), job['panels']):
+        if panel is None:
+            ax.set_axis_off()
+        else:
+            PANELS[panel['kind']](ax, panel)
+    fig.tight_layout()
+    fig.savefig(job['path'])
+    plt.close(fig)
+    return job['path']
+
+
+def _job_hash(job):
+    """Hash über Version und Eingabedaten einer Grafik"""
+    return content_hash(pickle.dumps((FIGURE_VERSION, job), protocol=4))
+
+
+def render_figures(jobs, workers=None, manifest_path=FIGURE_MANIFEST):
+    """Rendert alle Grafiken, deren Eingabedaten sich seit dem letzten Lauf geändert haben
+
+    Jede Grafik ist ein unabhängiger Job; mit workers > 1 werden sie in einem Prozess-Pool
+    mit höchstens einem Prozess je Grafik gerendert; workers=None rendert seriell und erst ab
+    PARALLEL_MIN_FIGURES Grafiken mit einem Prozess je CPU. Liefert die Pfade der neu gerenderten Grafiken.
+    """
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    hashes = {job['path']: _job_hash(job) for job in jobs}
+    pending = []
+    for job in jobs:
+        if manifest.get(job['path']) == hashes[job['path']] and os.path.exists(job['path']):
+            print(f"Grafik unverändert, übersprungen: {job['path']}")
+        else:
+            pending.append(job)
+
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(pending) >= PARALLEL_MIN_FIGURES else 1
+    workers = min(workers, len(pending))
+    with stage('grafiken', len(pending)):
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                rendered = list(executor.map(render_figure, pending))
+        else:
+            rendered = [render_figure(job) for job in pending]
+    for path in rendered:
+        print(f"Grafik gespeichert: {path}")
+
+    if rendered:
+        manifest.update({path: hashes[path] for path in rendered})
+        directory = os.path.dirname(manifest_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_path, manifest_path)
+    return rendered
@@ -0,0 +1,398 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from groups import group_median, MAD_SCALE
+from tracing import stage
+
+# Gewichtsfunktion der robusten Anpassung: Huber-Konstante (in Einheiten der robusten Streuung)
+HUBER_K = 1.345
+
+# Binärexport der Taschenrechner-Aufgaben (saveResultsBinary in D1/D2 function.js)
+BINARY_EXTENSION = '.fitts'
+BINARY_MAGIC = b'FITTSBIN'
+BINARY_VERSION = 1
+BINARY_HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('count', '<u4')])
+
+# Gespeicherte Summen des laufenden Modus je Verzeichnis (eigene Endung, wird nicht als Export gelesen)
+RUNNING_STATE = 'fitts_summen.state'
+RUNNING_VERSION = 1
+
+
+def load_binary_session(path):
+    """Liest einen binären Taschenrechner-Export (Spalten MT, ID, run, key) ohne Parsen einzelner Objekte"""
+    buffer = np.fromfile(path, dtype=np.uint8)
+    header = np.frombuffer(buffer, dtype=BINARY_HEADER, count=1)[0]
+    if header['magic'] != BINARY_MAGIC or header['version'] != BINARY_VERSION:
+        raise ValueError("kein Taschenrechner-Binärexport (Version %d erwartet)" % BINARY_VERSION)
+    n = int(header['count'])
+    offset = BINARY_HEADER.itemsize
+    if len(buffer) < offset + 21 * n:
+        raise ValueError("Binärexport unvollständig")
+
+    mts = np.frombuffer(buffer, dtype='<f8', count=n, offset=offset)
+    ids = np.frombuffer(buffer, dtype='<f8', count=n, offset=offset + 8 * n)
+    run = np.frombuffer(buffer, dtype='<i4', count=n, offset=offset + 16 * n).astype(np.int64)
+
+    # JSON speichert eine ID von -Infinity (gleiche Taste zweimal) als null; beide werden verworfen
+    valid = np.isfinite(ids)
+    return run[valid], ids[valid], mts[valid]
+
+
+def load_session(path):
+    """Liest einen Taschenrechner-Export und liefert (run, ID, MT) als flache Arrays
+
+    Die Arrays werden in einem Durchgang mit bekannter Länge gefüllt; Einträge
+    ohne ID werden wie in E.py verworfen. Binärexporte (.fitts) werden direkt
+    spaltenweise gelesen.
+    """
+    if path.endswith(BINARY_EXTENSION):
+        return load_binary_session(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        runs = json.load(f)
+    if not isinstance(runs, list):
+        raise ValueError("kein Taschenrechner-Export (Liste von Durchgängen erwartet)")
+
+    counts = np.fromiter((len(r['data']) for r in runs), dtype=np.int64, count=len(runs))
+    total = int(counts.sum())
+    run = np.repeat(np.fromiter((r['run'] for r in runs), dtype=np.int64, count=len(runs)), counts)
+    ids = np.fromiter((np.nan if item['ID'] is None else item['ID'] for r in runs for item in r['data']),
+                      dtype=np.float64, count=total)
+    mts = np.fromiter((item['MT'] for r in runs for item in r['data']), dtype=np.float64, count=total)
+
+    valid = ~np.isnan(ids)
+    return run[valid], ids[valid], mts[valid]
+
+
+def load_sessions(directory):
+    """Liest alle Taschenrechner-Exporte eines Verzeichnisses in eine Tabelle (session, run, ID, MT)"""
+    files = sorted(f for f in os.listdir(directory) if f.endswith(('.json', BINARY_EXTENSION)))
+    sessions = []
+    parts = []
+    for file in files:
+        try:
+            run, ids, mts = load_session(os.path.join(directory, file))
+        except Exception as e:
+            print(f"Fehler beim Lesen von {file}: {e}")
+            continue
+        parts.append((np.full(len(ids), len(sessions), dtype=np.int64), run, ids, mts))
+        sessions.append(file)
+
+    if not parts:
+        return sessions, pd.DataFrame({'session': [], 'run': [], 'ID': [], 'MT': []})
+    session, run, ids, mts = (np.concatenate(column) for column in zip(*parts))
+    return sessions, pd.DataFrame({'session': session, 'run': run, 'ID': ids, 'MT': mts})
+
+
+def fit_groups(group, x, y, weights=None, n_groups=None):
+    """Gewichtete Regression y = a + b * x für alle Gruppen gleichzeitig
+
+    Nutzt nur die Summen je Gruppe (np.bincount), liefert Arrays (a, b, n, r2).
+    """
+    if weights is None:
+        weights = np.ones(len(x))
+    n_groups = n_groups if n_groups is not None else (int(group.max()) + 1 if len(group) else 0)
+
+    sw = np.bincount(group, weights, minlength=n_groups)
+    sx = np.bincount(group, weights * x, minlength=n_groups)
+    sy = np.bincount(group, weights * y, minlength=n_groups)
+    sxx = np.bincount(group, weights * x * x, minlength=n_groups)
+    sxy = np.bincount(group, weights * x * y, minlength=n_groups)
+    syy = np.bincount(group, weights * y * y, minlength=n_groups)
+    n = np.bincount(group, minlength=n_groups)
+
+    a, b, r2 = fit_from_sums(sw, sx, sy, sxx, sxy, syy)
+    return a, b, n, r2
+
+
+def fit_from_sums(sw, sx, sy, sxx, sxy, syy):
+    """Regressionsparameter (a, b, r2) allein aus den Summen n, ΣID, ΣMT, ΣID², ΣID·MT, ΣMT²"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var_x = sw * sxx - sx ** 2
+        var_y = sw * syy - sy ** 2
+        cov = sw * sxy - sx * sy
+        b = cov / var_x
+        a = (sy - b * sx) / sw
+        r2 = cov ** 2 / (var_x * var_y)
+    return a, b, r2
+
+
+def robust_fit_groups(group, x, y, n_groups=None, iterations=20):
+    """Robuste Regression je Gruppe (IRLS mit Huber-Gewichten, Streuung über MAD)"""
+    n_groups = n_groups if n_groups is not None else (int(group.max()) + 1 if len(group) else 0)
+    a, b, n, r2 = fit_groups(group, x, y, n_groups=n_groups)
+    for _ in range(iterations):
+        residuals = y - (a[group] + b[group] * x)
+        scale = MAD_SCALE * group_median(group, np.abs(residuals), n_groups)
+        scale = np.where(scale > 0, scale, 1.0)
+        u = np.abs(residuals) / (HUBER_K * scale[group])
+        weights = np.where(u <= 1, 1.0, 1.0 / np.maximum(u, 1e-12))
+        a, b, n, r2 = fit_groups(group, x, y, weights=weights, n_groups=n_groups)
+    return a, b, n, r2
+
+
+def fit_all(table, sessions, robust=True):
+    """Fitts-Parameter je Sitzung, je Durchgang und gepoolt in einer Tabelle"""
+    session = table['session'].to_numpy().astype(np.int64)
+    run = table['run'].to_numpy().astype(np.int64)
+    x = table['ID'].to_numpy()
+    y = table['MT'].to_numpy()
+
+    # Gruppenindizes der drei Ebenen (Durchgänge über alle Sitzungen eindeutig)
+    run_keys, run_group = np.unique(np.stack([session, run], axis=1), axis=0, return_inverse=True)
+    run_group = run_group.ravel()
+    levels = (
+        ('gepoolt', np.zeros(len(x), dtype=np.int64), [('alle', None)]),
+        ('sitzung', session, [(sessions[s], None) for s in range(len(sessions))]),
+        ('durchgang', run_group, [(sessions[s], r) for s, r in run_keys]),
+    )
+
+    frames = []
+    for level, group, labels in levels:
+        n_groups = len(labels)
+        a, b, n, r2 = fit_groups(group, x, y, n_groups=n_groups)
+        frame = pd.DataFrame({
+            'ebene': level,
+            'sitzung': [label[0] for label in labels],
+            'durchgang': [label[1] for label in labels],
+            'n': n,
+            'a': a,
+            'b': b,
+            'r2': r2,
+        })
+        if robust:
+            frame['a_robust'], frame['b_robust'], _, _ = robust_fit_groups(group, x, y, n_groups=n_groups)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+class FittsAccumulator:
+    """Laufende Fitts-Regression mit konstantem Speicher je Gruppe
+
+    Gespeichert werden nur die Summen (n, ΣID, ΣMT, ΣID², ΣID·MT, ΣMT²) je Gruppe,
+    z.B. je Sitzung oder (Sitzung, Durchgang). Teil-Akkumulatoren aus verschiedenen
+    Dateien oder Prozessen lassen sich mit merge() zusammenführen; fit() liefert
+    jederzeit a, b, r2 und den Durchsatz ΣID / ΣMT.
+    """
+
+    STATS = ('n', 'sum_id', 'sum_mt', 'sum_id2', 'sum_id_mt', 'sum_mt2')
+
+    def __init__(self):
+        self.sums = {}
+
+    def add(self, ids, mts, key=None):
+        """Nimmt neue Messwerte (ID, MT) einer Gruppe auf"""
+        x = np.asarray(ids, dtype=np.float64)
+        y = np.asarray(mts, dtype=np.float64)
+        stats = np.array([len(x), x.sum(), y.sum(), (x * x).sum(), (x * y).sum(), (y * y).sum()])
+        if key in self.sums:
+            self.sums[key] += stats
+        else:
+            self.sums[key] = stats
+        return self
+
+    def add_session(self, path, session=None):
+        """Nimmt einen Taschenrechner-Export auf, gruppiert nach (Sitzung, Durchgang)"""
+        session = session if session is not None else os.path.basename(path)
+        run, ids, mts = load_session(path)
+        runs, group = np.unique(run, return_inverse=True)
+        columns = (np.ones(len(ids)), ids, mts, ids * ids, ids * mts, mts * mts)
+        stats = np.stack([np.bincount(group, c, minlength=len(runs)) for c in columns], axis=1)
+        for r, row in zip(runs, stats):
+            key = (session, int(r))
+            if key in self.sums:
+                self.sums[key] += row
+            else:
+                self.sums[key] = row
+        return self
+
+    def merge(self, other):
+        """Übernimmt die Summen eines anderen Akkumulators"""
+        for key, stats in other.sums.items():
+            if key in self.sums:
+                self.sums[key] += stats
+            else:
+                self.sums[key] = stats.copy()
+        return self
+
+    def total(self, select=None):
+        """Summen über alle (oder die per select(key) ausgewählten) Gruppen"""
+        rows = [stats for key, stats in self.sums.items() if select is None or select(key)]
+        return np.sum(rows, axis=0) if rows else np.zeros(len(self.STATS))
+
+    def fit(self, key=None, pooled=False):
+        """a, b, r2 und Durchsatz einer Gruppe oder (pooled=True) über alle Gruppen"""
+        stats = self.total() if pooled else self.sums.get(key, np.zeros(len(self.STATS)))
+        n, sx, sy, sxx, sxy, syy = stats
+        a, b, r2 = fit_from_sums(n, sx, sy, sxx, sxy, syy)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            throughput = sx / sy
+        return {'n': int(n), 'a': float(a), 'b': float(b), 'r2': float(r2), 'durchsatz': float(throughput)}
+
+    def table(self):
+        """Parameter aller Gruppen als Tabelle (eine Zeile je Gruppe)"""
+        keys = list(self.sums)
+        stats = np.array([self.sums[key] for key in keys]).reshape(-1, len(self.STATS))
+        a, b, r2 = fit_from_sums(*stats.T)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            throughput = stats[:, 1] / stats[:, 2]
+        return pd.DataFrame({
+            'gruppe': keys,
+            'n': stats[:, 0].astype(np.int64),
+            'a': a,
+            'b': b,
+            'r2': r2,
+            'durchsatz': throughput,
+        })
+
+    def to_dict(self):
+        """JSON-taugliche Darstellung des Zustands"""
+        return {'groups': [[list(key) if isinstance(key, tuple) else key, stats.tolist()]
+                           for key, stats in self.sums.items()]}
+
+    @classmethod
+    def from_dict(cls, state):
+        """Stellt einen Akkumulator aus to_dict() wieder her"""
+        accumulator = cls()
+        for key, stats in state['groups']:
+            accumulator.sums[tuple(key) if isinstance(key, list) else key] = np.asarray(stats, dtype=np.float64)
+        return accumulator
+
+
+def update_running(directory, state_path=None):
+    """Schreibt die laufenden Fitts-Summen eines Verzeichnisses fort, ohne alte Exporte erneut zu lesen
+
+    Gespeichert werden die Summen je (Sitzung, Durchgang) (FittsAccumulator.to_dict) und Größe
+    und mtime je Export. Neue Exporte werden mit add_session aufgenommen, geänderte ersetzen
+    ihre alten Summen, entfernte werden abgezogen; nicht lesbare werden erst nach einer
+    Änderung erneut gelesen. Liefert (Akkumulator, Anzahl neu eingelesener Exporte).
+    """
+    state_path = state_path or os.path.join(directory, RUNNING_STATE)
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != RUNNING_VERSION:
+            raise ValueError(f"Version {state.get('version')}")
+        accumulator = FittsAccumulator.from_dict(state['sums'])
+        files, failed = state['files'], state['failed']
+    except (OSError, ValueError, KeyError):
+        accumulator, files, failed = FittsAccumulator(), {}, {}
+
+    entries = {}
+    for file in os.listdir(directory):
+        if file.endswith(('.json', BINARY_EXTENSION)):
+            stat = os.stat(os.path.join(directory, file))
+            entries[file] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+
+    # Summen geänderter und entfernter Exporte verwerfen
+    stale = {file for file, entry in files.items() if entries.get(file) != entry}
+    if stale:
+        accumulator.sums = {key: stats for key, stats in accumulator.sums.items() if key[0] not in stale}
+    files = {file: entry for file, entry in files.items() if file not in stale}
+    known_failed = {file: entry for file, entry in failed.items() if entries.get(file) == entry}
+
+    added = 0
+    failed = {}
+    for file in sorted(entries):
+        if file in files:
+            continue
+        if file in known_failed:
+            failed[file] = known_failed[file]
+            continue
+        try:
+            accumulator.add_session(os.path.join(directory, file))
+        except Exception as e:
+            print(f"Fehler beim Lesen von {file}: {e}")
+            failed[file] = entries[file]
+            continue
+        files[file] = entries[file]
+        added += 1
+
+    if added or stale or failed != known_failed:
+        tmp_path = state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': RUNNING_VERSION, 'files': files, 'failed': failed,
+                       'sums': accumulator.to_dict()}, f)
+        os.replace(tmp_path, state_path)
+    return accumulator, added
+
+
+def print_fit(fit, robust=None):
+    """Gibt die gepoolten Fitts-Parameter aus (robust: (a, b) der robusten Anpassung)"""
+    print("Fitts' Gesetz Parameter (gepoolt):")
+    print(f"a (Intercept): {fit['a']:.4f}")
+    print(f"b (Slope): {fit['b']:.4f}")
+    print(f"r2: {fit['r2']:.4f}, Durchsatz: {fit['durchsatz']:.4f} bit/s")
+    if robust is not None:
+        print(f"a/b robust: {robust[0]:.4f} / {robust[1]:.4f}")
+
+
+def main(path, plots=True, plot_path=None, running=False):
+    """Fitts' Gesetz für einen Taschenrechner-Export oder ein Verzeichnis (E.py und analyse.py fitts)
+
+    Gepoolte und robuste Parameter werden ausgegeben; für ein Verzeichnis zusätzlich die
+    Parameter je Sitzung und Durchgang als fitts_parameter.csv. plot_path: Regressionsgrafik
+    (Standard: fitts_regression.png im Verzeichnis bzw. <Export>_regression.png).
+    running: laufender Modus für ein Verzeichnis (update_running); liest nur neue Exporte und
+    schreibt die Parameter je (Sitzung, Durchgang) als fitts_laufend.csv, ohne robuste Anpassung und Grafik.
+    """
+    if running:
+        if not os.path.isdir(path):
+            raise ValueError(f"Laufender Modus erwartet ein Verzeichnis: {path}")
+        with stage('einlesen') as step:
+            accumulator, added = update_running(path)
+            step.items = added
+        print(f"Neu eingelesen: {added}, Sitzungen und Durchgänge gesamt: {len(accumulator.sums)}")
+        with stage('statistik', len(accumulator.sums)):
+            fit = accumulator.fit(pooled=True)
+            parameters = accumulator.table()
+            keys = parameters.pop('gruppe')
+            parameters.insert(0, 'sitzung', [key[0] for key in keys])
+            parameters.insert(1, 'durchgang', [key[1] for key in keys])
+        print_fit(fit)
+        output_path = os.path.join(path, 'fitts_laufend.csv')
+        with stage('schreiben'):
+            parameters.sort_values(['sitzung', 'durchgang']).round(6).to_csv(output_path, index=False)
+        print(f"Parameter je Sitzung und Durchgang gespeichert in: {output_path}")
+        return
+
+    if os.path.isdir(path):
+        with stage('einlesen') as step:
+            sessions, table = load_sessions(path)
+            step.items = len(sessions)
+        print(f"Sitzungen: {len(sessions)}, Messwerte: {len(table)}")
+        plot_path = plot_path or os.path.join(path, 'fitts_regression.png')
+    else:
+        with stage('einlesen', 1):
+            run, ids, mts = load_session(path)
+        sessions = [os.path.basename(path)]
+        table = pd.DataFrame({'session': np.zeros(len(ids), dtype=np.int64), 'run': run, 'ID': ids, 'MT': mts})
+        plot_path = plot_path or os.path.splitext(path)[0] + '_regression.png'
+
+    x, y = table['ID'].to_numpy(), table['MT'].to_numpy()
+    with stage('statistik', len(table)):
+        parameters = fit_all(table, sessions)
+        fit = FittsAccumulator().add(x, y).fit()
+    pooled = parameters[parameters['ebene'] == 'gepoolt'].iloc[0]
+    print_fit(fit, (pooled['a_robust'], pooled['b_robust']))
+
+    if os.path.isdir(path):
+        output_path = os.path.join(path, 'fitts_parameter.csv')
+        with stage('schreiben'):
+            parameters.round(6).to_csv(output_path, index=False)
+        print(f"Parameter je Sitzung und Durchgang gespeichert in: {output_path}")
+
+    if plots and len(x):
+        from figures import downsample, render_figures
+        x_range = np.linspace(x.min(), x.max(), 100)
+        # Große Datensätze werden für das Streudiagramm ausgedünnt
+        x_plot, y_plot = downsample(x, y)
+        render_figures([{
+            'path': plot_path,
+            'figsize': (8, 6),
+            'panels': [{'kind': 'regression', 'x': x_plot, 'y': y_plot,
+                        'x_line': x_range, 'y_line': fit['a'] + fit['b'] * x_range,
+                        'title': 'Fitts’ Law Regression: ID vs. MT',
+                        'xlabel': 'Index of Difficulty (ID)', 'ylabel': 'Movement Time (MT)'}],
+        }])
@@ -0,0 +1,19 @@
+"""Kennwerte je Gruppe für gruppierte Arrays (Gruppennummer je Wert, 0 bis n_groups - 1)"""
+import numpy as np
+
+# Faktor, mit dem der MAD bei Normalverteilung der Standardabweichung entspricht
+MAD_SCALE = 1.4826
+
+
+def group_median(group, values, n_groups):
+    """Median je Gruppe über eine gemeinsame Sortierung; Gruppen ohne Werte = NaN"""
+    order = np.lexsort((values, group))
+    sorted_values = values[order]
+    counts = np.bincount(group, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    low = starts + np.maximum(counts - 1, 0) // 2
+    high = starts + counts // 2
+    result = np.full(n_groups, np.nan)
+    filled = counts > 0
+    result[filled] = (sorted_values[low[filled]] + sorted_values[np.minimum(high, len(values) - 1)[filled]]) / 2
+    return result
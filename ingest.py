@@ -0,0 +1,678 @@
+import zipfile
+import os
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
+import numpy as np
+import pandas as pd
+
+from cache import StudyCache, CACHE_DIR, file_hash, content_hash, take_rows
+from tracing import stage
+
+# Standardquellen der Experiment-Exporte (das Archiv wird direkt gelesen)
+ZIP_PATH = "data/json-files.zip"
+EXTRACT_DIR = "data/json-files"
+
+# Experiment-Typen
+REACTION = 'Reaktionszeiten'
+BINARY = 'Binärer Stimulus'
+FOOD = 'Lebensmittelerkennung'
+UNKNOWN = 'Unbekannt'
+EXPERIMENT_TYPES = (REACTION, BINARY, FOOD)
+
+# Bedingungen der Trial-Tabelle: (Experiment-Typ, Bedingung, Schlüssel in rawData)
+CONDITIONS = (
+    (REACTION, 'Einfach', 'reactionTimes'),
+    (BINARY, 'Lila', 'purpleReactionTimes'),
+    (BINARY, 'Orange', 'orangeReactionTimes'),
+    (FOOD, 'Deutsch', 'germanReactionTimes'),
+    (FOOD, 'Chinesisch', 'chineseReactionTimes'),
+    (FOOD, 'Mexikanisch', 'mexicanReactionTimes'),
+)
+CONDITION_NAMES = tuple(c[1] for c in CONDITIONS)
+
+# Spalten der Teilnehmer-Tabelle (eine Zeile pro Export-Datei)
+TEXT_COLUMNS = ('filename', 'experiment_type', 'name', 'gender', 'colorVision', 'browser', 'os', 'timestamp')
+NUMBER_COLUMNS = (
+    'age', 'vision_left', 'vision_right',
+    'mean_reaction_time', 'mistakes',
+    'purple_mean', 'orange_mean', 'error_rate',
+    'german_food_mean', 'german_food_error',
+    'chinese_food_mean', 'chinese_food_error',
+    'mexican_food_mean', 'mexican_food_error',
+)
+PARTICIPANT_COLUMNS = TEXT_COLUMNS + NUMBER_COLUMNS
+
+
+# Ab so vielen neu einzulesenden Dateien nutzt load_study(workers=None) einen Prozess-Pool
+PARALLEL_MIN_FILES = 256
+
+# Persistenter Index Datei -> (Experiment-Typ, Teilnehmer, Zeitstempel) im Cache-Verzeichnis
+INDEX_FILE = 'index.json'
+INDEX_VERSION = 1
+
+
+def experiment_type(data):
+    """Bestimmt den Experiment-Typ anhand der Reaktionszeit-Schlüssel in rawData (nicht des Dateinamens)"""
+    raw = data.get('rawData') if isinstance(data, dict) else None
+    if isinstance(raw, dict):
+        for cond_type, _, key in CONDITIONS:
+            if key in raw:
+                return cond_type
+    return UNKNOWN
+
+
+# Experiment-spezifische Kennwerte: (Spalte, Pfad im "summary"-Block)
+SUMMARY_SCHEMA = {
+    REACTION: (
+        ('mean_reaction_time', ('mean',)),
+        ('mistakes', ('mistakes',)),
+    ),
+    BINARY: (
+        ('purple_mean', ('purpleSquares', 'mean')),
+        ('orange_mean', ('orangeSquares', 'mean')),
+        ('error_rate', ('errorRate',)),
+    ),
+    FOOD: tuple(
+        (f'{prefix}_food_{field}', (key, source))
+        for prefix, key in (('german', 'germanFood'), ('chinese', 'chineseFood'), ('mexican', 'mexicanFood'))
+        for field, source in (('mean', 'mean'), ('error', 'errorRate'))
+    ),
+}
+
+# Teilnehmerfelder: (Spalte, Pfad im "participant"-Block); fehlende Felder werden zu '' bzw. NaN
+PARTICIPANT_TEXT = (
+    ('name', ('name',)),
+    ('gender', ('gender',)),
+    ('colorVision', ('colorVision',)),
+    ('browser', ('browserInfo', 'browser')),
+    ('os', ('browserInfo', 'os')),
+)
+PARTICIPANT_NUMBERS = (
+    ('age', ('age',)),
+    ('vision_left', ('vision', 'left')),
+    ('vision_right', ('vision', 'right')),
+)
+
+_NUMBER_INDEX = {col: i for i, col in enumerate(NUMBER_COLUMNS)}
+
+
+class ExportError(ValueError):
+    """Der Export entspricht nicht dem erwarteten Schema"""
+
+
+class ExportRecord:
+    """Geprüfter Export: Textfelder (wie TEXT_COLUMNS), Zahlenfelder als float64-Vektor
+    (wie NUMBER_COLUMNS) und Reaktionszeit-Arrays je Bedingung"""
+
+    __slots__ = ('text', 'numbers', 'trials')
+
+    def __init__(self, text, numbers, trials):
+        self.text = text
+        self.numbers = numbers
+        self.trials = trials
+
+
+def _field(data, path, required=True):
+    """Wert unter path in verschachtelten Objekten; fehlende optionale Felder liefern None"""
+    value = data
+    for depth, key in enumerate(path):
+        if not isinstance(value, dict):
+            raise ExportError(f"'{'.'.join(path[:depth])}' ist kein Objekt")
+        if key not in value:
+            if required:
+                raise ExportError(f"Feld '{'.'.join(path)}' fehlt")
+            return None
+        value = value[key]
+    return value
+
+
+def _text(value, path):
+    """Prüft ein Textfeld (None wird zu '')"""
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise ExportError(f"'{'.'.join(path)}': Text erwartet, {type(value).__name__} gefunden")
+    return value
+
+
+def _number(value, path):
+    """Prüft ein Zahlenfeld und wandelt es in float um (None wird zu NaN)"""
+    if value is None:
+        return np.nan
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ExportError(f"'{'.'.join(path)}': Zahl erwartet, {type(value).__name__} gefunden")
+    return float(value)
+
+
+def _times(value, path):
+    """Prüft eine Liste von Reaktionszeiten in einem Durchgang über das ganze Array"""
+    if not isinstance(value, list):
+        raise ExportError(f"'{'.'.join(path)}': Liste erwartet, {type(value).__name__} gefunden")
+    times = np.array(value)
+    if times.size == 0:
+        return times.astype(np.float64)
+    if times.ndim != 1 or times.dtype.kind not in 'iuf':
+        raise ExportError(f"'{'.'.join(path)}': Liste von Zahlen erwartet")
+    times = times.astype(np.float64)
+    if not np.all(np.isfinite(times)) or np.any(times < 0):
+        raise ExportError(f"'{'.'.join(path)}': ungültige Reaktionszeit")
+    return times
+
+
+def parse_export(data, filename):
+    """Prüft einen Export gegen das Schema seines Experiment-Typs und liefert einen ExportRecord
+
+    Fehlende Pflichtfelder (rawData- und summary-Werte des Typs) oder falsche Typen
+    führen zu einem ExportError, statt später als NaN in den Tabellen zu landen.
+    """
+    if not isinstance(data, dict):
+        raise ExportError("Export ist kein JSON-Objekt")
+    exp_type = experiment_type(data)
+    participant = _field(data, ('participant',))
+    if not isinstance(participant, dict):
+        raise ExportError("'participant' ist kein Objekt")
+
+    text = {col: _text(_field(participant, path, required=False), ('participant',) + path)
+            for col, path in PARTICIPANT_TEXT}
+    numbers = np.full(len(NUMBER_COLUMNS), np.nan)
+    for col, path in PARTICIPANT_NUMBERS:
+        numbers[_NUMBER_INDEX[col]] = _number(_field(participant, path, required=False), ('participant',) + path)
+
+    # Experiment-spezifische Werte aus dem "summary"-Block
+    for col, path in SUMMARY_SCHEMA.get(exp_type, ()):
+        numbers[_NUMBER_INDEX[col]] = _number(_field(data, ('summary',) + path), ('summary',) + path)
+
+    # Rohdaten als kompakte Arrays je Bedingung
+    trials = []
+    for condition, (cond_type, _, key) in enumerate(CONDITIONS):
+        if cond_type == exp_type:
+            times = _times(_field(data, ('rawData', key)), ('rawData', key))
+            if len(times):
+                trials.append((condition, times))
+
+    text['timestamp'] = _text(_field(data, ('rawData', 'timestamp'), required=False), ('rawData', 'timestamp'))
+    text.update({'filename': filename, 'experiment_type': exp_type})
+    return ExportRecord(tuple(text[col] for col in TEXT_COLUMNS), numbers, trials)
+
+
+class Study:
+    """Spaltenorientierte Sicht auf alle Exporte: Teilnehmer-Tabelle und Trial-Tabelle"""
+
+    def __init__(self, participants, trials):
+        # Eine Zeile pro Export-Datei
+        self.participants = participants
+        # Eine Zeile pro Reaktionszeit: participant (Zeilenindex), condition (Index in CONDITIONS), rt
+        self.trials = trials
+
+    @classmethod
+    def from_parsed(cls, parsed):
+        """Baut die Tabellen aus einer Liste von ExportRecords"""
+        trial_participant = []
+        trial_condition = []
+        trial_rt = []
+
+        for index, record in enumerate(parsed):
+            for condition, times in record.trials:
+                trial_participant.append(np.full(len(times), index, dtype=np.int32))
+                trial_condition.append(np.full(len(times), condition, dtype=np.int8))
+                trial_rt.append(times)
+
+        text = np.array([record.text for record in parsed], dtype=object).reshape(-1, len(TEXT_COLUMNS))
+        numbers = (np.vstack([record.numbers for record in parsed]) if parsed
+                   else np.empty((0, len(NUMBER_COLUMNS))))
+        participants = pd.DataFrame({
+            **{col: text[:, i] for i, col in enumerate(TEXT_COLUMNS)},
+            **{col: numbers[:, i] for i, col in enumerate(NUMBER_COLUMNS)},
+        })
+        trials = pd.DataFrame({
+            'participant': np.concatenate(trial_participant) if trial_rt else np.empty(0, dtype=np.int32),
+            'condition': np.concatenate(trial_condition) if trial_rt else np.empty(0, dtype=np.int8),
+            'rt': np.concatenate(trial_rt) if trial_rt else np.empty(0, dtype=np.float64),
+        })
+        return cls(participants, trials)
+
+    def take(self, rows):
+        """Teilstudie mit den angegebenen (aufsteigenden) Teilnehmer-Zeilen"""
+        return Study(*take_rows(self.participants, self.trials, np.asarray(rows, dtype=np.int64)))
+
+    @classmethod
+    def concat(cls, studies):
+        """Hängt mehrere Studien aneinander"""
+        offset = 0
+        trials = []
+        for study in studies:
+            part = study.trials.copy()
+            part['participant'] = (part['participant'] + offset).astype(np.int32)
+            trials.append(part)
+            offset += len(study.participants)
+        return cls(
+            pd.concat([study.participants for study in studies], ignore_index=True),
+            pd.concat(trials, ignore_index=True),
+        )
+
+    def of_type(self, exp_type):
+        """Teilnehmer-Zeilen eines Experiment-Typs"""
+        return self.participants[self.participants['experiment_type'] == exp_type]
+
+    def ragged(self, condition):
+        """Reaktionszeiten einer Bedingung als flaches Array mit Offsets je Teilnehmer
+
+        Liefert (values, offsets, rows): die Trials von Teilnehmer i sind
+        values[offsets[i]:offsets[i + 1]], rows[i] ist dessen Zeile in der Teilnehmer-Tabelle.
+        """
+        if isinstance(condition, str):
+            condition = CONDITION_NAMES.index(condition)
+        mask = self.trials['condition'].to_numpy() == condition
+        values = self.trials['rt'].to_numpy()[mask]
+        participant = self.trials['participant'].to_numpy()[mask]
+
+        starts = np.flatnonzero(np.diff(participant, prepend=-1))
+        offsets = np.append(starts, len(values))
+        return values, offsets, participant[starts]
+
+    def long_table(self):
+        """Trial-Tabelle im Langformat (participant, name, experiment, condition, rt)
+
+        Wird spaltenweise aus den flachen Arrays gebaut, ohne ein Objekt je Reaktionszeit.
+        """
+        participant = self.trials['participant'].to_numpy()
+        condition = self.trials['condition'].to_numpy()
+        names = np.asarray([name or 'Unbekannt' for name in self.participants['name']], dtype=object)
+        return pd.DataFrame({
+            'participant': participant,
+            'name': names[participant],
+            'experiment': np.asarray([c[0] for c in CONDITIONS], dtype=object)[condition],
+            'condition': np.asarray(CONDITION_NAMES, dtype=object)[condition],
+            'rt': self.trials['rt'].to_numpy(),
+        })
+
+
+def list_entries(source):
+    """Liefert (Name, Eintrag) für alle JSON-Exporte eines Verzeichnisses oder ZIP-Archivs
+
+    Bei ZIP-Archiven dient die CRC-32 aus dem zentralen Verzeichnis als Inhalts-Hash,
+    geänderte Mitglieder werden dadurch ohne Lesen des Inhalts erkannt.
+    """
+    if os.path.isdir(source):
+        entries = []
+        for file in sorted(f for f in os.listdir(source) if f.endswith('.json')):
+            stat = os.stat(os.path.join(source, file))
+            entries.append((file, {'size': stat.st_size, 'mtime': stat.st_mtime_ns}))
+        return entries
+
+    with zipfile.ZipFile(source, 'r') as archive:
+        members = [info for info in archive.infolist() if not info.is_dir() and info.filename.endswith('.json')]
+    return [
+        (info.filename, {'size': info.file_size, 'hash': f'crc32:{info.CRC:08x}'})
+        for info in sorted(members, key=lambda i: i.filename)
+    ]
+
+
+def is_unchanged(source, name, entry, old):
+    """Prüft einen Eintrag gegen seinen früheren Manifest-Eintrag und ergänzt dabei entry['hash']
+
+    Bei gleicher Größe und mtime wird der alte Hash übernommen, sonst wird der Inhalt gehasht.
+    """
+    if old is None or old['size'] != entry['size']:
+        return False
+    if 'hash' not in entry:
+        if old.get('mtime') == entry['mtime']:
+            entry['hash'] = old['hash']
+        else:
+            entry['hash'] = file_hash(os.path.join(source, name))
+    return entry['hash'] == old['hash']
+
+
+@contextmanager
+def _open_reader(source):
+    """Liefert eine Funktion, die den Inhalt eines Exports (Datei oder Archiv-Mitglied) liest"""
+    if os.path.isdir(source):
+        def read(name):
+            with open(os.path.join(source, name), 'rb') as f:
+                return f.read()
+        yield read
+        return
+
+    with zipfile.ZipFile(source, 'r') as archive:
+        yield archive.read
+
+
+def parse_members(source, names, with_hash=False):
+    """Liest und zerlegt eine Gruppe von Exporten; läuft auch in den Worker-Prozessen
+
+    Liefert (gelesene Namen, Inhalts-Hashes, Study, Fehler als (Name, Ausnahme)). Die Tabellen der Study
+    bestehen aus NumPy-Spalten und lassen sich daher günstig zwischen Prozessen übertragen.
+    """
+    parsed = []
+    read_names = []
+    hashes = []
+    errors = []
+    with _open_reader(source) as read:
+        for name in names:
+            try:
+                content = read(name)
+                parsed.append(parse_export(json.loads(content), os.path.basename(name)))
+                read_names.append(name)
+                hashes.append(content_hash(content) if with_hash else None)
+            except Exception as e:
+                errors.append((name, e))
+    return read_names, hashes, Study.from_parsed(parsed), errors
+
+
+def _parse_parallel(source, names, with_hash, workers, chunk_size):
+    """Verteilt das Einlesen in Blöcken von chunk_size Dateien auf einen Prozess-Pool"""
+    chunks = [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(parse_members, repeat(source), chunks, repeat(with_hash))
+
+
+def index_entry(data):
+    """Index-Eintrag eines Exports: Experiment-Typ, Teilnehmername und Zeitstempel"""
+    participant = data.get('participant') if isinstance(data, dict) else None
+    raw = data.get('rawData') if isinstance(data, dict) else None
+    name = participant.get('name') if isinstance(participant, dict) else None
+    timestamp = raw.get('timestamp') if isinstance(raw, dict) else None
+    return {
+        'type': experiment_type(data),
+        'name': name if isinstance(name, str) else '',
+        'timestamp': timestamp if isinstance(timestamp, str) else '',
+    }
+
+
+# Zerlegen nur der Kopfdaten eines Exports für den Index
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Gelesene Felder (verschachtelt als Dict); alle anderen Werte werden übersprungen
+HEADER_FIELDS = {'participant': None, 'rawData': {'timestamp': None}}
+# Kleinere Exporte liest json.loads (C-Parser) schneller vollständig, als sie gescannt werden
+HEADER_SCAN_MIN_BYTES = 1 << 16
+
+
+def _skip_value(text, pos):
+    """Position hinter dem JSON-Wert ab pos; flache Zahlenlisten werden nur bis ']' durchsucht, nicht zerlegt"""
+    if text[pos:pos + 1] == '[':
+        end = text.find(']', pos)
+        if end >= 0 and all(text.find(char, pos + 1, end) < 0 for char in '[{"'):
+            return end + 1
+    return _DECODER.raw_decode(text, pos)[1]
+
+
+def _scan_object(text, pos, fields):
+    """Zerlegt ein JSON-Objekt ab pos: Schlüssel aus fields werden gelesen, alle anderen mit None belegt
+
+    Liefert (Dict, Position hinter dem Objekt).
+    """
+    pos = _WHITESPACE.match(text, pos).end()
+    if text[pos:pos + 1] != '{':
+        raise ValueError("JSON-Objekt erwartet")
+    result = {}
+    pos = _WHITESPACE.match(text, pos + 1).end()
+    if text[pos:pos + 1] == '}':
+        return result, pos + 1
+    while True:
+        pos = _WHITESPACE.match(text, pos).end()
+        if text[pos:pos + 1] != '"':
+            raise ValueError("Schlüssel erwartet")
+        key, pos = _DECODER.raw_decode(text, pos)
+        pos = _WHITESPACE.match(text, pos).end()
+        if text[pos:pos + 1] != ':':
+            raise ValueError("':' erwartet")
+        pos = _WHITESPACE.match(text, pos + 1).end()
+        if key not in fields:
+            result[key] = None
+            pos = _skip_value(text, pos)
+        elif isinstance(fields[key], dict) and text[pos:pos + 1] == '{':
+            result[key], pos = _scan_object(text, pos, fields[key])
+        else:
+            result[key], pos = _DECODER.raw_decode(text, pos)
+        pos = _WHITESPACE.match(text, pos).end()
+        char = text[pos:pos + 1]
+        pos += 1
+        if char == '}':
+            return result, pos
+        if char != ',':
+            raise ValueError("',' oder '}' erwartet")
+
+
+def scan_header(content):
+    """Kopfdaten eines Exports für index_entry, ohne die Reaktionszeit-Listen zu zerlegen
+
+    Liefert ein Dict wie json.loads, in dem nur participant und rawData.timestamp gelesen
+    sind (übrige Werte None); ungültiges JSON löst ValueError aus. Kleine Exporte
+    (unter HEADER_SCAN_MIN_BYTES) werden vollständig gelesen.
+    """
+    text = content.decode('utf-8-sig') if isinstance(content, bytes) else content
+    start = _WHITESPACE.match(text).end()
+    if len(text) < HEADER_SCAN_MIN_BYTES or text[start:start + 1] != '{':
+        # Kleine Exporte und Nicht-Objekte (index_entry: 'Unbekannt') vollständig lesen
+        return json.loads(text)
+    data, end = _scan_object(text, start, HEADER_FIELDS)
+    if _WHITESPACE.match(text, end).end() != len(text):
+        raise ValueError("Zusätzliche Daten nach dem JSON-Objekt")
+    return data
+
+
+class ExportIndex:
+    """Persistenter Index aller Exporte einer Quelle (Typ, Teilnehmer, Zeitstempel je Datei)
+
+    update() liest nur neue oder geänderte Dateien und von diesen nur die Kopfdaten
+    (scan_header); danach können Auswertungen über names() genau die Dateien der
+    benötigten Experiment-Typen laden.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.path = os.path.join(cache_dir, INDEX_FILE) if cache_dir else None
+        self.source = None
+        self.files = {}
+
+    def load(self, source):
+        """Lädt den gespeicherten Index, falls er zur Quelle und zur aktuellen Version passt"""
+        self.source = source
+        self.files = {}
+        if not self.path:
+            return self
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == INDEX_VERSION and state.get('source') == source:
+                self.files = state['files']
+        except (OSError, ValueError, KeyError):
+            pass
+        return self
+
+    def save(self):
+        """Schreibt den Index atomar"""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'source': self.source, 'files': self.files}, f)
+        os.replace(tmp_path, self.path)
+
+    def update(self, source=None, entries=None):
+        """Bringt den Index auf den Stand der Quelle; liefert die Anzahl neu indizierter Dateien"""
+        source = default_source(source)
+        if source != self.source:
+            self.load(source)
+        entries = entries if entries is not None else list_entries(source)
+
+        pending = []
+        touched = False
+        for name, entry in entries:
+            old = self.files.get(name)
+            if not is_unchanged(source, name, dict(entry), old):
+                pending.append((name, entry))
+            elif old.get('mtime') != entry.get('mtime'):
+                # Nur die mtime hat sich geändert (Inhalt gleich)
+                old['mtime'] = entry['mtime']
+                touched = True
+
+        with _open_reader(source) as read:
+            for name, entry in pending:
+                content = read(name)
+                try:
+                    info = index_entry(scan_header(content))
+                except ValueError:
+                    info = {'type': UNKNOWN, 'name': '', 'timestamp': ''}
+                self.files[name] = {**entry, 'hash': entry.get('hash') or content_hash(content), **info}
+
+        present = {name for name, _ in entries}
+        removed = [name for name in self.files if name not in present]
+        for name in removed:
+            del self.files[name]
+        if pending or removed or touched:
+            self.save()
+        return len(pending)
+
+    def names(self, exp_types=None):
+        """Dateinamen der angegebenen Experiment-Typen (alle, wenn exp_types None ist)"""
+        return [name for name, info in self.files.items() if exp_types is None or info['type'] in exp_types]
+
+
+def default_source(source=None):
+    """Standardquelle: das ZIP-Archiv, sonst das extrahierte Verzeichnis"""
+    if source is None:
+        source = ZIP_PATH if os.path.exists(ZIP_PATH) else EXTRACT_DIR
+    return source
+
+
+def load_study(source=None, cache_dir=CACHE_DIR, workers=None, chunk_size=64, exp_types=None):
+    """Liest jeden Export genau einmal und liefert die Teilnehmer- und Trial-Tabelle
+
+    source ist ein ZIP-Archiv (Standard: data/json-files.zip), dessen Mitglieder direkt
+    aus dem Archiv gelesen werden, oder ein Verzeichnis mit JSON-Dateien.
+    Mit cache_dir werden die Tabellen zwischengespeichert; unveränderte Dateien
+    (gleiche Größe und mtime bzw. gleicher Inhalts-Hash) werden nicht erneut gelesen.
+    Mit workers > 1 werden die Dateien in Blöcken von chunk_size parallel eingelesen; workers=None
+    wählt ab PARALLEL_MIN_FILES neuen Dateien einen Prozess je CPU (höchstens einen je Block).
+    Mit exp_types werden über den ExportIndex nur die Exporte dieser Experiment-Typen geladen.
+    """
+    source = default_source(source)
+
+    cache = StudyCache(cache_dir) if cache_dir else None
+    with stage('cache laden'):
+        cached_files, cached_participants, cached_trials = cache.load() if cache else ({}, None, None)
+
+    with stage('auflisten') as step:
+        entries = list_entries(source)
+        step.items = len(entries)
+    print(f"Gefundene JSON-Dateien: {len(entries)} ({source})")
+    listed = {name for name, _ in entries}
+    # Nicht benötigte Exporte bleiben unverändert im Cache, werden aber nicht geladen
+    kept_rows = []
+    kept_files = []
+    if exp_types is not None:
+        with stage('index') as step:
+            index = ExportIndex(cache_dir).load(source)
+            step.items = index.update(source, entries)
+        needed = set(index.names(exp_types))
+        for name, entry in entries:
+            old = cached_files.get(name)
+            if name not in needed and is_unchanged(source, name, entry, old):
+                kept_rows.append(old['row'])
+                kept_files.append((name, entry))
+        entries = [(name, entry) for name, entry in entries if name in needed]
+        print(f"Davon benötigt ({', '.join(exp_types)}): {len(entries)}")
+
+    # Unveränderte Dateien aus dem Cache übernehmen
+    reused_rows = []
+    reused_files = []
+    pending = {}
+    for name, entry in entries:
+        old = cached_files.get(name)
+        if is_unchanged(source, name, entry, old):
+            reused_rows.append(old['row'])
+            reused_files.append((name, entry))
+        else:
+            pending[name] = entry
+
+    # Fehlerhafte Exporte nur nach einer Änderung erneut lesen (Fehler stehen im Manifest)
+    known_failed = cache.failed if cache else {}
+    failed = {name: old for name, old in known_failed.items() if name in listed and name not in pending}
+    for name, entry in list(pending.items()):
+        old = known_failed.get(name)
+        if old is not None and is_unchanged(source, name, entry, old):
+            failed[name] = {**old, **entry}
+            del pending[name]
+    skipped = len([name for name in failed if name in known_failed])
+    if skipped:
+        print(f"Unverändert fehlerhaft, übersprungen: {skipped}")
+
+    # Neue oder geänderte Dateien einlesen
+    names = list(pending)
+    with_hash = cache is not None and os.path.isdir(source)
+    parsed = []
+    parsed_files = []
+    if workers is None:
+        chunks = -(-len(names) // chunk_size)
+        workers = min(os.cpu_count() or 1, chunks) if len(names) >= PARALLEL_MIN_FILES else 1
+    with stage('einlesen', len(names)):
+        if workers > 1 and len(names) > chunk_size:
+            results = _parse_parallel(source, names, with_hash, workers, chunk_size)
+        else:
+            results = [parse_members(source, names, with_hash)]
+
+        for read_names, hashes, part, errors in results:
+            for name, e in errors:
+                print(f"Fehler beim Lesen von {os.path.basename(name)}: {e}")
+                entry = pending[name]
+                if 'hash' not in entry and os.path.isdir(source):
+                    entry['hash'] = file_hash(os.path.join(source, name))
+                failed[name] = {**entry, 'error': str(e)}
+            for name, digest in zip(read_names, hashes):
+                if digest is not None:
+                    pending[name]['hash'] = digest
+                parsed_files.append((name, pending[name]))
+            if read_names:
+                parsed.append(part)
+
+    if reused_rows:
+        print(f"Aus dem Cache übernommen: {len(reused_rows)}, neu eingelesen: {len(parsed_files)}")
+    print(f"Insgesamt {len(reused_rows) + len(parsed_files)} JSON-Dateien verarbeitet")
+
+    with stage('tabellen') as step:
+        if reused_rows:
+            # Reihenfolge im Cache beibehalten, damit die Trial-Tabelle gruppiert bleibt
+            order = np.argsort(reused_rows)
+            reused_rows = np.asarray(reused_rows)[order]
+            reused_files = [reused_files[i] for i in order]
+            study = Study(cached_participants, cached_trials)
+            if len(reused_rows) != len(cached_participants):
+                study = study.take(reused_rows)
+            parsed.insert(0, study)
+        if not parsed:
+            study = Study.from_parsed([])
+        elif len(parsed) == 1:
+            study = parsed[0]
+        else:
+            study = Study.concat(parsed)
+        step.items = len(study.trials)
+
+    # Cache nur schreiben, wenn sich Dateien (oder nur deren mtime) geändert haben
+    changed = (
+        bool(parsed_files)
+        or failed != known_failed
+        or len(reused_files) + len(kept_files) != len(cached_files)
+        or any(cached_files[name].get('mtime') != entry.get('mtime') for name, entry in reused_files + kept_files)
+    )
+    if cache and changed:
+        with stage('cache schreiben'):
+            saved = study
+            if kept_rows:
+                order = np.argsort(kept_rows)
+                kept_files = [kept_files[i] for i in order]
+                kept = Study(cached_participants, cached_trials).take(np.asarray(kept_rows)[order])
+                saved = Study.concat([kept, study])
+            files = {}
+            for row, (name, entry) in enumerate(kept_files + reused_files + parsed_files):
+                entry['row'] = row
+                files[name] = entry
+            cache.save(files, saved.participants, saved.trials, TEXT_COLUMNS, failed)
+
+    return study
@@ -0,0 +1,136 @@
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+
+from ingest import CONDITIONS, CONDITION_NAMES, UNKNOWN
+
+
+def normalize_name(name):
+    """Vergleichsschlüssel eines Teilnehmernamens: Unicode-normalisiert, klein, ohne Leer- und Sonderzeichen
+
+    'Raffael Scotognella', 'RaffaelScotognella' und 'raffael_scotognella' ergeben denselben Schlüssel.
+    """
+    name = unicodedata.normalize('NFKC', name or '').casefold()
+    return re.sub(r'[\W_]+', '', name)
+
+
+class ParticipantIndex:
+    """Verknüpft die Exporte einer Study zu Personen über alle Experimente
+
+    Jede Export-Zeile erhält eine Personen-ID (über den normalisierten Namen; Exporte
+    ohne Namen bleiben eigene Personen). Hat eine Person ein Experiment mehrfach
+    durchgeführt, zählt je nach keep die erste oder letzte Sitzung (nach rawData.timestamp).
+    Für die gewählten Sitzungen liegt eine Tabelle (Person x Bedingung) mit Start und Ende
+    der Trials in der Trial-Tabelle vor, sodass jeder Zugriff ein O(1)-Nachschlagen ist.
+    """
+
+    def __init__(self, study, keep='first'):
+        if keep not in ('first', 'last'):
+            raise ValueError("keep muss 'first' oder 'last' sein")
+        self.study = study
+        participants = study.participants
+
+        # Personen-ID je Export-Zeile
+        keys = np.array([normalize_name(name) for name in participants['name']], dtype=object)
+        unnamed = keys == ''
+        keys[unnamed] = ['datei:' + f for f in participants['filename'].to_numpy()[unnamed]]
+        self.keys, self.person = np.unique(keys.astype(str), return_inverse=True)
+        self.person = self.person.ravel()
+        self.n_persons = len(self.keys)
+
+        # Je Person und Experiment-Typ eine Sitzung wählen (Zeitstempel, sonst Dateiname)
+        timestamps = participants['timestamp'].to_numpy().astype(str)
+        filenames = participants['filename'].to_numpy().astype(str)
+        types = participants['experiment_type'].to_numpy().astype(str)
+        order = np.lexsort((filenames, timestamps, types, self.person))
+        if keep == 'last':
+            order = order[::-1]
+        pairs = np.stack([self.person[order], np.unique(types, return_inverse=True)[1].ravel()[order]], axis=1)
+        _, first = np.unique(pairs, axis=0, return_index=True)
+        self.selected = np.zeros(len(participants), dtype=bool)
+        self.selected[order[first]] = True
+        # Wiederholte Sitzungen (gleiche Person, gleicher Typ), die nicht gewählt wurden
+        self.duplicates = np.flatnonzero(~self.selected & (types != UNKNOWN))
+
+        # Trial-Blöcke der gewählten Sitzungen: start/end je (Person, Bedingung), leer = (0, 0)
+        trials = study.trials
+        participant = trials['participant'].to_numpy()
+        condition = trials['condition'].to_numpy().astype(np.int64)
+        self.start = np.zeros((self.n_persons, len(CONDITIONS)), dtype=np.int64)
+        self.end = np.zeros((self.n_persons, len(CONDITIONS)), dtype=np.int64)
+        if len(participant):
+            starts = np.flatnonzero((np.diff(participant, prepend=-1) != 0) | (np.diff(condition, prepend=-1) != 0))
+            ends = np.append(starts[1:], len(participant))
+            rows = participant[starts]
+            chosen = self.selected[rows]
+            self.start[self.person[rows[chosen]], condition[starts[chosen]]] = starts[chosen]
+            self.end[self.person[rows[chosen]], condition[starts[chosen]]] = ends[chosen]
+
+    def person_of(self, name):
+        """Personen-ID zu einem (beliebig geschriebenen) Namen oder None"""
+        key = normalize_name(name)
+        position = np.searchsorted(self.keys, key)
+        if position < self.n_persons and self.keys[position] == key:
+            return int(position)
+        return None
+
+    def trials(self, person, condition):
+        """Reaktionszeiten einer Person in einer Bedingung (Index oder Name aus CONDITION_NAMES)"""
+        if isinstance(condition, str):
+            condition = CONDITION_NAMES.index(condition)
+        start, end = self.start[person, condition], self.end[person, condition]
+        return self.study.trials['rt'].to_numpy()[start:end]
+
+    def exports(self, person):
+        """Zeilen aller Exporte einer Person in der Teilnehmer-Tabelle (inklusive Wiederholungen)"""
+        return np.flatnonzero(self.person == person)
+
+    def condition_stats(self):
+        """Trial-Anzahl und mittlere Reaktionszeit je (Person, Bedingung) als Matrizen; fehlend = NaN"""
+        rt = self.study.trials['rt'].to_numpy()
+        counts = self.end - self.start
+        cumulative = np.concatenate(([0.0], np.cumsum(rt)))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = (cumulative[self.end] - cumulative[self.start]) / counts
+        return counts, np.where(counts > 0, means, np.nan)
+
+    def paired(self, condition_a, condition_b):
+        """Mittelwerte zweier Bedingungen für alle Personen, die beide absolviert haben (innerhalb der Person)
+
+        Bedingungen sind Namen oder Indizes bzw. Listen davon; mehrere Bedingungen werden über
+        alle ihre Trials gemittelt. Liefert (Personen-IDs, Mittelwerte a, Mittelwerte b).
+        """
+        counts, means = self.condition_stats()
+
+        def pooled(conditions):
+            if isinstance(conditions, (str, int, np.integer)):
+                conditions = [conditions]
+            columns = [CONDITION_NAMES.index(c) if isinstance(c, str) else c for c in conditions]
+            n = counts[:, columns].sum(axis=1)
+            total = np.nansum(means[:, columns] * counts[:, columns], axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(n > 0, total / n, np.nan)
+
+        a, b = pooled(condition_a), pooled(condition_b)
+        both = np.flatnonzero(~np.isnan(a) & ~np.isnan(b))
+        return both, a[both], b[both]
+
+    def persons(self):
+        """Eine Zeile je Person: Name und Demographie der ersten Sitzung, Anzahl Exporte und gewählte Sitzungen
+
+        Die erste Sitzung ist die mit dem frühesten rawData.timestamp (bei Gleichstand oder ohne
+        Zeitstempel der kleinere Dateiname), wie bei der Wahl der Sitzungen mit keep='first'.
+        """
+        participants = self.study.participants
+        timestamps = participants['timestamp'].to_numpy().astype(str)
+        filenames = participants['filename'].to_numpy().astype(str)
+        order = np.lexsort((filenames, timestamps, self.person))
+        starts = np.flatnonzero(np.diff(self.person[order], prepend=-1) != 0)
+        first = order[starts]
+        columns = ['name', 'gender', 'age', 'vision_left', 'vision_right', 'colorVision', 'browser']
+        table = participants.iloc[first][columns].reset_index(drop=True)
+        table.insert(0, 'person', np.arange(self.n_persons))
+        table['exports'] = np.bincount(self.person, minlength=self.n_persons)
+        table['sessions'] = np.bincount(self.person, self.selected, minlength=self.n_persons).astype(np.int64)
+        return table
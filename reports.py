@@ -0,0 +1,61 @@
+import os
+
+# Beschriftungen der sechs Bedingungen in den Vergleichsgrafiken
+EXPERIMENT_LABELS = ['Einfach', 'Binär (Lila)', 'Binär (Orange)',
+                     'Essen (DE)', 'Essen (CN)', 'Essen (MX)']
+
+
+def condition_means(reaction_df, binary_df, food_df):
+    """Durchschnitt der Teilnehmer-Mittelwerte je Bedingung (0, wenn ein Experiment fehlt)"""
+    mean_reaction = reaction_df['mean'].mean() if not reaction_df.empty else 0
+    mean_binary_purple = binary_df[binary_df['stimulus_type'] == 'Lila']['mean'].mean() if not binary_df.empty else 0
+    mean_binary_orange = binary_df[binary_df['stimulus_type'] == 'Orange']['mean'].mean() if not binary_df.empty else 0
+    mean_food_german = food_df[food_df['food_type'] == 'Deutsch']['mean'].mean() if not food_df.empty else 0
+    mean_food_chinese = food_df[food_df['food_type'] == 'Chinesisch']['mean'].mean() if not food_df.empty else 0
+    mean_food_mexican = food_df[food_df['food_type'] == 'Mexikanisch']['mean'].mean() if not food_df.empty else 0
+    return [mean_reaction, mean_binary_purple, mean_binary_orange,
+            mean_food_german, mean_food_chinese, mean_food_mexican]
+
+
+def write_summary_csvs(reaction_df, binary_df, food_df, output_dir):
+    """Statistische Zusammenfassung je Teilnehmer und Bedingung als CSV exportieren"""
+    # A.1 Reaktionszeiten
+    if not reaction_df.empty:
+        reaction_summary = reaction_df[['name', 'mean', 'median', 'std']].round(2)
+        reaction_summary.to_csv(os.path.join(output_dir, 'reaktionszeiten_zusammenfassung.csv'), index=False)
+
+    # A.2 Binärer Stimulus
+    if not binary_df.empty:
+        binary_summary = binary_df[['name', 'stimulus_type', 'mean', 'median', 'std']].round(2)
+        binary_summary.to_csv(os.path.join(output_dir, 'binaerer_stimulus_zusammenfassung.csv'), index=False)
+
+    # A.3 Lebensmittelerkennung
+    if not food_df.empty:
+        food_summary = food_df[['name', 'food_type', 'mean', 'median', 'std']].round(2)
+        food_summary.to_csv(os.path.join(output_dir, 'lebensmittelerkennung_zusammenfassung.csv'), index=False)
+
+
+def write_experiment_summary(reaction_df, binary_df, food_df, output_dir):
+    """Zusammenfassung aller Ergebnisse in einer Textdatei"""
+    (mean_reaction, mean_binary_purple, mean_binary_orange,
+     mean_food_german, mean_food_chinese, mean_food_mexican) = condition_means(reaction_df, binary_df, food_df)
+
+    with open(os.path.join(output_dir, 'experiment_zusammenfassung.txt'), 'w', encoding='utf-8') as f:
+        f.write("=== Zusammenfassung der Experimente ===\n\n")
+
+        f.write("A.1 Einfache Reaktionszeiten\n")
+        f.write(f"Anzahl Teilnehmer: {len(reaction_df.name.unique()) if not reaction_df.empty else 0}\n")
+        f.write(f"Durchschnittliche Reaktionszeit: {mean_reaction:.2f} ms\n\n")
+
+        f.write("A.2 Binärer Stimulus\n")
+        f.write(f"Anzahl Teilnehmer: {len(binary_df.name.unique()) if not binary_df.empty else 0}\n")
+        f.write(f"Durchschnitt (Lila): {mean_binary_purple:.2f} ms\n")
+        f.write(f"Durchschnitt (Orange): {mean_binary_orange:.2f} ms\n\n")
+
+        f.write("A.3 Lebensmittelerkennung\n")
+        f.write(f"Anzahl Teilnehmer: {len(food_df.name.unique()) if not food_df.empty else 0}\n")
+        f.write(f"Durchschnitt (Deutsch): {mean_food_german:.2f} ms\n")
+        f.write(f"Durchschnitt (Chinesisch): {mean_food_chinese:.2f} ms\n")
+        f.write(f"Durchschnitt (Mexikanisch): {mean_food_mexican:.2f} ms\n")
+
+    print(f"Zusammenfassung gespeichert in: {os.path.join(output_dir, 'experiment_zusammenfassung.txt')}")
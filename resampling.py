@@ -0,0 +1,510 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+
+# Obergrenze für die Anzahl Werte in einem Block gemischter Stichproben (ca. 32 MB float64)
+MAX_BATCH_VALUES = 1 << 22
+
+# Exakter Test: höchstens so viele Teilsummen je Hälfte der vereinigten Werte (2^21, ca. 16 MB), auch bei exact=True
+EXACT_MAX_SUBSETS = 1 << 21
+# Aufwand einer Teilsumme des exakten Tests relativ zu einem gemischten Wert der Simulation (gemessen)
+EXACT_COST_FACTOR = 8
+# Exakte Nullverteilung (Histogramm) nur bis zu so vielen Aufteilungen
+EXACT_MAX_SPLITS = 1 << 24
+
+
+def default_batch_size(n_values, n_resamples):
+    """Wählt die Blockgröße so, dass ein Block höchstens MAX_BATCH_VALUES Werte enthält"""
+    return max(1, min(n_resamples, MAX_BATCH_VALUES // max(n_values, 1)))
+
+
+def permutation_batch(all_values, n_first, batch, rng):
+    """Mischt all_values batch-mal und liefert die Summe der ersten n_first Werte je Mischung"""
+    shuffled = rng.permuted(np.broadcast_to(all_values, (batch, len(all_values))), axis=1)
+    return shuffled[:, :n_first].sum(axis=1)
+
+
+def seed_sequence(rng=None):
+    """Leitet aus Seed, SeedSequence oder Generator eine SeedSequence für die Blöcke ab"""
+    if isinstance(rng, np.random.SeedSequence):
+        return rng
+    if isinstance(rng, np.random.Generator):
+        return np.random.SeedSequence(rng.integers(0, 2 ** 63, size=4))
+    return np.random.SeedSequence(rng)
+
+
+def _diff_batch(all_values, n_first, batch, seed):
+    """Mittelwertdifferenzen eines Blocks; läuft auch in den Worker-Prozessen"""
+    rng = np.random.default_rng(seed)
+    first_sums = permutation_batch(all_values, n_first, batch, rng)
+    return (all_values.sum() - first_sums) / (len(all_values) - n_first) - first_sums / n_first
+
+
+def permutation_diffs(first, second, n_resamples, rng=None, batch_size=None, workers=1):
+    """Nullverteilung der Mittelwertdifferenz mean(second) - mean(first) als Permutationstest
+
+    Die Mischungen werden blockweise als 2-D-Array erzeugt und die Differenzen mit
+    einer vektorisierten Reduktion je Block berechnet. Jeder Block erhält einen eigenen
+    Seed aus SeedSequence.spawn, daher ist das Ergebnis unabhängig von der Anzahl workers.
+    """
+    first = np.asarray(first, dtype=np.float64)
+    second = np.asarray(second, dtype=np.float64)
+    all_values = np.concatenate([first, second])
+    n_first = len(first)
+
+    if batch_size is None:
+        batch_size = default_batch_size(len(all_values), n_resamples)
+    batches = [min(batch_size, n_resamples - start) for start in range(0, n_resamples, batch_size)]
+    seeds = seed_sequence(rng).spawn(len(batches))
+
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(
+                _diff_batch, repeat(all_values), repeat(n_first), batches, seeds,
+                chunksize=max(1, len(batches) // (4 * workers))
+            ))
+    else:
+        parts = [_diff_batch(all_values, n_first, batch, seed) for batch, seed in zip(batches, seeds)]
+    return np.concatenate(parts) if parts else np.empty(0)
+
+
+def two_sided_p_value(null_diffs, observed_diff):
+    """p-Wert als verdoppelter Anteil der Nullverteilung, der mindestens so extrem ist wie der beobachtete Wert"""
+    if observed_diff >= 0:
+        p_value = np.mean(null_diffs >= observed_diff)
+    else:
+        p_value = np.mean(null_diffs <= observed_diff)
+    return min(p_value * 2, 1.0)
+
+
+def p_value_bounds(extreme, n, confidence=0.99):
+    """Clopper-Pearson-Intervall für den zweiseitigen p-Wert aus extreme von n Resamples"""
+    from scipy import stats
+    tail = (1 - confidence) / 2
+    lower = stats.beta.ppf(tail, extreme, n - extreme + 1) if extreme > 0 else 0.0
+    upper = stats.beta.ppf(1 - tail, extreme + 1, n - extreme) if extreme < n else 1.0
+    return min(2 * lower, 1.0), min(2 * upper, 1.0)
+
+
+def sequential_permutation_test(first, second, alpha=0.05, max_resamples=100000, rng=None,
+                                batch_size=1000, confidence=0.99):
+    """Permutationstest mit vorzeitigem Abbruch
+
+    Zieht Resamples in Blöcken und bricht ab, sobald das Konfidenzintervall des p-Werts
+    vollständig unter oder über alpha liegt (spätestens nach max_resamples). Die Blöcke
+    werden wie in permutation_diffs geseedet, bei gleichem Seed und gleicher Blockgröße
+    sind die gezogenen Resamples also ein Anfangsstück des festen Tests.
+    """
+    first = np.asarray(first, dtype=np.float64)
+    second = np.asarray(second, dtype=np.float64)
+    all_values = np.concatenate([first, second])
+    n_first = len(first)
+    observed_diff = np.mean(second) - np.mean(first)
+    seeds = seed_sequence(rng)
+
+    parts = []
+    extreme = 0
+    n = 0
+    lower, upper = 0.0, 1.0
+    while n < max_resamples:
+        batch = min(batch_size, max_resamples - n)
+        diffs = _diff_batch(all_values, n_first, batch, seeds.spawn(1)[0])
+        parts.append(diffs)
+        n += batch
+
+        if observed_diff >= 0:
+            extreme += np.count_nonzero(diffs >= observed_diff)
+        else:
+            extreme += np.count_nonzero(diffs <= observed_diff)
+
+        lower, upper = p_value_bounds(extreme, n, confidence)
+        if upper < alpha or lower > alpha:
+            break
+
+    return {
+        'null_diffs': np.concatenate(parts) if parts else np.empty(0),
+        'p_value': min(2 * extreme / n, 1.0) if n else 1.0,
+        'p_lower': lower,
+        'p_upper': upper,
+        'resamples': n,
+        'stopped_early': n < max_resamples,
+    }
+
+
+def exact_feasible(n_first, n_second, max_subsets=EXACT_MAX_SUBSETS):
+    """Prüft, ob der exakte Test für diese Gruppengrößen in die Obergrenze der Teilsummen passt"""
+    # Python-int: 2 ** k mit numpy-Ganzzahlen läuft ab k = 63 über
+    n_first, n_second = int(n_first), int(n_second)
+    n = n_first + n_second
+    return n_first > 0 and n_second > 0 and n - n // 2 <= max_subsets.bit_length() - 1
+
+
+def exact_preferred(n_first, n_second, n_resamples, max_subsets=EXACT_MAX_SUBSETS):
+    """Exakter Test möglich und günstiger als n_resamples Mischungen (2^(n/2) Teilsummen gegen n_resamples * n)"""
+    if not exact_feasible(n_first, n_second, max_subsets):
+        return False
+    n = int(n_first) + int(n_second)
+    return (1 << (n - n // 2)) * EXACT_COST_FACTOR <= n_resamples * n
+
+
+def _subset_sums(values):
+    """Summen und Größen aller 2^n Teilmengen, nach Größe gruppiert: Liste [Summen der Größe k]"""
+    sums = np.zeros(1)
+    sizes = np.zeros(1, dtype=np.int64)
+    for value in values:
+        sums = np.concatenate([sums, sums + value])
+        sizes = np.concatenate([sizes, sizes + 1])
+    order = np.argsort(sizes, kind='stable')
+    bounds = np.searchsorted(sizes[order], np.arange(len(values) + 2))
+    return [np.sort(sums[order[bounds[k]:bounds[k + 1]]]) for k in range(len(values) + 1)]
+
+
+def _split_sums(all_values, n_first):
+    """Teilsummen beider Hälften (Meet-in-the-Middle) und die möglichen Aufteilungen von n_first auf sie"""
+    half = len(all_values) // 2
+    left = _subset_sums(all_values[:half])
+    right = _subset_sums(all_values[half:])
+    ks = range(max(0, n_first - (len(all_values) - half)), min(half, n_first) + 1)
+    return left, right, ks
+
+
+def exact_permutation_test(first, second):
+    """Exakter zweiseitiger Permutationstest für mean(second) - mean(first) über alle Aufteilungen
+
+    Die Differenz fällt mit der Summe S der ersten Gruppe. Statt alle C(n, n_first)
+    Aufteilungen aufzuzählen, werden die Teilsummen beider Hälften der vereinigten Werte
+    nach Größe sortiert (Meet-in-the-Middle) und die Aufteilungen mit S mindestens so
+    extrem wie beobachtet per searchsorted gezählt. Der Aufwand wächst mit 2^(n/2).
+    p-Wert wie two_sided_p_value: verdoppelter Anteil des extremen Randes.
+    """
+    first = np.asarray(first, dtype=np.float64)
+    second = np.asarray(second, dtype=np.float64)
+    if not exact_feasible(len(first), len(second)):
+        raise ValueError(f"Exakter Test für {len(first)} + {len(second)} Werte zu groß "
+                         f"(höchstens {EXACT_MAX_SUBSETS} Teilsummen je Hälfte)")
+    all_values = np.concatenate([first, second])
+    n_first = len(first)
+    observed_diff = np.mean(second) - np.mean(first)
+    observed_sum = first.sum()
+    # Rundungsfehler der Teilsummen: die beobachtete Aufteilung zählt immer als extrem
+    tolerance = 1e-10 * max(np.abs(all_values).sum(), 1.0)
+
+    left, right, ks = _split_sums(all_values, n_first)
+    extreme = 0
+    for k in ks:
+        a, b = left[k], right[n_first - k]
+        if observed_diff >= 0:
+            # Differenz >= beobachtet <=> S <= beobachtete Summe
+            extreme += int(np.searchsorted(b, observed_sum + tolerance - a, side='right').sum())
+        else:
+            extreme += int((len(b) - np.searchsorted(b, observed_sum - tolerance - a, side='left')).sum())
+
+    splits = math.comb(len(all_values), n_first)
+    return {
+        'observed_diff': observed_diff,
+        'p_value': min(2 * extreme / splits, 1.0),
+        'extreme': extreme,
+        'splits': splits,
+    }
+
+
+def exact_null_histogram(first, second, bins=50, max_splits=EXACT_MAX_SPLITS):
+    """Histogramm (counts, edges) der exakten Nullverteilung über alle Aufteilungen oder None
+
+    Die Differenzen werden je Aufteilung der Größen auf die Hälften blockweise gebildet
+    und gezählt, ohne alle Aufteilungen gleichzeitig im Speicher zu halten.
+    """
+    first = np.asarray(first, dtype=np.float64)
+    second = np.asarray(second, dtype=np.float64)
+    all_values = np.concatenate([first, second])
+    n_first, n_second = len(first), len(second)
+    if not exact_feasible(n_first, n_second) or math.comb(len(all_values), n_first) > max_splits:
+        return None
+
+    # Extreme der Differenz: die n_first kleinsten bzw. größten Werte in der ersten Gruppe
+    ordered = np.sort(all_values)
+    total = ordered.sum()
+    low_sum, high_sum = ordered[:n_first].sum(), ordered[-n_first:].sum()
+    edges = np.linspace((total - high_sum) / n_second - high_sum / n_first,
+                        (total - low_sum) / n_second - low_sum / n_first, bins + 1)
+
+    counts = np.zeros(bins, dtype=np.int64)
+    left, right, ks = _split_sums(all_values, n_first)
+    for k in ks:
+        b = right[n_first - k]
+        step = max(1, MAX_BATCH_VALUES // max(len(b), 1))
+        for start in range(0, len(left[k]), step):
+            sums = (left[k][start:start + step, None] + b[None, :]).ravel()
+            # Rundungsfehler dürfen die Extremwerte nicht aus dem Wertebereich schieben
+            diffs = np.clip((total - sums) / n_second - sums / n_first, edges[0], edges[-1])
+            counts += np.histogram(diffs, bins=edges)[0]
+    return counts, edges
+
+
+def permutation_test(first, second, n_resamples=10000, rng=None, batch_size=None, workers=1, exact='auto'):
+    """Zweiseitiger Permutationstest, exakt wenn möglich, sonst mit n_resamples Mischungen
+
+    exact='auto' wählt den exakten Test, sobald exact_preferred gilt; True erzwingt ihn,
+    False erzwingt die Monte-Carlo-Simulation (permutation_diffs).
+    """
+    n_first, n_second = len(first), len(second)
+    if exact is True or (exact == 'auto' and exact_preferred(n_first, n_second, n_resamples)):
+        return {**exact_permutation_test(first, second), 'exact': True}
+
+    null_diffs = permutation_diffs(first, second, n_resamples, rng=rng, batch_size=batch_size, workers=workers)
+    observed_diff = np.mean(second) - np.mean(first)
+    return {
+        'observed_diff': observed_diff,
+        'p_value': two_sided_p_value(null_diffs, observed_diff),
+        'splits': n_resamples,
+        'null_diffs': null_diffs,
+        'exact': False,
+    }
+
+
+def sign_flip_preferred(n, n_resamples, max_subsets=EXACT_MAX_SUBSETS):
+    """Exakter Vorzeichentest möglich und günstiger als n_resamples Vorzeichenwechsel (wie exact_preferred)"""
+    n = int(n)
+    half = n - n // 2
+    return n > 0 and half <= max_subsets.bit_length() - 1 and (1 << half) * EXACT_COST_FACTOR <= n_resamples * n
+
+
+def _signed_sums(values):
+    """Summen aller 2^n Vorzeichenkombinationen ±v1 ± v2 ..."""
+    sums = np.zeros(1)
+    for value in values:
+        sums = np.concatenate([sums + value, sums - value])
+    return sums
+
+
+def sign_flip_test(diffs, n_resamples=10000, rng=None, batch_size=None, exact='auto'):
+    """Gepaarter zweiseitiger Permutationstest für mean(diffs) über Vorzeichenwechsel der Differenzen
+
+    Unter der Nullhypothese ist jedes Vorzeichen einer Differenz (b - a derselben Person)
+    gleich wahrscheinlich. Exakt über alle 2^n Vorzeichen mit Meet-in-the-Middle wie
+    exact_permutation_test, sonst mit n_resamples zufälligen Vorzeichenvektoren je Block.
+    p-Wert wie two_sided_p_value: verdoppelter Anteil des extremen Randes.
+    """
+    diffs = np.asarray(diffs, dtype=np.float64)
+    n = len(diffs)
+    observed = diffs.mean() if n else np.nan
+    if n == 0:
+        return {'observed_diff': observed, 'p_value': np.nan, 'splits': 0, 'exact': False}
+    total = diffs.sum()
+    # Rundungsfehler der Summen: die beobachteten Vorzeichen zählen immer als extrem
+    tolerance = 1e-10 * max(np.abs(diffs).sum(), 1.0)
+
+    if exact is True or (exact == 'auto' and sign_flip_preferred(n, n_resamples)):
+        if n - n // 2 > EXACT_MAX_SUBSETS.bit_length() - 1:
+            raise ValueError(f"Exakter Vorzeichentest für {n} Differenzen zu groß "
+                             f"(höchstens {EXACT_MAX_SUBSETS} Teilsummen je Hälfte)")
+        left = _signed_sums(diffs[:n // 2])
+        right = np.sort(_signed_sums(diffs[n // 2:]))
+        if total >= 0:
+            extreme = int((len(right) - np.searchsorted(right, total - tolerance - left, side='left')).sum())
+        else:
+            extreme = int(np.searchsorted(right, total + tolerance - left, side='right').sum())
+        splits = 1 << n
+        return {'observed_diff': observed, 'p_value': min(2 * extreme / splits, 1.0), 'splits': splits,
+                'exact': True}
+
+    if batch_size is None:
+        batch_size = default_batch_size(n, n_resamples)
+    seeds = seed_sequence(rng)
+    extreme = 0
+    for start in range(0, n_resamples, batch_size):
+        batch = min(batch_size, n_resamples - start)
+        block_rng = np.random.default_rng(seeds.spawn(1)[0])
+        sums = np.where(block_rng.random((batch, n)) < 0.5, -1.0, 1.0) @ diffs
+        if total >= 0:
+            extreme += np.count_nonzero(sums >= total - tolerance)
+        else:
+            extreme += np.count_nonzero(sums <= total + tolerance)
+    return {'observed_diff': observed, 'p_value': min(2 * extreme / n_resamples, 1.0), 'splits': n_resamples,
+            'exact': False}
+
+
+def cluster_bootstrap_means(values, offsets, n_resamples, rng=None, batch_size=None):
+    """Hierarchischer Bootstrap des Mittelwerts der Teilnehmer-Mittelwerte
+
+    Zieht je Resample die Teilnehmer mit Zurücklegen und innerhalb jedes gezogenen
+    Teilnehmers dessen Trials mit Zurücklegen. Die Trials liegen als flaches Array mit
+    Offsets vor (Teilnehmer i: values[offsets[i]:offsets[i + 1]]); alle Ziehungen eines
+    Blocks werden ohne Schleife über Teilnehmer berechnet.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    sizes = np.diff(offsets)
+    n_clusters = len(sizes)
+
+    if batch_size is None:
+        # Ein Resample zieht im Mittel so viele Trials, wie insgesamt vorliegen
+        batch_size = default_batch_size(len(values), n_resamples)
+    seeds = seed_sequence(rng)
+
+    means = np.empty(n_resamples, dtype=np.float64)
+    for start in range(0, n_resamples, batch_size):
+        batch = min(batch_size, n_resamples - start)
+        block_rng = np.random.default_rng(seeds.spawn(1)[0])
+
+        # Teilnehmer ziehen: (batch, n_clusters) Indizes
+        clusters = block_rng.integers(0, n_clusters, size=(batch, n_clusters)).ravel()
+        counts = sizes[clusters]
+
+        # Trials je gezogenem Teilnehmer ziehen
+        draw_base = np.repeat(offsets[clusters], counts)
+        draw_size = np.repeat(counts, counts)
+        draws = draw_base + (block_rng.random(len(draw_base)) * draw_size).astype(np.int64)
+
+        # Mittelwert je gezogenem Teilnehmer, danach je Resample
+        group_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        cluster_means = np.add.reduceat(values[draws], group_starts) / counts
+        means[start:start + batch] = cluster_means.reshape(batch, n_clusters).mean(axis=1)
+    return means
+
+
+def bootstrap_intervals(boot, estimate, jackknife, confidence=0.95):
+    """Perzentil- und BCa-Intervall aus Bootstrap-Werten und Jackknife-Schätzungen"""
+    from scipy import stats
+    tail = (1 - confidence) / 2
+    percentile = tuple(np.quantile(boot, [tail, 1 - tail]))
+
+    # Verzerrungskorrektur z0 und Beschleunigung a
+    below = np.mean(boot < estimate) + 0.5 * np.mean(boot == estimate)
+    z0 = stats.norm.ppf(np.clip(below, 1e-12, 1 - 1e-12))
+    deviations = np.mean(jackknife) - jackknife
+    denominator = 6 * np.sum(deviations ** 2) ** 1.5
+    acceleration = np.sum(deviations ** 3) / denominator if denominator > 0 else 0.0
+
+    z = stats.norm.ppf([tail, 1 - tail])
+    adjusted = stats.norm.cdf(z0 + (z0 + z) / (1 - acceleration * (z0 + z)))
+    bca = tuple(np.quantile(boot, adjusted))
+    return percentile, bca
+
+
+def cluster_bootstrap_ci(values, offsets, n_resamples=10000, confidence=0.95, rng=None, batch_size=None):
+    """Schätzwert, Perzentil- und BCa-Intervall des Mittelwerts der Teilnehmer-Mittelwerte"""
+    values = np.asarray(values, dtype=np.float64)
+    sizes = np.diff(offsets)
+    participant_means = np.add.reduceat(values, offsets[:-1]) / sizes
+    estimate = participant_means.mean()
+
+    # Jackknife durch Weglassen je eines Teilnehmers
+    n = len(participant_means)
+    jackknife = (participant_means.sum() - participant_means) / (n - 1) if n > 1 else participant_means
+
+    boot = cluster_bootstrap_means(values, offsets, n_resamples, rng=rng, batch_size=batch_size)
+    percentile, bca = bootstrap_intervals(boot, estimate, jackknife, confidence)
+    return {
+        'estimate': estimate,
+        'participants': n,
+        'trials': len(values),
+        'percentile': percentile,
+        'bca': bca,
+    }
+
+
+def holm_correction(p_values):
+    """Holm-Bonferroni-adjustierte p-Werte"""
+    p_values = np.asarray(p_values, dtype=np.float64)
+    m = len(p_values)
+    order = np.argsort(p_values)
+    adjusted = np.maximum.accumulate((m - np.arange(m)) * p_values[order])
+    result = np.empty(m)
+    result[order] = np.minimum(adjusted, 1.0)
+    return result
+
+
+def fdr_correction(p_values):
+    """Benjamini-Hochberg-adjustierte p-Werte (False Discovery Rate)"""
+    p_values = np.asarray(p_values, dtype=np.float64)
+    m = len(p_values)
+    order = np.argsort(p_values)
+    scaled = p_values[order] * m / np.arange(1, m + 1)
+    adjusted = np.minimum.accumulate(scaled[::-1])[::-1]
+    result = np.empty(m)
+    result[order] = np.minimum(adjusted, 1.0)
+    return result
+
+
+def pairwise_permutation_tests(groups, n_resamples=10000, rng=None, batch_size=None, exact='auto', paired=None):
+    """Permutationstests für alle Gruppenpaare mit gemeinsamen Zufallszahlen
+
+    groups ist ein Dict Name -> Werte. Je Resample wird ein Zufallsschlüssel pro Wert
+    gezogen; für ein Paar (a, b) bilden die n_a kleinsten Schlüssel der vereinigten
+    Werte die neue Gruppe a. Das entspricht einer zufälligen Permutation innerhalb des
+    Paares, alle Paare teilen sich aber dieselbe Schlüsselmatrix.
+    Paare, für die exact_preferred gilt, werden mit exact='auto' exakt getestet (wie
+    in permutation_test); die Simulation läuft dann nur für die übrigen Paare.
+    paired: Dict (Name a, Name b) -> Differenzen b - a je Person; diese Paare werden
+    gepaart über Vorzeichenwechsel getestet (sign_flip_test) statt als unabhängige Gruppen.
+    Holm- und FDR-Korrektur laufen über alle Paare gemeinsam.
+    """
+    paired = paired or {}
+    names = list(groups)
+    arrays = [np.asarray(groups[name], dtype=np.float64) for name in names]
+    sizes = np.array([len(a) for a in arrays])
+    bounds = np.concatenate(([0], np.cumsum(sizes)))
+    n_values = bounds[-1]
+
+    pairs = [(i, j) for i in range(len(names)) for j in range(i + 1, len(names))]
+    columns = [np.concatenate([np.arange(bounds[i], bounds[i + 1]), np.arange(bounds[j], bounds[j + 1])])
+               for i, j in pairs]
+    pair_values = [np.concatenate([arrays[i], arrays[j]]) for i, j in pairs]
+    observed = np.array([arrays[j].mean() - arrays[i].mean() for i, j in pairs])
+    extreme = np.zeros(len(pairs), dtype=np.int64)
+    is_paired = np.array([(names[i], names[j]) in paired for i, j in pairs], dtype=bool)
+    is_exact = np.array([exact is True or (exact == 'auto' and exact_preferred(sizes[i], sizes[j], n_resamples))
+                         for i, j in pairs], dtype=bool) & ~is_paired
+    n_pairs = np.zeros(len(pairs), dtype=np.int64)
+    p_values = np.empty(len(pairs))
+    seeds = seed_sequence(rng)
+    for k in np.flatnonzero(is_paired):
+        i, j = pairs[k]
+        diffs = np.asarray(paired[(names[i], names[j])], dtype=np.float64)
+        test = sign_flip_test(diffs, n_resamples, rng=seeds.spawn(1)[0], batch_size=batch_size, exact=exact)
+        observed[k], p_values[k], is_exact[k] = test['observed_diff'], test['p_value'], test['exact']
+        n_pairs[k] = len(diffs)
+    for k in np.flatnonzero(is_exact & ~is_paired):
+        i, j = pairs[k]
+        p_values[k] = exact_permutation_test(arrays[i], arrays[j])['p_value']
+    simulated = [k for k in range(len(pairs)) if not is_exact[k] and not is_paired[k]]
+
+    if batch_size is None:
+        batch_size = default_batch_size(n_values, n_resamples)
+
+    for start in range(0, n_resamples if simulated else 0, batch_size):
+        batch = min(batch_size, n_resamples - start)
+        keys = np.random.default_rng(seeds.spawn(1)[0]).random((batch, n_values))
+
+        for k in simulated:
+            i, j = pairs[k]
+            pair_keys = keys[:, columns[k]]
+            n_first = sizes[i]
+            threshold = np.partition(pair_keys, n_first - 1, axis=1)[:, n_first - 1:n_first]
+            first_sums = (pair_keys <= threshold) @ pair_values[k]
+            diffs = (pair_values[k].sum() - first_sums) / sizes[j] - first_sums / n_first
+
+            if observed[k] >= 0:
+                extreme[k] += np.count_nonzero(diffs >= observed[k])
+            else:
+                extreme[k] += np.count_nonzero(diffs <= observed[k])
+
+    p_values[simulated] = np.minimum(2 * extreme[simulated] / n_resamples, 1.0)
+    return [
+        {
+            'group_a': names[i],
+            'group_b': names[j],
+            'mean_a': arrays[i].mean(),
+            'mean_b': arrays[j].mean(),
+            'observed_diff': observed[k],
+            'paired': bool(is_paired[k]),
+            'n_paired': int(n_pairs[k]),
+            'p_value': p_values[k],
+            'p_holm': p_holm,
+            'p_fdr': p_fdr,
+            'exact': bool(is_exact[k]),
+        }
+        for k, ((i, j), p_holm, p_fdr) in enumerate(zip(pairs, holm_correction(p_values), fdr_correction(p_values)))
+    ]
@@ -0,0 +1,265 @@
+from functools import lru_cache
+from itertools import combinations
+import numpy as np
+import pandas as pd
+
+from ingest import CONDITIONS, CONDITION_NAMES
+from participants import ParticipantIndex
+from resampling import fdr_correction, holm_correction
+
+# Bedingungspaare innerhalb eines Experiments (Trials derselben Sitzung, unabhängige Stichproben)
+WITHIN_PAIRS = tuple(
+    (a, b) for a, b in combinations(range(len(CONDITIONS)), 2) if CONDITIONS[a][0] == CONDITIONS[b][0]
+)
+# Alle Bedingungspaare für die gepaarten Tests über Personen
+PERSON_PAIRS = tuple(combinations(range(len(CONDITIONS)), 2))
+
+# Exakte Nullverteilungen wie scipy (method='auto'): Mann-Whitney bis 8 Werte in einer Gruppe,
+# Wilcoxon bis 50 Differenzen, jeweils nur ohne Bindungen; Wilcoxon mit Bindungen oder Nullen
+# bis 13 Differenzen über alle 2^n Vorzeichenwechsel
+MWU_EXACT_MAX = 8
+WILCOXON_EXACT_MAX = 50
+WILCOXON_SIGN_FLIP_MAX = 13
+
+
+def group_ranks(group, values):
+    """Ränge (1-basiert, Bindungen gemittelt) innerhalb jeder Gruppe und Bindungskorrektur Σ(t³ - t) je Gruppe
+
+    Alle Gruppen werden über eine gemeinsame Sortierung nach (Gruppe, Wert) gerankt.
+    """
+    group = np.asarray(group, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    n_groups = int(group.max()) + 1 if len(group) else 0
+    order = np.lexsort((values, group))
+    g, v = group[order], values[order]
+
+    counts = np.bincount(g, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    position = np.arange(len(g)) - starts[g] + 1
+
+    # Läufe gleicher Werte innerhalb einer Gruppe erhalten den mittleren Rang
+    new_run = np.ones(len(g), dtype=bool)
+    new_run[1:] = (np.diff(g) != 0) | (np.diff(v) != 0)
+    run = np.cumsum(new_run) - 1
+    run_length = np.bincount(run)
+    run_first = position[new_run]
+    ranks = np.empty(len(g))
+    ranks[order] = (run_first + (run_length - 1) / 2)[run]
+
+    ties = np.bincount(g[new_run], (run_length ** 3 - run_length).astype(np.float64), minlength=n_groups)
+    return ranks, ties
+
+
+@lru_cache(maxsize=None)
+def _mwu_counts(n1, n2):
+    """Anzahl der Anordnungen je Wert von U (0 .. n1·n2) ohne Bindungen"""
+    if n1 == 0 or n2 == 0:
+        return np.ones(1)
+    counts = np.zeros(n1 * n2 + 1)
+    # Der größte Wert stammt aus Gruppe 1 (U steigt um n2) oder aus Gruppe 2
+    counts[n2:] += _mwu_counts(n1 - 1, n2)
+    counts[:n1 * (n2 - 1) + 1] += _mwu_counts(n1, n2 - 1)
+    return counts
+
+
+@lru_cache(maxsize=None)
+def _wilcoxon_counts(n):
+    """Anzahl der Vorzeichenkombinationen je Wert der Rangsumme W+ (0 .. n(n+1)/2)"""
+    counts = np.ones(1)
+    for k in range(1, n + 1):
+        counts = np.concatenate([counts, np.zeros(k)]) + np.concatenate([np.zeros(k), counts])
+    return counts
+
+
+def _exact_two_sided(counts, statistic):
+    """Zweiseitiger p-Wert aus einer symmetrischen Nullverteilung (verdoppelter Rand)"""
+    total = counts.sum()
+    upper = counts[int(round(statistic)):].sum() / total
+    lower = counts[:int(round(statistic)) + 1].sum() / total
+    return min(2 * min(upper, lower), 1.0)
+
+
+def welch_tests(n_a, mean_a, var_a, n_b, mean_b, var_b):
+    """Welch-t-Test für Arrays von Gruppenkennwerten (Varianzen mit ddof=1); t für mean_b - mean_a"""
+    from scipy import stats
+    with np.errstate(invalid='ignore', divide='ignore'):
+        se_a, se_b = var_a / n_a, var_b / n_b
+        t = (mean_b - mean_a) / np.sqrt(se_a + se_b)
+        df = (se_a + se_b) ** 2 / (se_a ** 2 / (n_a - 1) + se_b ** 2 / (n_b - 1))
+    return t, df, 2 * stats.t.sf(np.abs(t), df)
+
+
+def mann_whitney_tests(group, values, first, n_groups):
+    """Mann-Whitney-U-Test je Gruppe; first markiert die Werte der ersten Stichprobe
+
+    Liefert U der ersten Stichprobe und zweiseitige p-Werte wie scipy.stats.mannwhitneyu:
+    exakt für kleine Gruppen ohne Bindungen, sonst Normalapproximation mit Bindungs-
+    und Stetigkeitskorrektur.
+    """
+    from scipy import stats
+    ranks, ties = group_ranks(group, values)
+    ties = np.pad(ties, (0, n_groups - len(ties)))
+    n1 = np.bincount(group, first, minlength=n_groups)
+    n2 = np.bincount(group, ~first, minlength=n_groups)
+    n = n1 + n2
+    u1 = np.bincount(group, ranks * first, minlength=n_groups) - n1 * (n1 + 1) / 2
+    u = np.maximum(u1, n1 * n2 - u1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma = np.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))))
+        z = (u - n1 * n2 / 2 - 0.5) / sigma
+    p = np.minimum(2 * stats.norm.sf(z), 1.0)
+
+    # Exakte p-Werte je vorkommender Kombination der Gruppengrößen auf einmal nachschlagen
+    exact = np.flatnonzero((np.minimum(n1, n2) <= MWU_EXACT_MAX) & (ties == 0) & (n1 > 0) & (n2 > 0))
+    shapes, shape_index = np.unique(np.stack([n1[exact], n2[exact]], axis=1).astype(np.int64), axis=0,
+                                    return_inverse=True)
+    for k, (size_1, size_2) in enumerate(shapes):
+        groups = exact[shape_index.ravel() == k]
+        counts = _mwu_counts(int(size_1), int(size_2))
+        # P(U >= u) für u = max(U1, U2) >= n1·n2/2, verdoppelt
+        upper = np.cumsum(counts[::-1])[::-1] / counts.sum()
+        p[groups] = np.minimum(2 * upper[np.rint(u[groups]).astype(np.int64)], 1.0)
+    return u1, p
+
+
+def paired_tests(diffs):
+    """Gepaarter t-Test und Wilcoxon-Vorzeichen-Rang-Test je Zeile einer Differenzenmatrix (NaN = fehlt)
+
+    Nullen werden für den Wilcoxon-Test verworfen (zero_method='wilcox'). Die p-Werte
+    entsprechen scipy.stats.wilcoxon: exakt ohne Bindungen (bis WILCOXON_EXACT_MAX),
+    mit Bindungen oder Nullen über alle Vorzeichenwechsel (bis WILCOXON_SIGN_FLIP_MAX),
+    sonst Normalapproximation mit Bindungskorrektur.
+    """
+    from scipy import stats
+    diffs = np.asarray(diffs, dtype=np.float64)
+    valid = ~np.isnan(diffs)
+    n = valid.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(diffs, axis=1) / n
+        var = np.nansum((diffs - mean[:, None]) ** 2, axis=1) / (n - 1)
+        t = mean / np.sqrt(var / n)
+    p_t = 2 * stats.t.sf(np.abs(t), n - 1)
+
+    # Wilcoxon über die Ränge der Beträge je Zeile
+    row, col = np.nonzero(valid & (diffs != 0))
+    d = diffs[row, col]
+    ranks, ties = group_ranks(row, np.abs(d))
+    ties = np.pad(ties, (0, len(diffs) - len(ties)))
+    m = np.bincount(row, minlength=len(diffs)).astype(np.float64)
+    r_plus = np.bincount(row, ranks * (d > 0), minlength=len(diffs))
+    r_minus = m * (m + 1) / 2 - r_plus
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = (r_plus - m * (m + 1) / 4) / np.sqrt(m * (m + 1) * (2 * m + 1) / 24 - ties / 48)
+    p_w = np.minimum(2 * stats.norm.sf(np.abs(z)), 1.0)
+
+    zeros = n - m
+    exact = (m <= WILCOXON_EXACT_MAX) & (ties == 0) & (zeros == 0) & (m > 0)
+    for r in np.flatnonzero(exact):
+        p_w[r] = _exact_two_sided(_wilcoxon_counts(int(m[r])), r_plus[r])
+
+    # Mit Bindungen oder Nullen: alle Vorzeichen der (gemittelten) Ränge durchzählen
+    flip = ~exact & (n <= WILCOXON_SIGN_FLIP_MAX) & (m > 0)
+    for r in np.flatnonzero(flip):
+        row_ranks = ranks[row == r]
+        signs = (np.arange(2 ** len(row_ranks))[:, None] >> np.arange(len(row_ranks))) & 1
+        null = signs @ row_ranks
+        gamma = 1e-14 * abs(r_plus[r])
+        p_w[r] = min(2 * min(np.mean(null <= r_plus[r] + gamma), np.mean(null >= r_plus[r] - gamma)), 1.0)
+        exact[r] = True
+    return {'n': n, 'mean_diff': mean, 't': t, 'p_ttest': p_t,
+            'w': np.minimum(r_plus, r_minus), 'p_wilcoxon': p_w, 'wilcoxon_exact': exact}
+
+
+def within_session_tests(study, pairs=WITHIN_PAIRS):
+    """Welch-t- und Mann-Whitney-U-Test für jedes Bedingungspaar innerhalb jeder Sitzung
+
+    Für alle Sitzungen und Paare zusammen werden Kennwerte und Ränge über die flache
+    Trial-Tabelle berechnet (eine Gruppe je Paar und Sitzung), ohne Aufruf je Test.
+    Liefert eine Zeile je (Sitzung, Paar) mit beiden Bedingungen; p_fdr über alle Zeilen.
+    """
+    participant = study.trials['participant'].to_numpy().astype(np.int64)
+    condition = study.trials['condition'].to_numpy().astype(np.int64)
+    rt = study.trials['rt'].to_numpy()
+    n_rows = len(study.participants)
+
+    # Je Paar die Trials beider Bedingungen, Gruppe = Paar · Sitzungen + Sitzung
+    parts = []
+    for k, (a, b) in enumerate(pairs):
+        mask = (condition == a) | (condition == b)
+        parts.append((k * n_rows + participant[mask], rt[mask], condition[mask] == a))
+    if not parts:
+        return pd.DataFrame()
+    group, values, first = (np.concatenate(column) for column in zip(*parts))
+    n_groups = len(pairs) * n_rows
+
+    n_a = np.bincount(group, first, minlength=n_groups)
+    n_b = np.bincount(group, ~first, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sum_a = np.bincount(group, values * first, minlength=n_groups)
+        sum_b = np.bincount(group, values * ~first, minlength=n_groups)
+        mean_a, mean_b = sum_a / n_a, sum_b / n_b
+        centered = values - np.where(first, mean_a[group], mean_b[group])
+        var_a = np.bincount(group, centered ** 2 * first, minlength=n_groups) / (n_a - 1)
+        var_b = np.bincount(group, centered ** 2 * ~first, minlength=n_groups) / (n_b - 1)
+    t, df, p_welch = welch_tests(n_a, mean_a, var_a, n_b, mean_b, var_b)
+    u, p_mwu = mann_whitney_tests(group, values, first, n_groups)
+
+    keep = np.flatnonzero((n_a > 1) & (n_b > 1))
+    pair, row = np.divmod(keep, n_rows)
+    names = np.asarray(CONDITION_NAMES, dtype=object)
+    pair_a = np.array([a for a, _ in pairs], dtype=np.int64)
+    pair_b = np.array([b for _, b in pairs], dtype=np.int64)
+    result = pd.DataFrame({
+        'row': row,
+        'name': study.participants['name'].to_numpy()[row],
+        'experiment': study.participants['experiment_type'].to_numpy()[row],
+        'condition_a': names[pair_a[pair]],
+        'condition_b': names[pair_b[pair]],
+        'n_a': n_a[keep].astype(np.int64),
+        'n_b': n_b[keep].astype(np.int64),
+        'mean_a': mean_a[keep],
+        'mean_b': mean_b[keep],
+        'diff': mean_b[keep] - mean_a[keep],
+        't': t[keep],
+        'df': df[keep],
+        'p_welch': p_welch[keep],
+        'u': u[keep],
+        'p_mwu': p_mwu[keep],
+    })
+    result['p_fdr_welch'] = fdr_correction(result['p_welch'].to_numpy())
+    result['p_fdr_mwu'] = fdr_correction(result['p_mwu'].to_numpy())
+    return result.sort_values(['row', 'condition_a', 'condition_b'], kind='stable').reset_index(drop=True)
+
+
+def person_tests(study, pairs=PERSON_PAIRS, index=None):
+    """Gepaarter t-Test und Wilcoxon-Test über Personen für jedes Bedingungspaar
+
+    Die Mittelwerte je Person und Bedingung kommen aus dem ParticipantIndex (eine
+    Sitzung je Person und Experiment); fehlende Kombinationen bleiben als NaN in der
+    Differenzenmatrix (Paare x Personen) und werden je Zeile ausgelassen.
+    """
+    index = index or ParticipantIndex(study)
+    _, means = index.condition_stats()
+    pair_a = np.array([a for a, _ in pairs], dtype=np.int64)
+    pair_b = np.array([b for _, b in pairs], dtype=np.int64)
+    diffs = (means[:, pair_b] - means[:, pair_a]).T
+
+    tests = paired_tests(diffs)
+    names = np.asarray(CONDITION_NAMES, dtype=object)
+    result = pd.DataFrame({
+        'condition_a': names[pair_a],
+        'condition_b': names[pair_b],
+        **tests,
+    })
+    result['p_holm_ttest'] = _holm(result['p_ttest'].to_numpy())
+    result['p_holm_wilcoxon'] = _holm(result['p_wilcoxon'].to_numpy())
+    return result
+
+
+def _holm(p_values):
+    """Holm-Korrektur, fehlende p-Werte (zu wenige Personen) bleiben NaN"""
+    result = np.full(len(p_values), np.nan)
+    valid = ~np.isnan(p_values)
+    result[valid] = holm_correction(p_values[valid])
+    return result
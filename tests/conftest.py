@@ -0,0 +1,32 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Flaches Modul-Layout: die Module liegen im Wurzelverzeichnis des Repositories
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import SyntheticStudy  # noqa: E402
+
+
+def write_exports(directory, synthetic, participants):
+    """Schreibt die drei JSON-Exporte der angegebenen synthetischen Teilnehmer in ein Verzeichnis"""
+    for i in participants:
+        for filename, data in synthetic.exports(i):
+            with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+
+
+@pytest.fixture
+def synthetic():
+    return SyntheticStudy(8, seed=1)
+
+
+@pytest.fixture
+def export_dir(tmp_path, synthetic):
+    """Verzeichnis mit den Exporten aller synthetischen Teilnehmer"""
+    directory = tmp_path / 'exports'
+    directory.mkdir()
+    write_exports(str(directory), synthetic, range(synthetic.n))
+    return str(directory)
@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from a2 import participant_summary, experiment_frames
+from aggregates import AggregateStore
+from ingest import load_study
+from reports import write_summary_csvs, write_experiment_summary
+from conftest import write_exports
+
+
+def a2_frames(source):
+    study = load_study(source, cache_dir=None)
+    return experiment_frames(participant_summary(study.long_table()))
+
+
+def assert_same_frames(actual, expected):
+    for actual_df, expected_df in zip(actual, expected):
+        keys = [column for column in ('name', 'stimulus_type', 'food_type') if column in expected_df]
+        actual_df = actual_df.sort_values(keys, kind='stable').reset_index(drop=True)
+        expected_df = expected_df.sort_values(keys, kind='stable').reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual_df[expected_df.columns], expected_df, check_dtype=False)
+
+
+def test_participant_frames_equal_a2(export_dir, tmp_path):
+    store = AggregateStore(str(tmp_path / 'state'))
+    store.update(export_dir)
+    assert_same_frames(store.participant_frames(), a2_frames(export_dir))
+
+
+def test_incremental_update_equals_a2(tmp_path, synthetic):
+    directory = tmp_path / 'exports'
+    directory.mkdir()
+    write_exports(str(directory), synthetic, range(3))
+    state_dir = str(tmp_path / 'state')
+    AggregateStore(state_dir).update(str(directory))
+
+    write_exports(str(directory), synthetic, range(3, synthetic.n))
+    os.remove(directory / sorted(os.listdir(directory))[0])
+    (directory / 'kaputt.json').write_text('[', encoding='utf-8')
+    store = AggregateStore(state_dir)
+    assert store.update(str(directory))[1] == 1
+    assert 'kaputt.json' in store.failed
+    assert_same_frames(store.participant_frames(), a2_frames(str(directory)))
+
+    # Ein erneuter Lauf liest nichts ein, auch nicht den fehlerhaften Export
+    assert AggregateStore(state_dir).update(str(directory)) == (0, 0)
+
+
+def test_reports_equal_a2_output(export_dir, tmp_path):
+    store = AggregateStore(str(tmp_path / 'state'))
+    store.update(export_dir)
+    store.write_reports(str(tmp_path / 'inkrementell'))
+    expected_dir = tmp_path / 'a2'
+    expected_dir.mkdir()
+    frames = a2_frames(export_dir)
+    write_summary_csvs(*frames, str(expected_dir))
+    write_experiment_summary(*frames, str(expected_dir))
+
+    assert sorted(os.listdir(expected_dir)) == sorted(os.listdir(tmp_path / 'inkrementell'))
+    for filename in os.listdir(expected_dir):
+        if filename.endswith('.csv'):
+            pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'inkrementell' / filename),
+                                          pd.read_csv(expected_dir / filename), check_exact=False)
+        else:
+            assert (tmp_path / 'inkrementell' / filename).read_text() == (expected_dir / filename).read_text()
+
+
+def test_condition_summary_counts_all_trials(export_dir, tmp_path):
+    store = AggregateStore(str(tmp_path / 'state'))
+    store.update(export_dir)
+    study = load_study(export_dir, cache_dir=None)
+    summary = store.condition_summary()
+    counts = np.bincount(study.trials['condition'], minlength=len(summary))
+    assert summary['trials'].tolist() == counts.tolist()
+    means = study.trials.groupby('condition')['rt'].mean()
+    assert summary['mean'].to_numpy()[means.index] == pytest.approx(means.to_numpy())
@@ -0,0 +1,62 @@
+import os
+
+import pandas as pd
+import pytest
+
+from cache import StudyCache
+from ingest import load_study, BINARY
+from conftest import write_exports
+
+
+def canonical(study):
+    """Teilnehmer nach Dateiname sortiert, Trials mit Dateiname statt Zeilennummer"""
+    participants = study.participants.sort_values('filename', kind='stable').reset_index(drop=True)
+    trials = study.trials.assign(filename=study.participants['filename'].to_numpy()[study.trials['participant']])
+    trials = trials.drop(columns='participant').sort_values(['filename', 'condition'], kind='stable')
+    return participants, trials.reset_index(drop=True)
+
+
+def assert_same_study(actual, expected):
+    for actual_table, expected_table in zip(canonical(actual), canonical(expected)):
+        pd.testing.assert_frame_equal(actual_table, expected_table)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / 'cache')
+
+
+def test_cache_round_trip_equals_fresh_parse(export_dir, cache_dir):
+    fresh = load_study(export_dir, cache_dir=None)
+    assert_same_study(load_study(export_dir, cache_dir=cache_dir), fresh)
+    assert_same_study(load_study(export_dir, cache_dir=cache_dir), fresh)
+
+
+def test_cache_follows_added_changed_and_removed_files(tmp_path, synthetic, cache_dir):
+    directory = tmp_path / 'exports'
+    directory.mkdir()
+    write_exports(str(directory), synthetic, range(4))
+    load_study(str(directory), cache_dir=cache_dir)
+
+    write_exports(str(directory), synthetic, range(4, synthetic.n))
+    names = sorted(os.listdir(directory))
+    os.remove(directory / names[0])
+    with open(directory / names[1], 'a', encoding='utf-8') as f:
+        f.write('\n')
+    (directory / 'kaputt.json').write_text('{"nicht": ', encoding='utf-8')
+
+    cached = load_study(str(directory), cache_dir=cache_dir)
+    assert_same_study(cached, load_study(str(directory), cache_dir=None))
+    cache = StudyCache(cache_dir)
+    cache.load()
+    assert 'kaputt.json' in cache.failed
+    assert_same_study(load_study(str(directory), cache_dir=cache_dir), cached)
+
+
+def test_cache_with_experiment_filter(export_dir, cache_dir):
+    fresh = load_study(export_dir, cache_dir=None)
+    binary = load_study(export_dir, cache_dir=cache_dir, exp_types=[BINARY])
+    assert set(binary.participants['experiment_type']) == {BINARY}
+    expected = fresh.take(fresh.participants.index[fresh.participants['experiment_type'] == BINARY].to_numpy())
+    assert_same_study(binary, expected)
+    assert_same_study(load_study(export_dir, cache_dir=cache_dir), fresh)
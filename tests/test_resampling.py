@@ -0,0 +1,97 @@
+from itertools import combinations, product
+
+import numpy as np
+import pytest
+
+from resampling import (
+    exact_feasible, exact_preferred, exact_permutation_test, sign_flip_test, permutation_test,
+    pairwise_permutation_tests, holm_correction, fdr_correction
+)
+
+
+def brute_force_p(first, second):
+    """Zweiseitiger p-Wert über alle Aufteilungen (verdoppelter Rand wie two_sided_p_value)"""
+    values = np.concatenate([first, second])
+    observed = np.mean(second) - np.mean(first)
+    diffs = []
+    for chosen in combinations(range(len(values)), len(first)):
+        mask = np.zeros(len(values), dtype=bool)
+        mask[list(chosen)] = True
+        diffs.append(values[~mask].mean() - values[mask].mean())
+    diffs = np.array(diffs)
+    tail = diffs >= observed - 1e-9 if observed >= 0 else diffs <= observed + 1e-9
+    return min(2 * tail.mean(), 1.0)
+
+
+def brute_force_sign_flip_p(diffs):
+    """Zweiseitiger p-Wert über alle 2^n Vorzeichen der Differenzen"""
+    signs = np.array(list(product([1.0, -1.0], repeat=len(diffs))))
+    sums = signs @ diffs
+    total = diffs.sum()
+    tail = sums >= total - 1e-9 if total >= 0 else sums <= total + 1e-9
+    return min(2 * tail.mean(), 1.0)
+
+
+@pytest.mark.parametrize('n_first, n_second', [(1, 4), (3, 4), (5, 5), (2, 9)])
+def test_exact_permutation_test_equals_enumeration(n_first, n_second):
+    rng = np.random.default_rng(n_first * 10 + n_second)
+    first = rng.normal(500, 80, n_first)
+    second = rng.normal(560, 80, n_second)
+    assert exact_permutation_test(first, second)['p_value'] == pytest.approx(brute_force_p(first, second))
+
+
+def test_exact_permutation_test_with_ties():
+    first = np.array([500.0, 520.0, 520.0, 610.0])
+    second = np.array([520.0, 610.0, 640.0, 640.0, 700.0])
+    assert exact_permutation_test(first, second)['p_value'] == pytest.approx(brute_force_p(first, second))
+    assert exact_permutation_test(second, first)['p_value'] == pytest.approx(brute_force_p(second, first))
+
+
+def test_exact_feasible_does_not_overflow():
+    assert not exact_feasible(10 ** 6, 10 ** 6)
+    assert not exact_preferred(10 ** 6, 10 ** 6, 10000)
+    with pytest.raises(ValueError):
+        exact_permutation_test(np.ones(40), np.ones(40))
+
+
+def test_permutation_test_simulation_close_to_exact():
+    rng = np.random.default_rng(3)
+    first, second = rng.normal(500, 80, 6), rng.normal(600, 80, 7)
+    exact = permutation_test(first, second, exact=True)['p_value']
+    simulated = permutation_test(first, second, n_resamples=50000, rng=0, exact=False)['p_value']
+    assert simulated == pytest.approx(exact, abs=0.01)
+
+
+@pytest.mark.parametrize('n', [1, 4, 9, 13])
+def test_sign_flip_exact_equals_enumeration(n):
+    diffs = np.random.default_rng(n).normal(20, 50, n)
+    assert sign_flip_test(diffs, exact=True)['p_value'] == pytest.approx(brute_force_sign_flip_p(diffs))
+    assert sign_flip_test(-diffs, exact=True)['p_value'] == pytest.approx(brute_force_sign_flip_p(-diffs))
+
+
+def test_sign_flip_simulation_close_to_exact():
+    diffs = np.random.default_rng(7).normal(15, 40, 12)
+    exact = sign_flip_test(diffs, exact=True)['p_value']
+    simulated = sign_flip_test(diffs, n_resamples=50000, rng=0, exact=False)['p_value']
+    assert simulated == pytest.approx(exact, abs=0.01)
+
+
+def test_pairwise_tests_pair_within_subject_conditions():
+    rng = np.random.default_rng(5)
+    a = rng.normal(500, 60, 8)
+    b = a + rng.normal(10, 5, 8)
+    c = rng.normal(700, 60, 6)
+    results = pairwise_permutation_tests({'a': a, 'b': b, 'c': c}, n_resamples=2000, rng=0,
+                                         paired={('a', 'b'): b - a})
+    by_pair = {(r['group_a'], r['group_b']): r for r in results}
+    assert by_pair[('a', 'b')]['paired'] and not by_pair[('a', 'c')]['paired']
+    assert by_pair[('a', 'b')]['p_value'] == pytest.approx(sign_flip_test(b - a, exact=True)['p_value'])
+    assert by_pair[('a', 'c')]['p_value'] == pytest.approx(exact_permutation_test(a, c)['p_value'])
+    p_values = np.array([r['p_value'] for r in results])
+    assert np.allclose([r['p_holm'] for r in results], holm_correction(p_values))
+
+
+def test_multiple_testing_corrections():
+    p_values = np.array([0.01, 0.04, 0.03, 0.2])
+    assert np.allclose(holm_correction(p_values), [0.04, 0.09, 0.09, 0.2])
+    assert np.allclose(fdr_correction(p_values), [0.04, 0.0533333, 0.0533333, 0.2])
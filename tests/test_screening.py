@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from ingest import CONDITION_NAMES
+from screening import welch_tests, mann_whitney_tests, paired_tests, within_session_tests
+
+
+def test_welch_tests_match_scipy():
+    rng = np.random.default_rng(0)
+    samples = [(rng.normal(500, 60, n_a), rng.normal(540, 90, n_b)) for n_a, n_b in [(5, 7), (12, 9), (30, 30)]]
+    columns = [np.array(column) for column in zip(*[
+        (len(a), a.mean(), a.var(ddof=1), len(b), b.mean(), b.var(ddof=1)) for a, b in samples])]
+    t, _, p = welch_tests(*columns)
+    for k, (a, b) in enumerate(samples):
+        expected = stats.ttest_ind(b, a, equal_var=False)
+        assert t[k] == pytest.approx(expected.statistic)
+        assert p[k] == pytest.approx(expected.pvalue)
+
+
+@pytest.mark.parametrize('a, b', [
+    ([1.5, 3.2, 4.8], [2.1, 5.5, 6.3, 7.7]),                 # exakt, ohne Bindungen
+    ([1.0, 2.0, 2.0, 4.0, 5.0], [2.0, 3.0, 5.0, 6.0]),       # Bindungen: Normalapproximation
+    (list(np.random.default_rng(1).normal(0, 1, 15)),
+     list(np.random.default_rng(2).normal(0.5, 1, 12))),     # große Gruppen
+])
+def test_mann_whitney_tests_match_scipy(a, b):
+    values = np.concatenate([a, b])
+    first = np.arange(len(values)) < len(a)
+    u1, p = mann_whitney_tests(np.zeros(len(values), dtype=np.int64), values, first, 1)
+    expected = stats.mannwhitneyu(a, b, alternative='two-sided')
+    assert u1[0] == pytest.approx(expected.statistic)
+    assert p[0] == pytest.approx(expected.pvalue)
+
+
+def test_within_session_tests_match_scipy(synthetic):
+    study = synthetic.study()
+    result = within_session_tests(study)
+    assert len(result) > 0
+    trials = study.trials
+    for row in result.itertuples():
+        session = trials[trials['participant'] == row.row]
+        a = session.loc[session['condition'] == CONDITION_NAMES.index(row.condition_a), 'rt'].to_numpy()
+        b = session.loc[session['condition'] == CONDITION_NAMES.index(row.condition_b), 'rt'].to_numpy()
+        assert (row.n_a, row.n_b) == (len(a), len(b))
+        assert row.p_welch == pytest.approx(stats.ttest_ind(b, a, equal_var=False).pvalue)
+        assert row.p_mwu == pytest.approx(stats.mannwhitneyu(a, b, alternative='two-sided').pvalue)
+
+
+@pytest.mark.parametrize('diffs', [
+    np.random.default_rng(3).normal(10, 30, 10),             # exakt, ohne Bindungen
+    np.array([3.0, -1.0, 3.0, 5.0, -2.0, 5.0, 7.0, 1.0]),    # Bindungen
+    np.array([0.0, 4.0, -2.0, 6.0, 0.0, 8.0, 3.0, -5.0]),    # Nullen
+    np.random.default_rng(4).normal(5, 30, 70),              # Normalapproximation
+])
+def test_paired_tests_match_scipy(diffs):
+    result = paired_tests(diffs[None, :])
+    expected_t = stats.ttest_1samp(diffs, 0.0)
+    expected_w = stats.wilcoxon(diffs)
+    assert result['t'][0] == pytest.approx(expected_t.statistic)
+    assert result['p_ttest'][0] == pytest.approx(expected_t.pvalue)
+    assert result['w'][0] == pytest.approx(expected_w.statistic)
+    assert result['p_wilcoxon'][0] == pytest.approx(expected_w.pvalue)
+
+
+def test_paired_tests_rows_with_missing_values():
+    rng = np.random.default_rng(5)
+    rows = [rng.normal(10, 30, 12), rng.normal(-5, 20, 9)]
+    matrix = np.full((2, 12), np.nan)
+    for k, row in enumerate(rows):
+        matrix[k, :len(row)] = row
+    result = paired_tests(matrix)
+    for k, row in enumerate(rows):
+        assert result['n'][k] == len(row)
+        assert result['p_ttest'][k] == pytest.approx(stats.ttest_1samp(row, 0.0).pvalue)
+        assert result['p_wilcoxon'][k] == pytest.approx(stats.wilcoxon(row).pvalue)
@@ -0,0 +1,161 @@
+"""Zeit- und Speichermessung je Verarbeitungsstufe (Chrome-Trace-JSON und Tabelle am Programmende)"""
+import atexit
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Aktivierung über ANALYSE_TRACE=PFAD (1 = Standardpfad) oder python analyse.py --trace
+TRACE_ENV = 'ANALYSE_TRACE'
+DEFAULT_TRACE_PATH = 'data/trace.json'
+
+
+def peak_rss_mb():
+    """Höchster bisheriger Arbeitsspeicher (RSS) des Prozesses und seiner beendeten Kindprozesse in MB"""
+    if resource is None:
+        return None
+    # ru_maxrss ist unter Linux in KB, unter macOS in Bytes angegeben
+    unit = 1 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) * unit / 2 ** 20
+
+
+class _NullStage:
+    """Platzhalter bei abgeschalteter Messung"""
+
+    items = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Stage:
+    """Eine gemessene Stufe: Wall- und CPU-Zeit, Spitzen-RSS und Anzahl verarbeiteter Einheiten"""
+
+    def __init__(self, tracer, name, items):
+        self.tracer = tracer
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self.parent = self.tracer.stack[-1] if self.tracer.stack else None
+        self.tracer.stack.append(self.name)
+        self.start = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.start
+        cpu = time.process_time() - self.cpu
+        self.tracer.stack.pop()
+        self.tracer.events.append({
+            'name': self.name,
+            'parent': self.parent,
+            'depth': len(self.tracer.stack),
+            'start': self.start - self.tracer.origin,
+            'wall': wall,
+            'cpu': cpu,
+            'rss_mb': peak_rss_mb(),
+            'items': self.items,
+        })
+        return False
+
+
+class Tracer:
+    """Sammelt die Stufen eines Laufs und schreibt sie am Ende als Trace und Tabelle"""
+
+    def __init__(self, path=DEFAULT_TRACE_PATH):
+        self.path = path
+        self.origin = time.perf_counter()
+        self.started = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self.stack = []
+        self.events = []
+
+    def summary(self):
+        """Zeilen je Stufe (in Reihenfolge des ersten Auftretens): Aufrufe, Wall, CPU, Einheiten, Spitzen-RSS"""
+        rows = {}
+        for event in sorted(self.events, key=lambda e: e['start']):
+            key = ('  ' * event['depth']) + event['name']
+            row = rows.setdefault(key, [key, 0, 0.0, 0.0, None, None])
+            row[1] += 1
+            row[2] += event['wall']
+            row[3] += event['cpu']
+            if event['items'] is not None:
+                row[4] = (row[4] or 0) + event['items']
+            if event['rss_mb'] is not None:
+                row[5] = max(row[5] or 0.0, event['rss_mb'])
+        return [[name, calls, round(wall, 4), round(cpu, 4), items, None if rss is None else round(rss, 1)]
+                for name, calls, wall, cpu, items, rss in rows.values()]
+
+    def trace(self):
+        """Trace im Chrome-Trace-Format (Zeiten in Mikrosekunden)"""
+        return {
+            'traceEvents': [{
+                'name': event['name'], 'ph': 'X', 'pid': os.getpid(), 'tid': 0,
+                'ts': round(event['start'] * 1e6), 'dur': round(event['wall'] * 1e6),
+                'args': {'cpu_s': event['cpu'], 'rss_mb': event['rss_mb'], 'items': event['items']},
+            } for event in self.events],
+            'displayTimeUnit': 'ms',
+            'otherData': {'command': sys.argv, 'started': self.started,
+                          'wall': time.perf_counter() - self.origin},
+        }
+
+    def report(self):
+        """Schreibt den Trace und gibt die Zusammenfassung aus"""
+        if not self.events:
+            return
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.trace(), f, indent=1)
+
+        from tabulate import tabulate
+        print("\n=== Laufzeit je Stufe ===")
+        print(tabulate(self.summary(), headers=['Stufe', 'Aufrufe', 'Wall (s)', 'CPU (s)', 'Einheiten',
+                                                'Spitzen-RSS (MB)'], tablefmt='pretty', stralign='left'))
+        print(f"Trace gespeichert in: {self.path}")
+
+
+_tracer = None
+
+
+def enable(path=None):
+    """Schaltet die Messung ein; der Bericht wird beim Programmende geschrieben"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(path or DEFAULT_TRACE_PATH)
+        atexit.register(_tracer.report)
+    return _tracer
+
+
+def enabled():
+    return _tracer is not None
+
+
+def stage(name, items=None):
+    """Kontextmanager für eine Stufe; ohne aktivierte Messung ein Leerobjekt"""
+    if _tracer is None:
+        return _NULL_STAGE
+    return Stage(_tracer, name, items)
+
+
+_env = os.environ.get(TRACE_ENV, '')
+if _env and _env != '0':
+    enable(None if _env == '1' else _env)
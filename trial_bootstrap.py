@@ -0,0 +1,61 @@
+import os
+import pandas as pd
+from tabulate import tabulate
+
+from ingest import load_study, EXPERIMENT_TYPES, CONDITIONS
+from resampling import cluster_bootstrap_ci, seed_sequence
+from cleaning import clean_and_report
+from tracing import stage
+
+# Pfade definieren
+output_dir = "data/analysis_results"
+
+
+def trial_bootstrap(study, n_resamples=10000, confidence=0.95, rng=None):
+    """Hierarchischer Bootstrap (Teilnehmer, darin Trials) für jede Bedingung"""
+    seeds = seed_sequence(rng)
+    rows = []
+    for exp_type, condition, _ in CONDITIONS:
+        values, offsets, _ = study.ragged(condition)
+        if len(values) == 0:
+            continue
+
+        ci = cluster_bootstrap_ci(values, offsets, n_resamples=n_resamples, confidence=confidence,
+                                  rng=seeds.spawn(1)[0])
+        rows.append({
+            'experiment': exp_type,
+            'condition': condition,
+            'participants': ci['participants'],
+            'trials': ci['trials'],
+            'mean': ci['estimate'],
+            'percentile_low': ci['percentile'][0],
+            'percentile_high': ci['percentile'][1],
+            'bca_low': ci['bca'][0],
+            'bca_high': ci['bca'][1],
+        })
+    return pd.DataFrame(rows)
+
+
+def main(n_resamples=10000, confidence=0.95, seed=0, clean=False, rules=None, workers=None):
+    print("Daten werden geladen...")
+    study = load_study(exp_types=EXPERIMENT_TYPES, workers=workers)
+    # Optional Antizipationen, Aussetzer und Ausreißer vor dem Bootstrap entfernen
+    if clean:
+        study = clean_and_report(study, os.path.join(output_dir, 'bereinigung.csv'), **(rules or {}))
+
+    print("\nFühre hierarchischen Bootstrap über die Einzeltrials durch...")
+    with stage('resampling', len(study.trials) * n_resamples):
+        intervals = trial_bootstrap(study, n_resamples=n_resamples, confidence=confidence, rng=seed)
+
+    print(f"\n=== Bootstrap-Konfidenzintervalle ({confidence:.0%}) je Bedingung ===")
+    print(tabulate(intervals.round(2), headers='keys', tablefmt='pretty', showindex=False))
+
+    with stage('schreiben'):
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        intervals.round(2).to_csv(os.path.join(output_dir, 'bootstrap_konfidenzintervalle.csv'), index=False)
+    print(f"Konfidenzintervalle gespeichert in: {os.path.join(output_dir, 'bootstrap_konfidenzintervalle.csv')}")
+
+
+if __name__ == "__main__":
+    main()